@@ -0,0 +1,125 @@
+'''
+Read Rio stat files straight out of compressed archives
+
+Stat file archives no longer need to be extracted to disk. Members are streamed out of the
+archive one at a time, and decoding (StatObj.from_bytes) runs across a pool of worker
+processes. At most maxPending games are in flight at once, so memory stays bounded however
+large the archive is. Games are yielded in archive order.
+
+Supported archives:
+- .tar, .tar.gz / .tgz, .tar.bz2, .tar.xz: members ending in .json
+- .tar.zst / .tar.zstd: needs the optional zstandard package
+- .zip: members ending in .json
+- .jsonl, .jsonl.gz: one stat json per line
+
+How to use:
+- ex:
+	import RioArchive
+	for statObj in RioArchive.readArchive("season4.tar.gz", processes=8):
+		print(statObj.gameID())
+
+- run a function in the workers and only send back its result:
+	for (name, gameID, ops) in RioArchive.mapArchive("season4.zip", myFunction, processes=8):
+		...
+	myFunction must be defined at module level so it can be sent to the workers
+'''
+
+import gzip
+import tarfile
+import zipfile
+from collections import deque
+from multiprocessing import Pool
+
+import RioStatLib
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+TAR_SUFFIXES = [".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tar.xz"]
+ZSTD_SUFFIXES = [".tar.zst", ".tar.zstd"]
+JSONL_SUFFIXES = [".jsonl", ".jsonl.gz"]
+
+
+def archiveType(path: str):
+    # returns "tar", "zstd", "zip" or "jsonl" from the archive file name
+    lowerPath = path.lower()
+    for archive, suffixes in [("zstd", ZSTD_SUFFIXES), ("tar", TAR_SUFFIXES), ("zip", [".zip"]),
+                              ("jsonl", JSONL_SUFFIXES)]:
+        if any(lowerPath.endswith(suffix) for suffix in suffixes):
+            return archive
+    raise Exception(f'Unsupported archive {path}. Supported suffixes are '
+                    f'{TAR_SUFFIXES + ZSTD_SUFFIXES + [".zip"] + JSONL_SUFFIXES}')
+
+
+def _tarMembers(tar):
+    for member in tar:
+        if member.isfile() and member.name.endswith(".json"):
+            yield member.name, tar.extractfile(member).read()
+
+
+def archiveMembers(path: str):
+    # yields (member name, stat file bytes) of every stat file in an archive, in archive order
+    # only one member is held in memory at a time
+    archive = archiveType(path)
+    if archive == "tar":
+        # stream mode reads the archive front to back without seeking
+        with tarfile.open(path, "r|*") as tar:
+            yield from _tarMembers(tar)
+    elif archive == "zstd":
+        if zstandard is None:
+            raise Exception(f'Reading {path} needs the zstandard package (pip install zstandard)')
+        with open(path, "rb") as compressed:
+            with zstandard.ZstdDecompressor().stream_reader(compressed) as reader:
+                with tarfile.open(fileobj=reader, mode="r|") as tar:
+                    yield from _tarMembers(tar)
+    elif archive == "zip":
+        with zipfile.ZipFile(path) as archiveFile:
+            for name in archiveFile.namelist():
+                if name.endswith(".json"):
+                    yield name, archiveFile.read(name)
+    else:
+        opener = gzip.open if path.lower().endswith(".gz") else open
+        with opener(path, "rb") as lines:
+            for lineNum, line in enumerate(lines):
+                if line.strip():
+                    yield f"{path}:{lineNum + 1}", line
+
+
+def loadStatObj(data: bytes):
+    # returns a StatObj from stat file bytes
+    return RioStatLib.StatObj.from_bytes(data)
+
+
+def _applyToGame(function, name: str, data: bytes):
+    return function(name, loadStatObj(data))
+
+
+def _returnStatObj(name: str, statObj):
+    return statObj
+
+
+def mapArchive(path: str, function, processes: int = None, maxPending: int = 64):
+    # yields function(member name, StatObj) of every stat file in an archive, in archive order
+    # decoding and function run in a pool of worker processes, with at most maxPending games in flight
+    # processes: optional, 1 decodes in this process without a pool
+    if processes == 1:
+        for name, data in archiveMembers(path):
+            yield _applyToGame(function, name, data)
+        return
+
+    with Pool(processes) as pool:
+        pending = deque()
+        for name, data in archiveMembers(path):
+            pending.append(pool.apply_async(_applyToGame, (function, name, data)))
+            if len(pending) >= maxPending:
+                yield pending.popleft().get()
+        while pending:
+            yield pending.popleft().get()
+
+
+def readArchive(path: str, processes: int = None, maxPending: int = 64):
+    # yields a StatObj for every stat file in an archive, in archive order
+    return mapArchive(path, _returnStatObj, processes, maxPending)
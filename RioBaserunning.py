@@ -0,0 +1,167 @@
+'''
+Baserunning analytics over many Rio stat files
+
+Every event records each runner's initial base, result base, Out Type, Out Location and Steal
+type. BaserunningStats pulls those runner records from every game into RioColumns.RunnerColumns
+and tallies all of the stats below in a single pass over the arrays:
+- extra bases taken: a runner on base advancing further than the hit's bases on a Single/Double/Triple
+- steal attempts and successes by steal type (Ready, Normal, Perfect)
+- outs on the bases by Out Location and Out Type
+- runs scored per character
+
+How to use:
+- ex:
+	import RioBaserunning
+	baserunning = RioBaserunning.BaserunningStats()
+	for statObj in myStatObjs:
+		baserunning.addGame(statObj)
+	steals = baserunning.stealSuccess()
+	marioRuns = baserunning.runsScored()["Mario"]
+
+- stats built in worker processes can be combined with merge()
+'''
+
+import RioColumns
+
+
+class BaserunningStats:
+    # baserunning stats over any number of games
+    def __init__(self):
+        self.runners = RioColumns.RunnerColumns()
+        self.__tally = None
+
+    def addGame(self, statObj):
+        # adds the runner records of a game
+        self.runners.addGame(statObj)
+        self.__tally = None
+        return self
+
+    def merge(self, other):
+        # adds the runner records of another BaserunningStats
+        self.runners.extend(other.runners)
+        self.__tally = None
+        return self
+
+    def __count(self):
+        # tallies every stat in one pass over the runner arrays
+        if self.__tally is not None:
+            return self.__tally
+
+        runners = self.runners
+        characters = runners.codebook("Character").values
+        stealTypes = runners.codebook("Steal").values
+        hitBasesByCode = [RioColumns.HIT_BASES.get(result, 0) for result in runners.codebook("Result of AB").values]
+        outTypes = runners.codebook("Out Type").values
+        notOut = runners.code("Out Type", "None")
+        noSteal = runners.code("Steal", "None")
+
+        charCount = len(characters)
+        opportunities = [0] * charCount
+        extraBasesTaken = [0] * charCount
+        extraBases = [0] * charCount
+        outsAdvancing = [0] * charCount
+        runsScored = [0] * charCount
+        stealAttempts = [0] * len(stealTypes)
+        stealSuccesses = [0] * len(stealTypes)
+        outs = {}
+
+        col = runners.columns
+        for character, isBatter, initialBase, resultBase, outType, outLocation, steal, result in zip(
+                col["Character"], col["Is Batter"], col["Initial Base"], col["Result Base"],
+                col["Out Type"], col["Out Location"], col["Steal"], col["Result of AB"]):
+            isOut = outType != notOut
+
+            if resultBase == 4 and not isOut:
+                runsScored[character] += 1
+
+            if steal != noSteal:
+                stealAttempts[steal] += 1
+                if not isOut:
+                    stealSuccesses[steal] += 1
+
+            if isOut:
+                key = (isBatter, outLocation, outType)
+                outs[key] = outs.get(key, 0) + 1
+
+            hitBases = hitBasesByCode[result]
+            if isBatter or hitBases == 0 or hitBases == 4:
+                continue
+            opportunities[character] += 1
+            if isOut:
+                outsAdvancing[character] += 1
+                continue
+            advanced = resultBase - initialBase
+            if advanced > hitBases:
+                extraBasesTaken[character] += 1
+                extraBases[character] += advanced - hitBases
+
+        self.__tally = {
+            "characters": characters,
+            "opportunities": opportunities,
+            "extraBasesTaken": extraBasesTaken,
+            "extraBases": extraBases,
+            "outsAdvancing": outsAdvancing,
+            "runsScored": runsScored,
+            "stealTypes": stealTypes,
+            "stealAttempts": stealAttempts,
+            "stealSuccesses": stealSuccesses,
+            "outTypes": outTypes,
+            "outs": outs,
+        }
+        return self.__tally
+
+    def extraBasesTaken(self):
+        # returns a dict of CharID -> dict of
+        # 'Opportunities': times on base for a Single, Double or Triple
+        # 'Extra Bases Taken': times the runner advanced further than the hit
+        # 'Extra Bases': total bases advanced beyond the hit
+        # 'Outs Advancing': times the runner was put out on the play
+        # 'Rate': Extra Bases Taken / Opportunities
+        tally = self.__count()
+        result = {}
+        for code, character in enumerate(tally["characters"]):
+            if tally["opportunities"][code] == 0:
+                continue
+            result[character] = {
+                "Opportunities": tally["opportunities"][code],
+                "Extra Bases Taken": tally["extraBasesTaken"][code],
+                "Extra Bases": tally["extraBases"][code],
+                "Outs Advancing": tally["outsAdvancing"][code],
+                "Rate": float(tally["extraBasesTaken"][code]) / tally["opportunities"][code],
+            }
+        return result
+
+    def stealSuccess(self):
+        # returns a dict of steal type -> {'Attempts', 'Successes', 'Rate'}
+        # steal types: Ready, Normal, Perfect
+        tally = self.__count()
+        result = {}
+        for code, stealType in enumerate(tally["stealTypes"]):
+            if stealType == "None":
+                continue
+            attempts = tally["stealAttempts"][code]
+            result[stealType] = {
+                "Attempts": attempts,
+                "Successes": tally["stealSuccesses"][code],
+                "Rate": float(tally["stealSuccesses"][code]) / attempts if attempts else 0.0,
+            }
+        return result
+
+    def outsOnBases(self, includeBatter: bool = False):
+        # returns a dict of Out Location -> {Out Type: count}
+        # includeBatter: optional, also count outs on the batter (strikeouts, fly outs, ...)
+        tally = self.__count()
+        result = {}
+        for (isBatter, outLocation, outType), count in tally["outs"].items():
+            if isBatter and not includeBatter:
+                continue
+            location = result.setdefault(outLocation, {})
+            outName = tally["outTypes"][outType]
+            location[outName] = location.get(outName, 0) + count
+        return result
+
+    def runsScored(self):
+        # returns a dict of CharID -> runs scored
+        tally = self.__count()
+        return {character: tally["runsScored"][code]
+                for code, character in enumerate(tally["characters"]) if tally["runsScored"][code]}
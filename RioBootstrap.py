@@ -0,0 +1,249 @@
+'''
+Bootstrap confidence intervals for rate stats
+
+Characters with few at bats or innings get noisy AVG/OBP/SLG/OPS/ERA. BootstrapStats keeps the
+counting stats of every character game (per character, player or (player, character), like
+RioLeaderboard) and gives a percentile bootstrap interval for a rate stat by resampling
+- "games": a key's games drawn with replacement, then the rate stat of their summed counts
+- "plateAppearances": a key's plate appearances drawn with replacement. Resampling plate
+  appearances is one multinomial draw over the outcome counts (single, double, triple, HR,
+  walk, out), so no per plate appearance data is needed. Batting stats only.
+
+Rate stats use the same formulas as RioLeaderboard.StatLine (and StatObj). With numpy installed
+every resample of a key is drawn and summed in one vectorized call, without numpy the standard
+library random module is used. Each key's random stream is seeded from seed and the key, so
+intervals are the same whether keys run in one process or across a pool.
+
+How to use:
+- ex:
+	import RioBootstrap
+	boot = RioBootstrap.BootstrapStats("character")
+	for statObj in myStatObjs:
+		boot.addGame(statObj)
+	boot.interval("Mario", "ops", unit="games", resamples=2000, confidence=0.95, seed=1)
+	allOPS = boot.intervals("ops", unit="plateAppearances", minimum=("atBats", 20), processes=8)
+'''
+
+import random
+import zlib
+from array import array
+from bisect import bisect_right
+from multiprocessing import Pool
+
+import RioLeaderboard
+import RioUtil
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+COUNT_STATS = list(RioLeaderboard.OFFENSIVE_STATS) + list(RioLeaderboard.DEFENSIVE_STATS)
+STAT_INDEX = {stat: x for x, stat in enumerate(COUNT_STATS)}
+
+RATE_STATS = ["battingAvg", "obp", "slg", "ops", "era"]
+PLATE_APPEARANCE_STATS = ["battingAvg", "obp", "slg", "ops"]
+UNITS = ["games", "plateAppearances"]
+
+# plate appearance outcomes resampled by "plateAppearances", in multinomial order
+OUTCOMES = ["singles", "doubles", "triples", "homeruns", "walks", "outs"]
+
+# most (resample, game) draw counts held at once by the numpy games resampler
+RESAMPLE_BLOCK_CELLS = 2 ** 22
+
+
+def rateStat(stat: str, totals: dict):
+    # returns a rate stat from counting stat totals, the formulas of RioLeaderboard.StatLine
+    # totals values can be numbers or numpy arrays (one entry per resample)
+    walks = totals["walksBallFour"] + totals["walksHitByPitch"]
+    if stat == "battingAvg":
+        return totals["hits"] / totals["atBats"]
+    if stat in ["obp", "ops"]:
+        obp = (totals["hits"] + walks) / totals["atBats"]
+        if stat == "obp":
+            return obp
+    if stat in ["slg", "ops"]:
+        totalBases = totals["singles"] + totals["doubles"] * 2 + totals["triples"] * 3 + totals["homeruns"] * 4
+        slg = totalBases / (totals["atBats"] - walks)
+        return slg if stat == "slg" else obp + slg
+    if stat == "era":
+        return 9 * totals["runsAllowed"] / (totals["outsPitched"] / 3)
+    raise Exception(f'Invalid rate stat {stat}. Function accepts {RATE_STATS}')
+
+
+def outcomeCounts(totals: dict):
+    # returns the counts of OUTCOMES from counting stat totals
+    # at bats include walks, as in the StatLine formulas, outs are every other at bat
+    walks = totals["walksBallFour"] + totals["walksHitByPitch"]
+    counts = [totals["singles"], totals["doubles"], totals["triples"], totals["homeruns"], walks]
+    counts.append(max(0, totals["atBats"] - sum(counts)))
+    return counts
+
+
+def outcomeTotals(singles, doubles, triples, homeruns, walks, outs):
+    # returns the counting stat totals rateStat needs from resampled OUTCOMES counts
+    hits = singles + doubles + triples + homeruns
+    return {"atBats": hits + walks + outs, "hits": hits, "singles": singles, "doubles": doubles, "triples": triples,
+            "homeruns": homeruns, "walksBallFour": walks, "walksHitByPitch": 0 * walks}
+
+
+def percentiles(values: list, confidence: float):
+    # returns (low, high) of a sorted list for a two sided interval
+    tail = (1 - confidence) / 2
+    last = len(values) - 1
+    return values[int(round(tail * last))], values[int(round((1 - tail) * last))]
+
+
+def _resampleGames(rows: list, stat: str, resamples: int, rng):
+    # returns the sorted rate stat of every resample of games. rows: one list of COUNT_STATS per game
+    gameCount = len(rows)
+    if numpy is not None:
+        # each resample is how many times every game is drawn, one multinomial draw over the games,
+        # so its totals are those counts times the game matrix. resamples are drawn in blocks to
+        # keep the (resamples, games) count matrix small
+        matrix = numpy.asarray(rows, dtype=numpy.int64)
+        blockSize = max(1, RESAMPLE_BLOCK_CELLS // gameCount)
+        sums = numpy.concatenate([rng.multinomial(gameCount, numpy.full(gameCount, 1.0 / gameCount),
+                                                  size=min(blockSize, resamples - start)) @ matrix
+                                  for start in range(0, resamples, blockSize)])
+        totals = {name: sums[:, x].astype(numpy.float64) for x, name in enumerate(COUNT_STATS)}
+        with numpy.errstate(divide="ignore", invalid="ignore"):
+            values = rateStat(stat, totals)
+        return sorted(values[numpy.isfinite(values)].tolist())
+
+    values = []
+    for _ in range(resamples):
+        sums = [0] * len(COUNT_STATS)
+        for row in rng.choices(rows, k=gameCount):
+            for x, value in enumerate(row):
+                sums[x] += value
+        try:
+            values.append(rateStat(stat, {name: float(sums[x]) for x, name in enumerate(COUNT_STATS)}))
+        except ZeroDivisionError:
+            continue
+    return sorted(values)
+
+
+def _resamplePlateAppearances(rows: list, stat: str, resamples: int, rng):
+    # returns the sorted rate stat of every resample of plate appearances
+    totals = {name: sum(row[x] for row in rows) for x, name in enumerate(COUNT_STATS)}
+    counts = outcomeCounts(totals)
+    plateAppearances = sum(counts)
+    if plateAppearances == 0:
+        return []
+    if numpy is not None:
+        draws = rng.multinomial(plateAppearances, [count / plateAppearances for count in counts], size=resamples)
+        resampled = outcomeTotals(*[draws[:, x].astype(numpy.float64) for x in range(len(OUTCOMES))])
+        with numpy.errstate(divide="ignore", invalid="ignore"):
+            values = rateStat(stat, resampled)
+        return sorted(values[numpy.isfinite(values)].tolist())
+
+    cumulative = []
+    running = 0
+    for count in counts:
+        running += count
+        cumulative.append(running)
+    values = []
+    for _ in range(resamples):
+        draw = [0] * len(OUTCOMES)
+        for _ in range(plateAppearances):
+            draw[bisect_right(cumulative, rng.randrange(plateAppearances))] += 1
+        try:
+            values.append(rateStat(stat, outcomeTotals(*[float(count) for count in draw])))
+        except ZeroDivisionError:
+            continue
+    return sorted(values)
+
+
+def bootstrapInterval(rows: list, stat: str, unit: str = "games", resamples: int = 2000, confidence: float = 0.95,
+                      seed: int = None):
+    # returns a dict of 'Estimate', 'Low', 'High', 'Games', 'Resamples' for the rows of one key
+    # rows: one list of COUNT_STATS per game. 'Estimate' is the rate stat of all rows together
+    # 'Resamples' counts the resamples with a defined rate stat, Low/High are None when there are none
+    if unit not in UNITS:
+        raise Exception(f'Invalid unit {unit}. Function accepts {UNITS}')
+    if stat not in (RATE_STATS if unit == "games" else PLATE_APPEARANCE_STATS):
+        raise Exception(f'Invalid rate stat {stat} for unit {unit}. Function accepts '
+                        f'{RATE_STATS if unit == "games" else PLATE_APPEARANCE_STATS}')
+    rng = numpy.random.default_rng(seed) if numpy is not None else random.Random(seed)
+    totals = {name: float(sum(row[x] for row in rows)) for x, name in enumerate(COUNT_STATS)}
+    if unit == "plateAppearances":
+        # the same outcome counts that are resampled, hits are the sum of singles -> home runs
+        totals = outcomeTotals(*outcomeCounts(totals))
+    try:
+        estimate = rateStat(stat, totals)
+    except ZeroDivisionError:
+        estimate = None
+
+    values = []
+    if rows:
+        if unit == "games":
+            values = _resampleGames(rows, stat, resamples, rng)
+        else:
+            values = _resamplePlateAppearances(rows, stat, resamples, rng)
+    low, high = percentiles(values, confidence) if values else (None, None)
+    return {"Estimate": estimate, "Low": low, "High": high, "Games": len(rows), "Resamples": len(values)}
+
+
+def _bootstrapKey(args):
+    key, rows, stat, unit, resamples, confidence, seed = args
+    return key, bootstrapInterval(rows, stat, unit, resamples, confidence, seed)
+
+
+class BootstrapStats:
+    # per game counting stats of every key, for bootstrap intervals
+    def __init__(self, groupBy: str = "character"):
+        if groupBy not in RioLeaderboard.GROUP_BY_OPTIONS:
+            raise Exception(f'Invalid groupBy arg {groupBy}. Function accepts {RioLeaderboard.GROUP_BY_OPTIONS}')
+        self.groupBy = groupBy
+        self.games = {}  # key -> flat array of COUNT_STATS, one block per game
+
+    def addGame(self, statObj):
+        # adds the counting stats of every key of a game, see RioLeaderboard.gameLines
+        for key, line in RioLeaderboard.gameLines(statObj, self.groupBy).items():
+            counts = self.games.setdefault(key, array("i"))
+            counts.extend(line.offense[stat] for stat in RioLeaderboard.OFFENSIVE_STATS)
+            counts.extend(line.defense[stat] for stat in RioLeaderboard.DEFENSIVE_STATS)
+        return self
+
+    def merge(self, other):
+        # adds the games of another BootstrapStats with the same groupBy
+        if other.groupBy != self.groupBy:
+            raise Exception(f'Cannot merge BootstrapStats grouped by {other.groupBy} into one grouped by {self.groupBy}')
+        for key, counts in other.games.items():
+            self.games.setdefault(key, array("i")).extend(counts)
+        return self
+
+    def rows(self, key):
+        # returns one list of COUNT_STATS per game of a key
+        counts = self.games.get(key, array("i"))
+        width = len(COUNT_STATS)
+        return [counts[x:x + width].tolist() for x in range(0, len(counts), width)]
+
+    def total(self, key, stat: str):
+        # returns the total of a counting stat of a key
+        counts = self.games.get(key, array("i"))
+        return sum(counts[STAT_INDEX[stat]::len(COUNT_STATS)])
+
+    def keySeed(self, key, seed: int):
+        # returns the seed of a key's random stream
+        return None if seed is None else (seed * 1000003 + zlib.crc32(repr(key).encode())) % 2 ** 32
+
+    def interval(self, key, stat: str, unit: str = "games", resamples: int = 2000, confidence: float = 0.95,
+                 seed: int = None):
+        # returns bootstrapInterval() of a key
+        return bootstrapInterval(self.rows(key), stat, unit, resamples, confidence, self.keySeed(key, seed))
+
+    def intervals(self, stat: str, unit: str = "games", resamples: int = 2000, confidence: float = 0.95,
+                  seed: int = None, minimum: tuple = None, processes: int = 1):
+        # returns a dict of key -> bootstrapInterval() for every key
+        # minimum: optional (counting stat, value) qualifier, ex: ("atBats", 50)
+        # processes: optional, runs keys across a pool of worker processes when not 1
+        keys = [key for key in self.games if minimum is None or self.total(key, minimum[0]) >= minimum[1]]
+        jobs = [(key, self.rows(key), stat, unit, resamples, confidence, self.keySeed(key, seed)) for key in keys]
+        if processes == 1 or len(jobs) < 2:
+            return dict(_bootstrapKey(job) for job in jobs)
+        chunksize = RioUtil.poolChunksize(len(jobs), processes)
+        with Pool(processes) as pool:
+            return dict(pool.imap_unordered(_bootstrapKey, jobs, chunksize=chunksize))
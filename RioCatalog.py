@@ -0,0 +1,141 @@
+'''
+Time indexed catalog of Rio stat files
+
+GameCatalog keeps a RioGameIndex.GameIndex sorted by start date ('Date - Start' parsed once
+to epoch seconds), so "games in the last 7 days" or "season 4" is two binary searches over the
+'Start' column and the games of a range are a contiguous slice. Game durations of any range
+come straight from the 'Start' and 'End' columns.
+
+Games with an unreadable start date sort first (Start == -1) and fall outside every range.
+
+How to use:
+- ex:
+	import RioCatalog
+	catalog = RioCatalog.GameCatalog.fromFiles(listOfStatFilePaths, processes=8)
+	catalog.save("catalog.json")
+
+	catalog = RioCatalog.GameCatalog.load("catalog.json")
+	catalog.addFiles(newStatFilePaths)
+	lastWeek = catalog.lastDays(7)
+	season4 = catalog.between(RioStatLib.parseDate("2023-06-01 00:00:00"), RioStatLib.parseDate("2023-09-01 00:00:00"))
+	season4.column("Path")
+	catalog.durationStats(*seasonBounds)
+
+- ratings in date order:
+	engine = RioRatings.RatingEngine("glicko")
+	catalog.applyRatings(engine)
+'''
+
+import time
+from bisect import bisect_left
+
+import RioGameIndex
+import RioRatings
+
+
+DAY_SECONDS = 86400
+
+
+class GameCatalog:
+    # games sorted by start date
+    def __init__(self, index: RioGameIndex.GameIndex = None):
+        self.index = RioGameIndex.GameIndex()
+        if index is not None:
+            self.add(index)
+
+    def __len__(self):
+        return len(self.index)
+
+    @classmethod
+    def fromFiles(cls, paths: list, processes: int = None):
+        # builds a catalog by indexing stat files, see RioGameIndex.GameIndex.addFiles
+        return cls(RioGameIndex.GameIndex().addFiles(paths, processes))
+
+    def add(self, index: RioGameIndex.GameIndex):
+        # adds the games of a GameIndex, keeping the catalog sorted
+        # newer games only append, older games trigger one re-sort
+        if len(index) == 0:
+            return self
+        newStarts = index.column("Start")
+        starts = self.index.column("Start")
+        inOrder = all(a <= b for a, b in zip(newStarts, newStarts[1:])) and (not starts or starts[-1] <= newStarts[0])
+        self.index.extend(index)
+        if not inOrder:
+            order = sorted(range(len(starts)), key=starts.__getitem__)
+            self.index = self.index.select(order)
+        return self
+
+    def addFiles(self, paths: list, processes: int = None):
+        # indexes stat files and adds them to the catalog
+        return self.add(RioGameIndex.GameIndex().addFiles(paths, processes))
+
+    def rangeOf(self, start: float = None, end: float = None):
+        # returns the range of catalog positions of games starting in [start, end)
+        # start/end: optional epoch seconds, open ended when None
+        starts = self.index.column("Start")
+        first = bisect_left(starts, 0.0 if start is None else max(start, 0.0))
+        last = len(starts) if end is None else bisect_left(starts, end, first)
+        return range(first, last)
+
+    def between(self, start: float = None, end: float = None):
+        # returns a GameIndex of the games starting in [start, end), oldest first
+        return self.index.select(self.rangeOf(start, end))
+
+    def lastDays(self, days: float, now: float = None):
+        # returns a GameIndex of the games started in the last days before now
+        # now: optional epoch seconds, defaults to the current time. games starting at or after now are left out
+        now = time.time() if now is None else now
+        return self.between(now - days * DAY_SECONDS, now)
+
+    def count(self, start: float = None, end: float = None):
+        # returns how many games started in [start, end)
+        return len(self.rangeOf(start, end))
+
+    def durations(self, start: float = None, end: float = None):
+        # returns a list of game durations in seconds of the games starting in [start, end)
+        # games with an unreadable end date are skipped
+        positions = self.rangeOf(start, end)
+        starts = self.index.column("Start")[positions.start:positions.stop]
+        ends = self.index.column("End")[positions.start:positions.stop]
+        return [gameEnd - gameStart for gameStart, gameEnd in zip(starts, ends) if gameEnd >= 0]
+
+    def durationStats(self, start: float = None, end: float = None):
+        # returns a dict of 'Games', 'Mean', 'Median', 'Min', 'Max' game duration in seconds
+        # values are None when no game has a duration
+        durations = sorted(self.durations(start, end))
+        count = len(durations)
+        if count == 0:
+            return {"Games": 0, "Mean": None, "Median": None, "Min": None, "Max": None}
+        middle = count // 2
+        median = durations[middle] if count % 2 else (durations[middle - 1] + durations[middle]) / 2.0
+        return {"Games": count, "Mean": sum(durations) / count, "Median": median,
+                "Min": durations[0], "Max": durations[-1]}
+
+    def applyRatings(self, engine, start: float = None, end: float = None):
+        # feeds the games starting in [start, end) to a RioRatings.RatingEngine in date order
+        # returns how many games were applied
+        col = self.index.columns
+        applied = 0
+        for position in self.rangeOf(start, end):
+            awayPlayer = col["Away Player"][position]
+            homePlayer = col["Home Player"][position]
+            result = RioRatings.gameResult({
+                "GameID": format(col["GameID"][position], "x"),
+                "Ranked": col["Ranked"][position],
+                "Away Player": awayPlayer,
+                "Home Player": homePlayer,
+                "Away Score": col["Away Score"][position],
+                "Home Score": col["Home Score"][position],
+                "Quitter Team": col["Quitter Team"][position],
+            })
+            applied += engine.addResult(*result, timestamp=col["Start"][position])
+        return applied
+
+    def save(self, path: str):
+        # writes the catalog to a json file
+        self.index.save(path)
+
+    @classmethod
+    def load(cls, path: str):
+        # reads a catalog written by save()
+        return cls(RioGameIndex.GameIndex.load(path))
@@ -0,0 +1,166 @@
+'''
+Chemistry and lineup context analytics over many Rio stat files
+
+StatObj buckets events by 'Chemistry Links on Base' for one game. LineupContextStats pulls the
+context of every event (chemistry links on base, lineup spot, whether the batter is the captain,
+which captain the batting team has) into RioColumns.EventColumns once, then splits plate
+appearance outcomes by any of those dimensions in a single pass over the arrays.
+
+Dimensions:
+- "chem": Chemistry Links on Base, 0 -> 3
+- "lineup": batter's lineup spot, 0 -> 8
+- "captainBatting": True when the batter is their team's captain
+- "captain": CharID of the batting team's captain
+
+How to use:
+- ex:
+	import RioChemistry
+	context = RioChemistry.LineupContextStats()
+	for statObj in myStatObjs:
+		context.addGame(statObj)
+	byChem = context.split("chem")
+	byChemAndSpot = context.split("chem", "lineup")
+	marioByChem = context.split("chem", batter="Mario")
+	byChem[2]["OPS"]
+'''
+
+import RioColumns
+
+
+DIMENSIONS = {
+    "chem": "Chemistry Links on Base",
+    "lineup": "Lineup Spot",
+    "captainBatting": "Batter Is Captain",
+    "captain": "Batting Captain",
+}
+
+
+# results that end a plate appearance, grouped the way batting stats count them
+WALK_RESULTS = ["Walk BB", "Walk HBP"]
+SACRIFICE_RESULTS = ["SacFly", "Bunt"]
+
+
+class OutcomeTally:
+    # plate appearance outcome counts for one split
+    # at bats count walks, as the stat file's 'At Bats' does, so the rate stats use the formulas of
+    # StatObj and RioLeaderboard.StatLine: obp = (H + BB) / AB and slg = TB / (AB - BB)
+    # sacrifices count as plate appearances but not at bats. rates are 0.0 with a zero denominator
+    def __init__(self):
+        self.plateAppearances = 0
+        self.atBats = 0
+        self.hits = 0
+        self.totalBases = 0
+        self.homeruns = 0
+        self.walks = 0
+        self.strikeouts = 0
+        self.rbi = 0
+
+    def add(self, result: str, rbi: int = 0, count: int = 1):
+        # adds count plate appearances ending in result, with rbi RBIs between them
+        self.plateAppearances += count
+        self.rbi += rbi
+        if result in SACRIFICE_RESULTS:
+            return
+        self.atBats += count
+        if result in WALK_RESULTS:
+            self.walks += count
+        elif result in RioColumns.HIT_BASES:
+            self.hits += count
+            self.totalBases += RioColumns.HIT_BASES[result] * count
+            if result == "HR":
+                self.homeruns += count
+        elif result == "Strikeout":
+            self.strikeouts += count
+
+    def merge(self, other):
+        for name, value in vars(other).items():
+            setattr(self, name, getattr(self, name) + value)
+        return self
+
+    def battingAvg(self):
+        return float(self.hits) / self.atBats if self.atBats else 0.0
+
+    def obp(self):
+        return float(self.hits + self.walks) / self.atBats if self.atBats else 0.0
+
+    def slg(self):
+        return float(self.totalBases) / (self.atBats - self.walks) if self.atBats > self.walks else 0.0
+
+    def ops(self):
+        return self.obp() + self.slg()
+
+    def strikeoutRate(self):
+        return float(self.strikeouts) / self.plateAppearances if self.plateAppearances else 0.0
+
+    def summary(self):
+        # returns the counts and rates as a dict
+        result = {
+            "PA": self.plateAppearances,
+            "AB": self.atBats,
+            "H": self.hits,
+            "HR": self.homeruns,
+            "BB": self.walks,
+            "K": self.strikeouts,
+            "RBI": self.rbi,
+            "AVG": self.battingAvg(),
+            "OBP": self.obp(),
+            "SLG": self.slg(),
+            "OPS": self.ops(),
+            "K%": self.strikeoutRate(),
+        }
+        return result
+
+
+class LineupContextStats:
+    # plate appearance outcomes by chemistry and lineup context over any number of games
+    def __init__(self):
+        self.events = RioColumns.EventColumns()
+
+    def addGame(self, statObj):
+        # adds the events of a game
+        self.events.addGame(statObj)
+        return self
+
+    def merge(self, other):
+        # adds the events of another LineupContextStats
+        self.events.extend(other.events)
+        return self
+
+    def __keyColumn(self, dimension: str):
+        if dimension not in DIMENSIONS:
+            raise Exception(f'Invalid split dimension {dimension}. Function accepts {list(DIMENSIONS)}')
+        columnName = DIMENSIONS[dimension]
+        column = self.events.column(columnName)
+        if columnName in self.events.codebooks:
+            values = self.events.codebook(columnName).values
+            return [values[code] for code in column]
+        if dimension == "captainBatting":
+            return [bool(value) for value in column]
+        return column
+
+    def splitTallies(self, *dimensions, batter: str = None):
+        # returns a dict of split key -> OutcomeTally
+        # the key is the dimension's value for one dimension, or a tuple of values for several
+        # batter: optional CharID, only count that character's plate appearances
+        if not dimensions:
+            raise Exception(f'split needs at least one dimension. Function accepts {list(DIMENSIONS)}')
+        keyColumns = [self.__keyColumn(dimension) for dimension in dimensions]
+        keys = keyColumns[0] if len(keyColumns) == 1 else zip(*keyColumns)
+
+        results = self.events.codebook("Result of AB").values
+        batterCode = None if batter is None else self.events.code("Batter", batter)
+        col = self.events.columns
+
+        tallies = {}
+        for key, endsPA, result, rbi, batterOfEvent in zip(keys, col["Ends PA"], col["Result of AB"], col["RBI"], col["Batter"]):
+            if not endsPA or (batter is not None and batterOfEvent != batterCode):
+                continue
+            tally = tallies.get(key)
+            if tally is None:
+                tally = tallies[key] = OutcomeTally()
+            tally.add(results[result], rbi)
+        return tallies
+
+    def split(self, *dimensions, batter: str = None):
+        # returns a dict of split key -> outcome summary (PA, AB, H, HR, BB, K, RBI, AVG, OBP, SLG, OPS, K%)
+        return {key: tally.summary() for key, tally in sorted(self.splitTallies(*dimensions, batter=batter).items())}
@@ -0,0 +1,399 @@
+'''
+Columnar views of the events in Rio stat files
+
+StatObj answers questions about one game with sets of event numbers. Analysis over many games
+is faster when the fields it needs are pulled out once into flat typed arrays (one array per
+field, one entry per record) and then scanned together. String fields like CharID or Steal type
+are stored as small int codes, the matching strings live in a Codebook per column.
+
+Column sets from different games or worker processes can be combined with extend(), which
+remaps codes from the other set's codebooks.
+
+How to use:
+- ex:
+	import RioColumns
+	runners = RioColumns.RunnerColumns()
+	for statObj in myStatObjs:
+		runners.addGame(statObj)
+	stealCodes = runners.column("Steal")
+	stealNames = runners.codebook("Steal").values
+'''
+
+from array import array
+from bisect import bisect_left, bisect_right
+
+
+class Codebook:
+    # maps strings to small int codes in the order they are first seen
+    def __init__(self, initial: list = ()):
+        self.values = []
+        self.codes = {}
+        for value in initial:
+            self.code(value)
+
+    def __len__(self):
+        return len(self.values)
+
+    def code(self, value):
+        # returns the code of a value, adding it if it is new
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.codes[value] = code
+            self.values.append(value)
+        return code
+
+    def lookup(self, value):
+        # returns the code of a value or -1 if it has not been seen
+        return self.codes.get(value, -1)
+
+    def remap(self, other):
+        # returns a list where remap[otherCode] is the code of the same value in this codebook
+        return [self.code(value) for value in other.values]
+
+
+class ColumnSet:
+    # a table of typed arrays with one entry per record
+    # SCHEMA lists (column name, array typecode) and CODED lists the columns stored as Codebook codes
+    SCHEMA = []
+    CODED = {}
+
+    def __init__(self):
+        self.columns = {name: array(typecode) for name, typecode in self.SCHEMA}
+        self.codebooks = {name: Codebook(initial) for name, initial in self.CODED.items()}
+        self.gameIDs = []
+
+    def __len__(self):
+        return len(self.columns[self.SCHEMA[0][0]])
+
+    def column(self, name: str):
+        # returns the typed array of a column
+        if name not in self.columns:
+            raise Exception(f'Invalid column {name}. Columns are {list(self.columns)}')
+        return self.columns[name]
+
+    def codebook(self, name: str):
+        # returns the Codebook of a coded column
+        if name not in self.codebooks:
+            raise Exception(f'Invalid coded column {name}. Coded columns are {list(self.codebooks)}')
+        return self.codebooks[name]
+
+    def code(self, name: str, value):
+        # returns the code of a value in a coded column or -1 if it never appears
+        return self.codebook(name).lookup(value)
+
+    def newGame(self, statObj):
+        # registers a game and returns its index for the 'Game' column
+        self.gameIDs.append(statObj.gameID())
+        return len(self.gameIDs) - 1
+
+    def gameRows(self, gameIndex: int):
+        # returns the range of record positions belonging to a game index
+        games = self.columns["Game"]
+        return range(bisect_left(games, gameIndex), bisect_right(games, gameIndex))
+
+    def extend(self, other, skipGameIDs=None):
+        # appends every record of another ColumnSet of the same type
+        # skipGameIDs: optional set of gameIDs whose records are left out, ex: the games already added
+        if type(other) is not type(self):
+            raise Exception(f'Cannot extend {type(self).__name__} with {type(other).__name__}')
+        if skipGameIDs:
+            return self.__extendGames(other, skipGameIDs)
+        gameOffset = len(self.gameIDs)
+        self.gameIDs.extend(other.gameIDs)
+        for name, _ in self.SCHEMA:
+            if name in self.codebooks:
+                remap = self.codebooks[name].remap(other.codebooks[name])
+                self.columns[name].extend(remap[code] for code in other.columns[name])
+            elif name == "Game":
+                self.columns[name].extend(game + gameOffset for game in other.columns[name])
+            else:
+                self.columns[name].extend(other.columns[name])
+        return self
+
+    def __extendGames(self, other, skipGameIDs):
+        # extend() for the records of the games of other not in skipGameIDs
+        gameIndices = []  # other game index -> game index here, -1 when skipped
+        for gameID in other.gameIDs:
+            if gameID in skipGameIDs:
+                gameIndices.append(-1)
+            else:
+                gameIndices.append(len(self.gameIDs))
+                self.gameIDs.append(gameID)
+        rows = [x for x, game in enumerate(other.columns["Game"]) if gameIndices[game] != -1]
+        for name, _ in self.SCHEMA:
+            column = other.columns[name]
+            if name in self.codebooks:
+                remap = self.codebooks[name].remap(other.codebooks[name])
+                self.columns[name].extend(remap[column[x]] for x in rows)
+            elif name == "Game":
+                self.columns[name].extend(gameIndices[column[x]] for x in rows)
+            else:
+                self.columns[name].extend(column[x] for x in rows)
+        return self
+
+
+# steal types as written in the stat file
+STEAL_TYPES = ["None", "Ready", "Normal", "Perfect"]
+
+HIT_BASES = {"Single": 1, "Double": 2, "Triple": 3, "HR": 4}
+
+RUNNER_KEYS = ["Runner Batter", "Runner 1B", "Runner 2B", "Runner 3B"]
+
+
+class RunnerColumns(ColumnSet):
+    # one record per runner entry ('Runner Batter', 'Runner 1B', 'Runner 2B', 'Runner 3B') of every event
+    # 'Team' is the batting team, which is the event's 'Half Inning'
+    # 'Result Base' 4 means the runner scored
+    SCHEMA = [
+        ("Game", "i"),
+        ("Event Num", "i"),
+        ("Team", "b"),
+        ("Roster Loc", "b"),
+        ("Character", "H"),
+        ("Is Batter", "b"),
+        ("Initial Base", "b"),
+        ("Result Base", "b"),
+        ("Out Type", "H"),
+        ("Out Location", "b"),
+        ("Steal", "H"),
+        ("Result of AB", "H"),
+    ]
+    CODED = {
+        "Character": [],
+        "Out Type": ["None"],
+        "Steal": STEAL_TYPES,
+        "Result of AB": ["None"] + list(HIT_BASES),
+    }
+
+    def addGame(self, statObj):
+        # appends every runner record of a game
+        game = self.newGame(statObj)
+        col = self.columns
+        characterCode = self.codebooks["Character"].code
+        outTypeCode = self.codebooks["Out Type"].code
+        stealCode = self.codebooks["Steal"].code
+        resultCode = self.codebooks["Result of AB"].code
+
+        for event in statObj.events():
+            result = resultCode(event["Result of AB"])
+            for key in RUNNER_KEYS:
+                if key not in event:
+                    continue
+                runner = event[key]
+                col["Game"].append(game)
+                col["Event Num"].append(event["Event Num"])
+                col["Team"].append(event["Half Inning"])
+                col["Roster Loc"].append(runner["Runner Roster Loc"])
+                col["Character"].append(characterCode(runner["Runner Char Id"]))
+                col["Is Batter"].append(key == "Runner Batter")
+                col["Initial Base"].append(runner["Runner Initial Base"])
+                col["Result Base"].append(runner["Runner Result Base"])
+                col["Out Type"].append(outTypeCode(runner["Out Type"]))
+                col["Out Location"].append(runner["Out Location"])
+                col["Steal"].append(stealCode(runner["Steal"]))
+                col["Result of AB"].append(result)
+        return self
+
+
+FIELDER_POSITIONS = ["P", "C", "1B", "2B", "3B", "SS", "LF", "CF", "RF"]
+
+
+class ContactColumns(ColumnSet):
+    # one record per event where the ball was put in play ('Contact' in the event's 'Pitch')
+    # 'Team' is the fielding team. fielder columns hold the code of "None" when there was no 'First Fielder'
+    # 'Outs On Play' is the event's 'Num Outs During Play'
+    SCHEMA = [
+        ("Game", "i"),
+        ("Event Num", "i"),
+        ("Team", "b"),
+        ("Has Fielder", "b"),
+        ("Fielder Character", "H"),
+        ("Fielder Position", "H"),
+        ("Fielder Action", "H"),
+        ("Fielder Bobble", "H"),
+        ("Manual Selected", "b"),
+        ("Landing X", "d"),
+        ("Landing Z", "d"),
+        ("Max Height", "d"),
+        ("Contact Quality", "d"),
+        ("Outs On Play", "b"),
+        ("Result of AB", "H"),
+    ]
+    CODED = {
+        "Fielder Character": ["None"],
+        "Fielder Position": ["None"] + FIELDER_POSITIONS,
+        "Fielder Action": ["None"],
+        "Fielder Bobble": ["None"],
+        "Result of AB": ["None"] + list(HIT_BASES),
+    }
+
+    def addGame(self, statObj):
+        # appends every ball in play of a game
+        game = self.newGame(statObj)
+        col = self.columns
+        characterCode = self.codebooks["Fielder Character"].code
+        positionCode = self.codebooks["Fielder Position"].code
+        actionCode = self.codebooks["Fielder Action"].code
+        bobbleCode = self.codebooks["Fielder Bobble"].code
+        resultCode = self.codebooks["Result of AB"].code
+
+        for event in statObj.events():
+            if "Pitch" not in event or "Contact" not in event["Pitch"]:
+                continue
+            contact = event["Pitch"]["Contact"]
+            col["Game"].append(game)
+            col["Event Num"].append(event["Event Num"])
+            col["Team"].append(abs(event["Half Inning"] - 1))
+            col["Landing X"].append(contact["Ball Landing Position - X"])
+            col["Landing Z"].append(contact["Ball Landing Position - Z"])
+            col["Max Height"].append(contact["Ball Max Height"])
+            col["Contact Quality"].append(contact["Contact Quality"])
+            col["Outs On Play"].append(event["Num Outs During Play"])
+            col["Result of AB"].append(resultCode(event["Result of AB"]))
+
+            if "First Fielder" not in contact:
+                col["Has Fielder"].append(False)
+                col["Fielder Character"].append(0)
+                col["Fielder Position"].append(0)
+                col["Fielder Action"].append(0)
+                col["Fielder Bobble"].append(0)
+                col["Manual Selected"].append(False)
+                continue
+            fielder = contact["First Fielder"]
+            col["Has Fielder"].append(True)
+            col["Fielder Character"].append(characterCode(fielder["Fielder Character"]))
+            col["Fielder Position"].append(positionCode(fielder["Fielder Position"]))
+            col["Fielder Action"].append(actionCode(fielder["Fielder Action"]))
+            col["Fielder Bobble"].append(bobbleCode(fielder["Fielder Bobble"]))
+            col["Manual Selected"].append(fielder["Fielder Manual Selected"] != "No Selected Char")
+        return self
+
+
+# results of AB that do not end the plate appearance
+NON_PA_RESULTS = ["None", "Foul"]
+
+
+class EventColumns(ColumnSet):
+    # one record per event with the game situation before the pitch
+    # 'Runners' is a bitmask of occupied bases: 1 == 1B, 2 == 2B, 4 == 3B
+    # 'Ends PA' is set when 'Result of AB' ends the plate appearance
+    # 'Lineup Spot' is the batter's roster spot, 0 -> 8
+    # 'Batter Hand' / 'Pitcher Hand' are 1 for left handed and 0 for right handed
+    # pitch columns are 0 / "None" for events without a 'Pitch'
+    # 'Runs' is the runs scored on the event, from StatObj.runsOfEvent
+    # 'Contact Quality' is 0 for pitches without 'Contact'
+    SCHEMA = [
+        ("Game", "i"),
+        ("Event Num", "i"),
+        ("Inning", "b"),
+        ("Half Inning", "b"),
+        ("Outs", "b"),
+        ("Balls", "b"),
+        ("Strikes", "b"),
+        ("Runners", "b"),
+        ("Chemistry Links on Base", "b"),
+        ("Lineup Spot", "b"),
+        ("Batter", "H"),
+        ("Pitcher", "H"),
+        ("Batter Is Captain", "b"),
+        ("Batting Captain", "H"),
+        ("Batter Hand", "b"),
+        ("Pitcher Hand", "b"),
+        ("Away Score", "h"),
+        ("Home Score", "h"),
+        ("Result of AB", "H"),
+        ("Ends PA", "b"),
+        ("RBI", "b"),
+        ("Runs", "b"),
+        ("Away Stars", "b"),
+        ("Home Stars", "b"),
+        ("Star Chance", "b"),
+        ("Pitcher Stamina", "b"),
+        ("Has Pitch", "b"),
+        ("Star Pitch", "b"),
+        ("Pitch Speed", "h"),
+        ("In Strikezone", "b"),
+        ("Type of Swing", "H"),
+        ("Has Contact", "b"),
+        ("Contact Quality", "d"),
+        ("Five Star", "b"),
+    ]
+    CODED = {
+        "Batter": [],
+        "Pitcher": [],
+        "Batting Captain": [],
+        "Result of AB": ["None"] + list(HIT_BASES),
+        "Type of Swing": ["None", "Star"],
+    }
+
+    def addGame(self, statObj):
+        # appends every event of a game
+        game = self.newGame(statObj)
+        col = self.columns
+        batterCode = self.codebooks["Batter"].code
+        pitcherCode = self.codebooks["Pitcher"].code
+        resultCode = self.codebooks["Result of AB"].code
+        swingCode = self.codebooks["Type of Swing"].code
+
+        rosters = [statObj.characterName(0), statObj.characterName(1)]
+        captains = [statObj.captain(0), statObj.captain(1)]
+        captainCodes = [self.codebooks["Batting Captain"].code(captain) for captain in captains]
+        battingLefty = [[statObj.battingHand(teamNum, x) == "Left" for x in range(0, 9)] for teamNum in range(0, 2)]
+        pitchingLefty = [[statObj.fieldingHand(teamNum, x) == "Left" for x in range(0, 9)] for teamNum in range(0, 2)]
+
+        runs = statObj.scoringTimeline()["Runs"]
+
+        for x, event in enumerate(statObj.events()):
+            battingTeam = event["Half Inning"]
+            fieldingTeam = abs(battingTeam - 1)
+            batter = rosters[battingTeam][event["Batter Roster Loc"]]
+            result = event["Result of AB"]
+            col["Game"].append(game)
+            col["Event Num"].append(event["Event Num"])
+            col["Inning"].append(event["Inning"])
+            col["Half Inning"].append(battingTeam)
+            col["Outs"].append(event["Outs"])
+            col["Balls"].append(event["Balls"])
+            col["Strikes"].append(event["Strikes"])
+            col["Runners"].append(("Runner 1B" in event) | ("Runner 2B" in event) << 1 | ("Runner 3B" in event) << 2)
+            col["Chemistry Links on Base"].append(event["Chemistry Links on Base"])
+            col["Lineup Spot"].append(event["Batter Roster Loc"])
+            col["Batter"].append(batterCode(batter))
+            col["Pitcher"].append(pitcherCode(rosters[fieldingTeam][event["Pitcher Roster Loc"]]))
+            col["Batter Is Captain"].append(batter == captains[battingTeam])
+            col["Batting Captain"].append(captainCodes[battingTeam])
+            col["Batter Hand"].append(battingLefty[battingTeam][event["Batter Roster Loc"]])
+            col["Pitcher Hand"].append(pitchingLefty[fieldingTeam][event["Pitcher Roster Loc"]])
+            col["Away Score"].append(event["Away Score"])
+            col["Home Score"].append(event["Home Score"])
+            col["Result of AB"].append(resultCode(result))
+            col["Ends PA"].append(result not in NON_PA_RESULTS)
+            col["RBI"].append(event["RBI"])
+            col["Runs"].append(runs[x])
+            col["Away Stars"].append(event["Away Stars"])
+            col["Home Stars"].append(event["Home Stars"])
+            col["Star Chance"].append(event["Star Chance"])
+            col["Pitcher Stamina"].append(event["Pitcher Stamina"])
+
+            pitch = event.get("Pitch")
+            if pitch is None:
+                col["Has Pitch"].append(False)
+                col["Star Pitch"].append(0)
+                col["Pitch Speed"].append(0)
+                col["In Strikezone"].append(0)
+                col["Type of Swing"].append(0)
+                col["Has Contact"].append(False)
+                col["Contact Quality"].append(0.0)
+                col["Five Star"].append(0)
+                continue
+            contact = pitch.get("Contact")
+            col["Has Pitch"].append(True)
+            col["Star Pitch"].append(pitch["Star Pitch"])
+            col["Pitch Speed"].append(pitch["Pitch Speed"])
+            col["In Strikezone"].append(pitch["In Strikezone"])
+            col["Type of Swing"].append(swingCode(pitch["Type of Swing"]))
+            col["Has Contact"].append(contact is not None)
+            col["Contact Quality"].append(0.0 if contact is None else contact["Contact Quality"])
+            col["Five Star"].append(contact is not None and contact["Star Swing Five-Star"] == 1)
+        return self
@@ -0,0 +1,352 @@
+'''
+SQLite database of Rio stat files
+
+GameDatabase loads stat files into one indexed SQLite file so questions about a whole corpus
+are a SQL query instead of a loop over StatObjs. Every stat file key has a fixed column, so the
+schema is the same for every stat file version. Keys a file does not have are NULL.
+
+Tables:
+- games: one row per game (header fields, dates as epoch seconds from RioStatLib.parseDate)
+- character_games: one row per roster spot (characterGameStats()), team 0 == away, 1 == home
+- events: one row per event
+- pitches: one row per event with a 'Pitch'
+- contacts: one row per pitch with 'Contact', including the 'First Fielder' fields
+- runners: one row per runner entry, runner is 'Batter', '1B', '2B' or '3B'
+
+Rows are keyed by (game_id, event_num). Games already in the database are skipped, so new
+stat files can be loaded on top of an existing database at any time.
+
+How to use:
+- ex:
+	import RioDatabase
+	db = RioDatabase.GameDatabase("rio.sqlite")
+	db.addFiles(listOfStatFilePaths, processes=8)
+	rows = db.query("SELECT char_id, SUM(hits) * 1.0 / SUM(at_bats) FROM character_games "
+	                "GROUP BY char_id HAVING SUM(at_bats) > 100")
+	db.close()
+'''
+
+import sqlite3
+from multiprocessing import Pool
+
+import RioStatLib
+import RioUtil
+
+
+SCHEMA_VERSION = 1
+
+# table -> list of (column, type, source key or key path)
+# key paths are tuples of nested keys
+TABLES = {
+    "games": [
+        ("game_id", "INTEGER", None),
+        ("path", "TEXT", None),
+        ("version", "TEXT", None),
+        ("date_start", "TEXT", "Date - Start"),
+        ("date_end", "TEXT", "Date - End"),
+        ("start_time", "REAL", None),
+        ("end_time", "REAL", None),
+        ("ranked", "INTEGER", "Ranked"),
+        ("netplay", "INTEGER", "Netplay"),
+        ("stadium", "TEXT", "StadiumID"),
+        ("away_player", "TEXT", "Away Player"),
+        ("home_player", "TEXT", "Home Player"),
+        ("away_score", "INTEGER", "Away Score"),
+        ("home_score", "INTEGER", "Home Score"),
+        ("innings_selected", "INTEGER", "Innings Selected"),
+        ("innings_played", "INTEGER", "Innings Played"),
+        ("quitter_team", "TEXT", "Quitter Team"),
+        ("average_ping", "INTEGER", "Average Ping"),
+        ("lag_spikes", "INTEGER", "Lag Spikes"),
+    ],
+    "character_games": [
+        ("game_id", "INTEGER", None),
+        ("team", "INTEGER", None),
+        ("roster", "INTEGER", None),
+        ("char_id", "TEXT", "CharID"),
+        ("superstar", "INTEGER", "Superstar"),
+        ("captain", "INTEGER", "Captain"),
+        ("fielding_hand", "TEXT", "Fielding Hand"),
+        ("batting_hand", "TEXT", "Batting Hand"),
+        ("batters_faced", "INTEGER", ("Defensive Stats", "Batters Faced")),
+        ("runs_allowed", "INTEGER", ("Defensive Stats", "Runs Allowed")),
+        ("earned_runs", "INTEGER", ("Defensive Stats", "Earned Runs")),
+        ("batters_walked", "INTEGER", ("Defensive Stats", "Batters Walked")),
+        ("batters_hit", "INTEGER", ("Defensive Stats", "Batters Hit")),
+        ("hits_allowed", "INTEGER", ("Defensive Stats", "Hits Allowed")),
+        ("hrs_allowed", "INTEGER", ("Defensive Stats", "HRs Allowed")),
+        ("pitches_thrown", "INTEGER", ("Defensive Stats", "Pitches Thrown")),
+        ("stamina", "INTEGER", ("Defensive Stats", "Stamina")),
+        ("was_pitcher", "INTEGER", ("Defensive Stats", "Was Pitcher")),
+        ("strikeouts_pitched", "INTEGER", ("Defensive Stats", "Strikeouts")),
+        ("star_pitches_thrown", "INTEGER", ("Defensive Stats", "Star Pitches Thrown")),
+        ("big_plays", "INTEGER", ("Defensive Stats", "Big Plays")),
+        ("outs_pitched", "INTEGER", ("Defensive Stats", "Outs Pitched")),
+        ("at_bats", "INTEGER", ("Offensive Stats", "At Bats")),
+        ("hits", "INTEGER", ("Offensive Stats", "Hits")),
+        ("singles", "INTEGER", ("Offensive Stats", "Singles")),
+        ("doubles", "INTEGER", ("Offensive Stats", "Doubles")),
+        ("triples", "INTEGER", ("Offensive Stats", "Triples")),
+        ("homeruns", "INTEGER", ("Offensive Stats", "Homeruns")),
+        ("successful_bunts", "INTEGER", ("Offensive Stats", "Successful Bunts")),
+        ("sac_flys", "INTEGER", ("Offensive Stats", "Sac Flys")),
+        ("strikeouts", "INTEGER", ("Offensive Stats", "Strikeouts")),
+        ("walks_bb", "INTEGER", ("Offensive Stats", "Walks (4 Balls)")),
+        ("walks_hit", "INTEGER", ("Offensive Stats", "Walks (Hit)")),
+        ("rbi", "INTEGER", ("Offensive Stats", "RBI")),
+        ("bases_stolen", "INTEGER", ("Offensive Stats", "Bases Stolen")),
+        ("star_hits", "INTEGER", ("Offensive Stats", "Star Hits")),
+    ],
+    "events": [
+        ("game_id", "INTEGER", None),
+        ("event_num", "INTEGER", "Event Num"),
+        ("inning", "INTEGER", "Inning"),
+        ("half_inning", "INTEGER", "Half Inning"),
+        ("away_score", "INTEGER", "Away Score"),
+        ("home_score", "INTEGER", "Home Score"),
+        ("balls", "INTEGER", "Balls"),
+        ("strikes", "INTEGER", "Strikes"),
+        ("outs", "INTEGER", "Outs"),
+        ("star_chance", "INTEGER", "Star Chance"),
+        ("away_stars", "INTEGER", "Away Stars"),
+        ("home_stars", "INTEGER", "Home Stars"),
+        ("pitcher_stamina", "INTEGER", "Pitcher Stamina"),
+        ("chemistry_links_on_base", "INTEGER", "Chemistry Links on Base"),
+        ("pitcher_roster", "INTEGER", "Pitcher Roster Loc"),
+        ("batter_roster", "INTEGER", "Batter Roster Loc"),
+        ("catcher_roster", "INTEGER", "Catcher Roster Loc"),
+        ("rbi", "INTEGER", "RBI"),
+        ("outs_during_play", "INTEGER", "Num Outs During Play"),
+        ("result", "TEXT", "Result of AB"),
+    ],
+    "pitches": [
+        ("game_id", "INTEGER", None),
+        ("event_num", "INTEGER", None),
+        ("pitcher_team", "INTEGER", "Pitcher Team Id"),
+        ("pitcher_char", "TEXT", "Pitcher Char Id"),
+        ("pitch_type", "TEXT", "Pitch Type"),
+        ("charge_type", "TEXT", "Charge Type"),
+        ("star_pitch", "INTEGER", "Star Pitch"),
+        ("pitch_speed", "INTEGER", "Pitch Speed"),
+        ("strikezone_position", "REAL", "Ball Position - Strikezone"),
+        ("in_strikezone", "INTEGER", "In Strikezone"),
+        ("bat_contact_x", "REAL", "Bat Contact Pos - X"),
+        ("bat_contact_z", "REAL", "Bat Contact Pos - Z"),
+        ("db", "INTEGER", "DB"),
+        ("type_of_swing", "TEXT", "Type of Swing"),
+    ],
+    "contacts": [
+        ("game_id", "INTEGER", None),
+        ("event_num", "INTEGER", None),
+        ("type_of_contact", "TEXT", "Type of Contact"),
+        ("charge_power_up", "REAL", "Charge Power Up"),
+        ("charge_power_down", "REAL", "Charge Power Down"),
+        ("five_star", "INTEGER", "Star Swing Five-Star"),
+        ("input_push_pull", "TEXT", "Input Direction - Push/Pull"),
+        ("input_stick", "TEXT", "Input Direction - Stick"),
+        ("frame_of_contact", "INTEGER", "Frame of Swing Upon Contact"),
+        ("ball_power", "INTEGER", "Ball Power"),
+        ("vert_angle", "INTEGER", "Vert Angle"),
+        ("horiz_angle", "INTEGER", "Horiz Angle"),
+        ("contact_absolute", "REAL", "Contact Absolute"),
+        ("contact_quality", "REAL", "Contact Quality"),
+        ("rng1", "INTEGER", "RNG1"),
+        ("rng2", "INTEGER", "RNG2"),
+        ("rng3", "INTEGER", "RNG3"),
+        ("velocity_x", "REAL", "Ball Velocity - X"),
+        ("velocity_y", "REAL", "Ball Velocity - Y"),
+        ("velocity_z", "REAL", "Ball Velocity - Z"),
+        ("contact_x", "REAL", "Ball Contact Pos - X"),
+        ("contact_z", "REAL", "Ball Contact Pos - Z"),
+        ("landing_x", "REAL", "Ball Landing Position - X"),
+        ("landing_y", "REAL", "Ball Landing Position - Y"),
+        ("landing_z", "REAL", "Ball Landing Position - Z"),
+        ("max_height", "REAL", "Ball Max Height"),
+        ("hang_time", "INTEGER", "Ball Hang Time"),
+        ("result_primary", "TEXT", "Contact Result - Primary"),
+        ("result_secondary", "TEXT", "Contact Result - Secondary"),
+        ("fielder_roster", "INTEGER", ("First Fielder", "Fielder Roster Location")),
+        ("fielder_position", "TEXT", ("First Fielder", "Fielder Position")),
+        ("fielder_char", "TEXT", ("First Fielder", "Fielder Character")),
+        ("fielder_action", "TEXT", ("First Fielder", "Fielder Action")),
+        ("fielder_jump", "INTEGER", ("First Fielder", "Fielder Jump")),
+        ("fielder_manual_selected", "TEXT", ("First Fielder", "Fielder Manual Selected")),
+        ("fielder_x", "REAL", ("First Fielder", "Fielder Position - X")),
+        ("fielder_y", "REAL", ("First Fielder", "Fielder Position - Y")),
+        ("fielder_z", "REAL", ("First Fielder", "Fielder Position - Z")),
+        ("fielder_bobble", "TEXT", ("First Fielder", "Fielder Bobble")),
+    ],
+    "runners": [
+        ("game_id", "INTEGER", None),
+        ("event_num", "INTEGER", None),
+        ("runner", "TEXT", None),
+        ("roster", "INTEGER", "Runner Roster Loc"),
+        ("char_id", "TEXT", "Runner Char Id"),
+        ("initial_base", "INTEGER", "Runner Initial Base"),
+        ("result_base", "INTEGER", "Runner Result Base"),
+        ("out_type", "TEXT", "Out Type"),
+        ("out_location", "INTEGER", "Out Location"),
+        ("steal", "TEXT", "Steal"),
+    ],
+}
+
+PRIMARY_KEYS = {
+    "games": ["game_id"],
+    "character_games": ["game_id", "team", "roster"],
+    "events": ["game_id", "event_num"],
+    "pitches": ["game_id", "event_num"],
+    "contacts": ["game_id", "event_num"],
+    "runners": ["game_id", "event_num", "runner"],
+}
+
+# index name -> (table, columns)
+INDEXES = {
+    "games_start_time": ("games", ["start_time"]),
+    "games_away_player": ("games", ["away_player"]),
+    "games_home_player": ("games", ["home_player"]),
+    "games_stadium": ("games", ["stadium"]),
+    "character_games_char_id": ("character_games", ["char_id"]),
+    "events_result": ("events", ["result"]),
+    "pitches_pitcher_char": ("pitches", ["pitcher_char"]),
+    "contacts_fielder_char": ("contacts", ["fielder_char"]),
+    "runners_char_id": ("runners", ["char_id"]),
+}
+
+RUNNER_NAMES = {"Runner Batter": "Batter", "Runner 1B": "1B", "Runner 2B": "2B", "Runner 3B": "3B"}
+
+
+def _value(source: dict, key, sqlType: str):
+    # returns the value of a key or key path converted to the column's type, None if missing
+    if isinstance(key, tuple):
+        for part in key[:-1]:
+            source = source.get(part, {})
+        key = key[-1]
+    value = source.get(key)
+    if sqlType == "INTEGER" and isinstance(value, str):
+        # some numbers are written as strings, ex: "Horiz Angle": "1,722"
+        try:
+            return int(value.replace(',', ''))
+        except ValueError:
+            return None
+    return value
+
+
+def _row(table: str, source: dict, *leading):
+    # returns a table row from the leading values then the keyed values of source
+    columns = TABLES[table]
+    return tuple(leading) + tuple(_value(source, key, sqlType) for _, sqlType, key in columns[len(leading):])
+
+
+def gameRows(statObj, path: str = None):
+    # returns a dict of table -> list of row tuples for one game
+    statJson = statObj.statJson
+    gameID = statObj.gameID()
+    rows = {table: [] for table in TABLES}
+    rows["games"].append(_row("games", statJson, gameID, path, statObj.version(), statJson["Date - Start"],
+                              statJson["Date - End"], statObj.startTimestamp(), statObj.endTimestamp()))
+
+    for teamNum in range(0, 2):
+        for rosterNum in range(0, 9):
+            character = statJson["Character Game Stats"][statObj.getTeamString(teamNum, rosterNum)]
+            rows["character_games"].append(_row("character_games", character, gameID, teamNum, rosterNum))
+
+    for event in statObj.events():
+        eventNum = event["Event Num"]
+        rows["events"].append(_row("events", event, gameID))
+        for runnerKey, runnerName in RUNNER_NAMES.items():
+            if runnerKey in event:
+                rows["runners"].append(_row("runners", event[runnerKey], gameID, eventNum, runnerName))
+        pitch = event.get("Pitch")
+        if pitch is None:
+            continue
+        rows["pitches"].append(_row("pitches", pitch, gameID, eventNum))
+        if "Contact" in pitch:
+            rows["contacts"].append(_row("contacts", pitch["Contact"], gameID, eventNum))
+    return rows
+
+
+def gameRowsFromFile(path: str):
+    # returns gameRows() of a stat file
+    return gameRows(RioStatLib.StatObj.from_path(path), path)
+
+
+class GameDatabase:
+    # SQLite file holding every table of TABLES
+    def __init__(self, path: str):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.createSchema()
+
+    def createSchema(self):
+        # creates the tables and indexes that do not exist yet
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        if version not in [0, SCHEMA_VERSION]:
+            raise Exception(f'Database {self.path} has schema version {version}, expected {SCHEMA_VERSION}')
+        with self.connection:
+            for table, columns in TABLES.items():
+                columnSql = ", ".join(f"{name} {sqlType}" for name, sqlType, _ in columns)
+                self.connection.execute(f"CREATE TABLE IF NOT EXISTS {table} "
+                                        f"({columnSql}, PRIMARY KEY ({', '.join(PRIMARY_KEYS[table])}))")
+            for name, (table, columns) in INDEXES.items():
+                self.connection.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({', '.join(columns)})")
+            self.connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def hasGame(self, gameID: int):
+        # returns if a game is already in the database
+        return self.connection.execute("SELECT 1 FROM games WHERE game_id = ?", (gameID,)).fetchone() is not None
+
+    def insertRows(self, gameRowsList: list):
+        # bulk inserts the gameRows() of many games in one transaction
+        # returns how many games were added. games already in the database are skipped
+        added = 0
+        seen = set()
+        tableRows = {table: [] for table in TABLES}
+        for rows in gameRowsList:
+            gameID = rows["games"][0][0]
+            if gameID in seen or self.hasGame(gameID):
+                continue
+            seen.add(gameID)
+            added += 1
+            for table, tableRowList in rows.items():
+                tableRows[table].extend(tableRowList)
+        with self.connection:
+            for table, rowList in tableRows.items():
+                if rowList:
+                    placeholders = ", ".join("?" * len(TABLES[table]))
+                    self.connection.executemany(f"INSERT INTO {table} VALUES ({placeholders})", rowList)
+        return added
+
+    def addGame(self, statObj, path: str = None):
+        # adds one StatObj. returns False if the game was already in the database
+        return self.insertRows([gameRows(statObj, path)]) == 1
+
+    def addGames(self, statObjs: list):
+        # adds many StatObjs in one transaction. returns how many were added
+        return self.insertRows([gameRows(statObj) for statObj in statObjs])
+
+    def addFiles(self, paths: list, processes: int = None, batchSize: int = 500):
+        # adds stat files. files are decoded into rows across a pool of worker processes and
+        # written by this process in transactions of batchSize games. returns how many were added
+        paths = list(paths)
+        added = 0
+        if processes == 1 or len(paths) < 2:
+            for start in range(0, len(paths), batchSize):
+                added += self.insertRows([gameRowsFromFile(path) for path in paths[start:start + batchSize]])
+            return added
+        chunksize = min(batchSize, RioUtil.poolChunksize(len(paths), processes))
+        with Pool(processes) as pool:
+            batch = []
+            for rows in pool.imap(gameRowsFromFile, paths, chunksize=chunksize):
+                batch.append(rows)
+                if len(batch) >= batchSize:
+                    added += self.insertRows(batch)
+                    batch = []
+            added += self.insertRows(batch)
+        return added
+
+    def query(self, sql: str, parameters=()):
+        # returns every row of a query as a list of tuples
+        return self.connection.execute(sql, parameters).fetchall()
+
+    def close(self):
+        self.connection.close()
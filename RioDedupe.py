@@ -0,0 +1,156 @@
+'''
+Duplicate game detection for archives of Rio stat files
+
+Both netplay clients upload the same game and retried uploads can leave partial copies, so an
+archive can hold several files of one game. Every file is fingerprinted from its header alone:
+the header keys are written before 'Character Game Stats' and 'Events', so only a bounded prefix
+of the file is read and decoded, and events are counted with a chunked byte search for
+'"Event Num"' instead of decoding them. No file is ever held in memory whole.
+
+Files are grouped by gameID plus a hash of the header fields both copies of a game share
+(players, stadium, innings selected, ranked). Each netplay client stamps its own start date, so
+the start date is left out of the hash. Scores, innings played and the end date are left out
+too, since a partial copy stops early. The most complete copy of a
+group is kept: most events, then most innings played, then a readable end date, then the
+largest file, then the first path.
+
+How to use:
+- ex:
+	import RioDedupe, RioValidate
+	paths = RioValidate.statFilePaths("stat_files")
+	keep, duplicates = RioDedupe.dedupe(paths, processes=8)
+	for path in duplicates:
+		RioDedupe.moveDuplicate(path, "stat_files_duplicates")
+'''
+
+import hashlib
+import json
+import os
+import shutil
+from multiprocessing import Pool
+
+import RioStatLib
+import RioUtil
+
+
+# header fields that are the same in every copy of a game
+# 'Date - Start' is not one of them, each netplay client writes its own start time
+FINGERPRINT_FIELDS = ["Away Player", "Home Player", "StadiumID", "Innings Selected", "Ranked"]
+
+HEADER_END = b'"Character Game Stats"'
+EVENT_KEY = b'"Event Num"'
+
+# bytes read looking for the header, a stat file header is well under 4 KiB
+HEADER_READ_BYTES = 64 * 1024
+# bytes read at a time while counting events
+READ_CHUNK_BYTES = 1024 * 1024
+
+
+def readHeader(data: bytes):
+    # returns the header dict of stat file bytes, decoding only the keys before 'Character Game Stats'
+    # decodes the whole file when the header can not be cut out
+    end = data.find(HEADER_END)
+    if end != -1:
+        try:
+            return RioStatLib.loadStatJson(data[:end].rstrip().rstrip(b",") + b"}")
+        except ValueError:
+            pass
+    statJson = RioStatLib.loadStatJson(data)
+    return {key: value for key, value in statJson.items() if key not in ["Character Game Stats", "Events"]}
+
+
+def countInFile(statFile, key: bytes):
+    # returns how many times key appears in an open binary file, reading it in chunks from the start
+    statFile.seek(0)
+    count = 0
+    tail = b""
+    while True:
+        chunk = statFile.read(READ_CHUNK_BYTES)
+        if not chunk:
+            return count
+        data = tail + chunk
+        count += data.count(key)
+        # keep the bytes a key split across chunks could start in, without any whole key in them
+        tail = data[-(len(key) - 1):]
+
+
+def fileFingerprint(path: str):
+    # returns a dict of 'Path', 'GameID', 'Fingerprint', 'Events', 'Innings Played', 'Has End Date', 'Size'
+    # or a dict with 'Path' and 'Error' if the file can not be read
+    try:
+        with open(path, "rb") as statFile:
+            prefix = statFile.read(HEADER_READ_BYTES)
+            if HEADER_END not in prefix:
+                # no header in the prefix, fall back to decoding the whole file
+                prefix += statFile.read()
+            header = readHeader(prefix)
+            events = countInFile(statFile, EVENT_KEY)
+            size = os.fstat(statFile.fileno()).st_size
+        fingerprint = hashlib.blake2b(
+            json.dumps([header.get(field) for field in FINGERPRINT_FIELDS]).encode(), digest_size=8).hexdigest()
+        return {
+            "Path": path,
+            "GameID": int(str(header["GameID"]).replace(',', ''), 16),
+            "Fingerprint": fingerprint,
+            "Events": events,
+            "Innings Played": header.get("Innings Played", 0),
+            "Has End Date": bool(header.get("Date - End")),
+            "Size": size,
+        }
+    except Exception as e:
+        return {"Path": path, "Error": f"{type(e).__name__}: {e}"}
+
+
+def completeness(fingerprint: dict):
+    # sort key of a file fingerprint, most complete copy first
+    return (-fingerprint["Events"], -fingerprint["Innings Played"], not fingerprint["Has End Date"],
+            -fingerprint["Size"], fingerprint["Path"])
+
+
+def fingerprintFiles(paths: list, processes: int = None):
+    # returns fileFingerprint() of every path, in the same order, across a pool of worker processes
+    paths = list(paths)
+    if processes == 1 or len(paths) < 2:
+        return [fileFingerprint(path) for path in paths]
+    chunksize = RioUtil.poolChunksize(len(paths), processes)
+    with Pool(processes) as pool:
+        return pool.map(fileFingerprint, paths, chunksize=chunksize)
+
+
+def groupDuplicates(fingerprints: list):
+    # returns a dict of (gameID, fingerprint) -> list of file fingerprints, most complete first
+    # files with an 'Error' are left out
+    groups = {}
+    for fingerprint in fingerprints:
+        if "Error" in fingerprint:
+            continue
+        groups.setdefault((fingerprint["GameID"], fingerprint["Fingerprint"]), []).append(fingerprint)
+    for group in groups.values():
+        group.sort(key=completeness)
+    return groups
+
+
+def findDuplicates(paths: list, processes: int = None):
+    # returns the groups of groupDuplicates() holding more than one file
+    groups = groupDuplicates(fingerprintFiles(paths, processes))
+    return {key: group for key, group in groups.items() if len(group) > 1}
+
+
+def dedupe(paths: list, processes: int = None):
+    # returns (paths to keep, duplicate paths)
+    # keeps the most complete copy of every game and every file that could not be read
+    fingerprints = fingerprintFiles(paths, processes)
+    keep = [fingerprint["Path"] for fingerprint in fingerprints if "Error" in fingerprint]
+    duplicates = []
+    for group in groupDuplicates(fingerprints).values():
+        keep.append(group[0]["Path"])
+        duplicates.extend(fingerprint["Path"] for fingerprint in group[1:])
+    return sorted(keep), sorted(duplicates)
+
+
+def moveDuplicate(path: str, duplicateDir: str):
+    # moves a duplicate stat file into duplicateDir
+    os.makedirs(duplicateDir, exist_ok=True)
+    destination = os.path.join(duplicateDir, os.path.basename(path))
+    shutil.move(path, destination)
+    return destination
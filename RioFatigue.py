@@ -0,0 +1,207 @@
+'''
+Pitcher stamina and fatigue curves from the per event 'Pitcher Stamina'
+
+StatObj.stamina() only gives a pitcher's stamina at the end of a game, but every event records
+the 'Pitcher Stamina' before the pitch. FatigueStats keeps every event of every game in
+RioColumns.EventColumns and groups them by pitcher appearance, a (game, fielding team, pitcher)
+triple, with one pass over the typed arrays. From there:
+- trajectory(): a pitcher's stamina pitch by pitch in one game
+- appearances(): start / end stamina, pitches and stamina used of every appearance
+- curve(): avg pitch speed, zone rate ('In Strikezone') and avg contact quality per stamina level
+- correlations(): pearson correlation of stamina with pitch speed, zone rate and contact quality
+Each can be limited to one pitcher. Contact quality only counts pitches with 'Contact'.
+
+How to use:
+- ex:
+	import RioFatigue
+	fatigue = RioFatigue.buildFatigue(listOfStatFilePaths, processes=8)
+	fatigue.trajectory(gameID, "Bowser")
+	fatigue.curve(pitcher="Bowser", bucketSize=2)
+	fatigue.correlations()
+	fatigue.pitcherCorrelations(minPitches=200)
+'''
+
+import os
+from array import array
+from multiprocessing import Pool
+
+import RioColumns
+import RioLeaderboard
+import RioStatLib
+import RioUtil
+
+
+CURVE_FIELDS = ["Pitch Speed", "In Strikezone", "Contact Quality"]
+
+
+class FatigueStats:
+    # every event of any number of games, grouped by pitcher appearance
+    def __init__(self):
+        self.events = RioColumns.EventColumns()
+        self.gameIDs = set()
+
+    def __len__(self):
+        return len(self.events.gameIDs)
+
+    def addGame(self, statObj):
+        # adds every event of a game. returns False if the game was already added
+        if statObj.gameID() in self.gameIDs:
+            return False
+        self.gameIDs.add(statObj.gameID())
+        self.events.addGame(statObj)
+        return True
+
+    def merge(self, other):
+        # adds the events of the games of another FatigueStats not added here yet
+        self.events.extend(other.events, self.gameIDs)
+        self.gameIDs |= other.gameIDs
+        return self
+
+    def __pitcherCode(self, pitcher: str):
+        # returns the pitcher code, None for every pitcher, -1 if the pitcher never appeared
+        return None if pitcher is None else self.events.code("Pitcher", pitcher)
+
+    def groupAppearances(self, pitcher: str = None):
+        # returns a dict of (game index, fielding team, pitcher code) -> array of event positions
+        # pitcher: optional, only that pitcher's appearances
+        col = self.events.columns
+        pitcherCode = self.__pitcherCode(pitcher)
+        groups = {}
+        for x, (game, half, code) in enumerate(zip(col["Game"], col["Half Inning"], col["Pitcher"])):
+            if pitcherCode is not None and code != pitcherCode:
+                continue
+            key = (game, 1 - half, code)
+            rows = groups.get(key)
+            if rows is None:
+                rows = groups[key] = array("i")
+            rows.append(x)
+        return groups
+
+    def trajectory(self, gameID: int, pitcher: str, team: int = None):
+        # returns a list of dicts of 'Event Num', 'Inning', 'Pitcher Stamina' and, for events with a pitch,
+        # 'Pitch Speed', 'In Strikezone', 'Contact Quality' (None without contact), in event order
+        # team: optional fielding team, for games where both teams have the pitcher's character
+        if gameID not in self.gameIDs:
+            raise Exception(f'Invalid gameID {gameID}. Game was not added')
+        col = self.events.columns
+        pitcherCode = self.__pitcherCode(pitcher)
+        trajectory = []
+        for x in self.events.gameRows(self.events.gameIDs.index(gameID)):
+            if col["Pitcher"][x] != pitcherCode or (team is not None and col["Half Inning"][x] == team):
+                continue
+            point = {"Event Num": col["Event Num"][x], "Inning": col["Inning"][x],
+                     "Pitcher Stamina": col["Pitcher Stamina"][x]}
+            if col["Has Pitch"][x]:
+                point["Pitch Speed"] = col["Pitch Speed"][x]
+                point["In Strikezone"] = col["In Strikezone"][x]
+                point["Contact Quality"] = col["Contact Quality"][x] if col["Has Contact"][x] else None
+            trajectory.append(point)
+        return trajectory
+
+    def appearances(self, pitcher: str = None):
+        # returns a list of dicts of 'Game ID', 'Team', 'Pitcher', 'Events', 'Pitches', 'Start Stamina',
+        # 'End Stamina', 'Stamina Used' for every appearance, in game order
+        # 'Team' is the fielding team as in the event 'Half Inning', 0 == away, 1 == home for 1.9.2 and later
+        col = self.events.columns
+        pitcherNames = self.events.codebook("Pitcher").values
+        result = []
+        for (game, team, code), rows in sorted(self.groupAppearances(pitcher).items()):
+            start = col["Pitcher Stamina"][rows[0]]
+            end = col["Pitcher Stamina"][rows[-1]]
+            result.append({"Game ID": self.events.gameIDs[game], "Team": team, "Pitcher": pitcherNames[code],
+                           "Events": len(rows), "Pitches": sum(col["Has Pitch"][x] for x in rows),
+                           "Start Stamina": start, "End Stamina": end, "Stamina Used": start - end})
+        return result
+
+    def __pitchRows(self, pitcher: str = None):
+        # yields (stamina, pitch speed, in strikezone, has contact, contact quality) of every pitch
+        col = self.events.columns
+        pitcherCode = self.__pitcherCode(pitcher)
+        for hasPitch, code, stamina, speed, zone, hasContact, quality in zip(
+                col["Has Pitch"], col["Pitcher"], col["Pitcher Stamina"], col["Pitch Speed"], col["In Strikezone"],
+                col["Has Contact"], col["Contact Quality"]):
+            if hasPitch and (pitcherCode is None or code == pitcherCode):
+                yield stamina, speed, zone, hasContact, quality
+
+    def curve(self, pitcher: str = None, bucketSize: int = 1, minPitches: int = 1):
+        # returns a dict of stamina bucket -> dict of 'Pitches', 'Avg Pitch Speed', 'Zone Rate', 'Contacts',
+        # 'Avg Contact Quality', lowest stamina first. a bucket is its lowest stamina level
+        # bucketSize: optional, stamina levels per bucket
+        # minPitches: optional, leaves out buckets with fewer pitches
+        if bucketSize < 1:
+            raise Exception(f'Invalid bucketSize {bucketSize}. Function accepts ints of 1 or more')
+        sums = {}  # bucket -> [pitches, pitch speed, in strikezone, contacts, contact quality]
+        for stamina, speed, zone, hasContact, quality in self.__pitchRows(pitcher):
+            bucket = stamina - stamina % bucketSize
+            entry = sums.get(bucket)
+            if entry is None:
+                entry = sums[bucket] = [0, 0, 0, 0, 0.0]
+            entry[0] += 1
+            entry[1] += speed
+            entry[2] += zone
+            if hasContact:
+                entry[3] += 1
+                entry[4] += quality
+        return {bucket: {"Pitches": pitches,
+                         "Avg Pitch Speed": float(speed) / pitches,
+                         "Zone Rate": float(zone) / pitches,
+                         "Contacts": contacts,
+                         "Avg Contact Quality": quality / contacts if contacts else None}
+                for bucket, (pitches, speed, zone, contacts, quality) in sorted(sums.items())
+                if pitches >= minPitches}
+
+    def correlations(self, pitcher: str = None):
+        # returns a dict of 'Pitches', 'Contacts' and the pearson correlation of 'Pitcher Stamina' with each
+        # of CURVE_FIELDS, None when there are too few pitches or a field never changes
+        # 'Contact Quality' is correlated over pitches with contact only
+        staminas, speeds, zones = array("i"), array("i"), array("i")
+        contactStaminas, qualities = array("i"), array("d")
+        for stamina, speed, zone, hasContact, quality in self.__pitchRows(pitcher):
+            staminas.append(stamina)
+            speeds.append(speed)
+            zones.append(zone)
+            if hasContact:
+                contactStaminas.append(stamina)
+                qualities.append(quality)
+        return {"Pitches": len(staminas), "Contacts": len(qualities),
+                "Pitch Speed": RioUtil.correlation(staminas, speeds),
+                "In Strikezone": RioUtil.correlation(staminas, zones),
+                "Contact Quality": RioUtil.correlation(contactStaminas, qualities)}
+
+    def pitcherCorrelations(self, minPitches: int = 1):
+        # returns a dict of pitcher -> correlations() for every pitcher with at least minPitches pitches
+        col = self.events.columns
+        pitches = {}
+        for hasPitch, code in zip(col["Has Pitch"], col["Pitcher"]):
+            if hasPitch:
+                pitches[code] = pitches.get(code, 0) + 1
+        pitcherNames = self.events.codebook("Pitcher").values
+        return {pitcherNames[code]: self.correlations(pitcherNames[code])
+                for code, count in sorted(pitches.items()) if count >= minPitches}
+
+
+def fatigueFiles(paths: list):
+    # builds the FatigueStats of one shard of stat file paths
+    fatigue = FatigueStats()
+    for path in paths:
+        fatigue.addGame(RioStatLib.StatObj.from_path(path))
+    return fatigue
+
+
+def buildFatigue(paths: list, processes: int = None, shardCount: int = None):
+    # builds FatigueStats from stat file paths across a pool of worker processes
+    # processes: optional, defaults to os.cpu_count(). 1 runs in this process
+    # shardCount: optional, defaults to 4 shards per process
+    if processes == 1:
+        return fatigueFiles(paths)
+    if processes is None:
+        processes = os.cpu_count() or 1
+    shards = RioLeaderboard.shard(list(paths), shardCount or processes * 4)
+
+    result = FatigueStats()
+    if not shards:
+        return result
+    with Pool(processes) as pool:
+        for fatigue in pool.imap_unordered(fatigueFiles, shards):
+            result.merge(fatigue)
+    return result
@@ -0,0 +1,153 @@
+'''
+Fielding analytics over the First Fielder data of many Rio stat files
+
+FieldingStats joins each ball in play's 'First Fielder' (character, position, action, bobble)
+with where the ball landed, using RioColumns.ContactColumns. It reports
+- chances, outs converted and bobble rates per fielding character or per fielding position
+- landing position heatmaps of chances and outs for any character or position
+
+Heatmaps bin 'Ball Landing Position - X' and '- Z' into a fixed grid. Landing spots outside
+the grid are counted in the nearest edge cell. grid[row][col] covers
+Z from zMin + row * binSize and X from xMin + col * binSize.
+
+How to use:
+- ex:
+	import RioFielding
+	fielding = RioFielding.FieldingStats()
+	for statObj in myStatObjs:
+		fielding.addGame(statObj)
+	byPosition = fielding.outConversion("position")
+	cfHeatmap = fielding.heatmap("position", "CF")
+	marioRate = fielding.outConversionRateGrid("character", "Mario")
+'''
+
+from array import array
+
+import RioColumns
+
+
+GROUP_BY_OPTIONS = {"character": "Fielder Character", "position": "Fielder Position"}
+
+
+class FieldingStats:
+    # fielding stats over any number of games
+    # xMin, xMax, zMin, zMax, binSize: optional, heatmap grid in stat file distance units
+    def __init__(self, xMin: float = -90.0, xMax: float = 90.0, zMin: float = -10.0, zMax: float = 130.0,
+                 binSize: float = 10.0):
+        self.contacts = RioColumns.ContactColumns()
+        self.xMin = xMin
+        self.zMin = zMin
+        self.binSize = binSize
+        self.cols = max(1, int(-(-(xMax - xMin) // binSize)))
+        self.rows = max(1, int(-(-(zMax - zMin) // binSize)))
+        self.__bins = None
+
+    def addGame(self, statObj):
+        # adds the balls in play of a game
+        self.contacts.addGame(statObj)
+        self.__bins = None
+        return self
+
+    def merge(self, other):
+        # adds the balls in play of another FieldingStats
+        self.contacts.extend(other.contacts)
+        self.__bins = None
+        return self
+
+    def __binIndices(self):
+        # flat heatmap cell of every ball in play, computed once per batch of added games
+        if self.__bins is not None:
+            return self.__bins
+        cols, rows, binSize = self.cols, self.rows, self.binSize
+        xMin, zMin = self.xMin, self.zMin
+        bins = array("i")
+        for x, z in zip(self.contacts.column("Landing X"), self.contacts.column("Landing Z")):
+            col = min(cols - 1, max(0, int((x - xMin) // binSize)))
+            row = min(rows - 1, max(0, int((z - zMin) // binSize)))
+            bins.append(row * cols + col)
+        self.__bins = bins
+        return bins
+
+    def __groupCodes(self, groupBy: str):
+        if groupBy not in GROUP_BY_OPTIONS:
+            raise Exception(f'Invalid groupBy arg {groupBy}. Function accepts {list(GROUP_BY_OPTIONS)}')
+        columnName = GROUP_BY_OPTIONS[groupBy]
+        return self.contacts.column(columnName), self.contacts.codebook(columnName)
+
+    def outConversion(self, groupBy: str = "character"):
+        # returns a dict of CharID or position -> dict of
+        # 'Chances': balls in play where they were the first fielder
+        # 'Outs': chances where an out was recorded on the play
+        # 'Rate': Outs / Chances
+        # 'Bobbles': chances with any Fielder Bobble
+        # 'Bobble Rate': Bobbles / Chances
+        # 'Bobble Types': {bobble type: count}
+        codes, codebook = self.__groupCodes(groupBy)
+        noBobble = self.contacts.code("Fielder Bobble", "None")
+        bobbleNames = self.contacts.codebook("Fielder Bobble").values
+
+        groupCount = len(codebook)
+        chances = [0] * groupCount
+        outs = [0] * groupCount
+        bobbles = [[0] * len(bobbleNames) for _ in range(groupCount)]
+        col = self.contacts.columns
+        for code, hasFielder, outsOnPlay, bobble in zip(codes, col["Has Fielder"], col["Outs On Play"], col["Fielder Bobble"]):
+            if not hasFielder:
+                continue
+            chances[code] += 1
+            if outsOnPlay > 0:
+                outs[code] += 1
+            bobbles[code][bobble] += 1
+
+        result = {}
+        for code, name in enumerate(codebook.values):
+            if chances[code] == 0:
+                continue
+            bobbleTypes = {bobbleNames[b]: count for b, count in enumerate(bobbles[code]) if count and b != noBobble}
+            bobbleTotal = sum(bobbleTypes.values())
+            result[name] = {
+                "Chances": chances[code],
+                "Outs": outs[code],
+                "Rate": float(outs[code]) / chances[code],
+                "Bobbles": bobbleTotal,
+                "Bobble Rate": float(bobbleTotal) / chances[code],
+                "Bobble Types": bobbleTypes,
+            }
+        return result
+
+    def heatmap(self, groupBy: str = None, key: str = None):
+        # returns {'Chances': grid, 'Outs': grid} of landing positions
+        # groupBy/key: optional, limit to one character ("character", "Mario") or position ("position", "CF")
+        # no groupBy counts every ball in play, including ones without a first fielder
+        chances = [0] * (self.rows * self.cols)
+        outs = [0] * (self.rows * self.cols)
+        bins = self.__binIndices()
+        outsOnPlay = self.contacts.column("Outs On Play")
+
+        if groupBy is None:
+            for cell, outCount in zip(bins, outsOnPlay):
+                chances[cell] += 1
+                if outCount > 0:
+                    outs[cell] += 1
+        else:
+            codes, codebook = self.__groupCodes(groupBy)
+            if not isinstance(key, str):
+                raise Exception(f'Invalid key {key} for groupBy {groupBy}. Function accepts a CharID or position string')
+            target = codebook.lookup(key.upper() if groupBy == "position" else key)
+            for cell, code, outCount in zip(bins, codes, outsOnPlay):
+                if code != target:
+                    continue
+                chances[cell] += 1
+                if outCount > 0:
+                    outs[cell] += 1
+
+        return {"Chances": self.__toGrid(chances), "Outs": self.__toGrid(outs)}
+
+    def outConversionRateGrid(self, groupBy: str = None, key: str = None):
+        # returns a grid of Outs / Chances per cell, None where there were no chances
+        counts = self.heatmap(groupBy, key)
+        return [[(float(o) / c if c else None) for c, o in zip(chanceRow, outRow)]
+                for chanceRow, outRow in zip(counts["Chances"], counts["Outs"])]
+
+    def __toGrid(self, flat: list):
+        return [flat[row * self.cols:(row + 1) * self.cols] for row in range(self.rows)]
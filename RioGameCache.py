@@ -0,0 +1,223 @@
+'''
+Process-level cache of constructed StatObjs
+
+Building a StatObj means decoding the stat json and indexing every event. Services that serve
+the same games over and over can keep the built objects in a GameCache instead. Games are
+found by a hash of the stat file bytes, so the file only has to be read and hashed, not
+decoded, on a hit. Each entry is keyed by (gameID, version, content hash) and the least
+recently used games are evicted once the cache holds more than maxGames games or more than
+maxBytes bytes of stat json. Evicted games can optionally be spilled to a directory as
+pickles, which load much faster than rebuilding the StatObj. Loading a pickle can run
+arbitrary code, so only point spillDir at a directory that nothing untrusted can write to.
+
+How to use:
+- ex:
+	import RioGameCache
+	RioGameCache.configure(maxGames=500, maxBytes=512 * 1024 * 1024, spillDir="/tmp/rio_spill")
+	myStats = RioGameCache.loadGame("path/to/RioStatFile.json")
+	sameStats = RioGameCache.defaultCache.getByGameID(myStats.gameID())
+
+- or keep your own cache:
+	cache = RioGameCache.GameCache(maxGames=64)
+	myStats = cache.load("path/to/RioStatFile.json")
+'''
+
+import hashlib
+import os
+import pickle
+import threading
+from collections import OrderedDict
+
+import RioStatLib
+
+
+def contentHash(data: bytes):
+    # returns a short hex digest identifying the bytes of a stat file
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+class GameCache:
+    # LRU cache of StatObjs keyed by (gameID, version, content hash)
+    # maxGames: optional, most games held in memory. None for no limit
+    # maxBytes: optional, most stat json bytes held in memory. None for no limit
+    # spillDir: optional, directory evicted games are pickled to. it must be trusted, spilled games are unpickled
+    def __init__(self, maxGames: int = 128, maxBytes: int = None, spillDir: str = None):
+        self.maxGames = maxGames
+        self.maxBytes = maxBytes
+        self.spillDir = spillDir
+        if spillDir is not None:
+            os.makedirs(spillDir, exist_ok=True)
+
+        self.hits = 0
+        self.misses = 0
+        self.spillHits = 0
+
+        self.__lock = threading.RLock()
+        self.__entries = OrderedDict()  # key -> (statObj, size)
+        self.__keyByHash = {}
+        self.__keysByGameID = {}
+        self.__bytes = 0
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def __contains__(self, key):
+        return key in self.__entries
+
+    def sizeBytes(self):
+        # returns the stat json bytes currently held in memory
+        return self.__bytes
+
+    def keys(self):
+        # returns cached keys from least to most recently used
+        with self.__lock:
+            return list(self.__entries.keys())
+
+    def load(self, path: str):
+        # returns the StatObj of a stat file, building it only if it is not cached
+        with open(path, "rb") as statFile:
+            return self.loadBytes(statFile.read())
+
+    def loadBytes(self, data: bytes):
+        # returns the StatObj of stat json bytes, building it only if it is not cached
+        digest = contentHash(data)
+        with self.__lock:
+            key = self.__keyByHash.get(digest)
+            if key is not None:
+                self.hits += 1
+                self.__entries.move_to_end(key)
+                return self.__entries[key][0]
+
+        statObj = self.__loadSpill(digest)
+        if statObj is not None:
+            self.spillHits += 1
+        else:
+            self.misses += 1
+            statObj = RioStatLib.StatObj.from_bytes(data)
+
+        self.put(statObj, digest, len(data))
+        return statObj
+
+    def put(self, statObj, digest: str, size: int):
+        # adds a built StatObj to the cache and evicts games until it is within its limits
+        key = (statObj.gameID(), statObj.version(), digest)
+        with self.__lock:
+            if key in self.__entries:
+                self.__entries.move_to_end(key)
+                return key
+            self.__entries[key] = (statObj, size)
+            self.__keyByHash[digest] = key
+            self.__keysByGameID.setdefault(key[0], []).append(key)
+            self.__bytes += size
+            evicted = self.__evict()
+        # pickling is slow, so evicted games are spilled after the lock is released
+        for digest, evictedObj in evicted:
+            self.__spill(digest, evictedObj)
+        return key
+
+    def get(self, key: tuple):
+        # returns the StatObj of a (gameID, version, content hash) key or None if it is not in memory
+        with self.__lock:
+            if key not in self.__entries:
+                return None
+            self.hits += 1
+            self.__entries.move_to_end(key)
+            return self.__entries[key][0]
+
+    def getByGameID(self, gameID: int):
+        # returns the most recently cached StatObj with the given gameID or None
+        with self.__lock:
+            keys = self.__keysByGameID.get(gameID)
+            if not keys:
+                return None
+            return self.get(keys[-1])
+
+    def remove(self, key: tuple):
+        # drops a game from memory without spilling it
+        with self.__lock:
+            if key in self.__entries:
+                self.__drop(key)
+
+    def clear(self):
+        # drops every game from memory. spilled games are kept
+        with self.__lock:
+            self.__entries.clear()
+            self.__keyByHash.clear()
+            self.__keysByGameID.clear()
+            self.__bytes = 0
+
+    def clearSpill(self):
+        # deletes every spilled game
+        if self.spillDir is None:
+            return
+        for fileName in os.listdir(self.spillDir):
+            if fileName.endswith(".pkl"):
+                os.remove(os.path.join(self.spillDir, fileName))
+
+    def __overLimit(self):
+        if self.maxGames is not None and len(self.__entries) > self.maxGames:
+            return True
+        if self.maxBytes is not None and self.__bytes > self.maxBytes and len(self.__entries) > 1:
+            return True
+        return False
+
+    def __evict(self):
+        # drops games until the cache is within its limits
+        # returns a list of (content hash, StatObj) of the dropped games to spill
+        evicted = []
+        while self.__overLimit():
+            key = next(iter(self.__entries))
+            evicted.append((key[2], self.__entries[key][0]))
+            self.__drop(key)
+        return evicted
+
+    def __drop(self, key: tuple):
+        statObj, size = self.__entries.pop(key)
+        self.__bytes -= size
+        del self.__keyByHash[key[2]]
+        gameKeys = self.__keysByGameID[key[0]]
+        gameKeys.remove(key)
+        if not gameKeys:
+            del self.__keysByGameID[key[0]]
+
+    def __spillPath(self, digest: str):
+        return os.path.join(self.spillDir, f"{digest}.pkl")
+
+    def __spill(self, digest: str, statObj):
+        if self.spillDir is None:
+            return
+        path = self.__spillPath(digest)
+        if os.path.exists(path):
+            return
+        # write then rename so a reader never sees a partial pickle
+        tmpPath = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmpPath, "wb") as spillFile:
+            pickle.dump(statObj, spillFile, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmpPath, path)
+
+    def __loadSpill(self, digest: str):
+        # unpickles a spilled game, which can run arbitrary code
+        # only safe when spillDir is a trusted directory this cache wrote
+        if self.spillDir is None:
+            return None
+        try:
+            with open(self.__spillPath(digest), "rb") as spillFile:
+                return pickle.load(spillFile)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+
+
+# cache shared by loadGame across the whole process
+defaultCache = GameCache()
+
+
+def configure(maxGames: int = 128, maxBytes: int = None, spillDir: str = None):
+    # replaces the process-level cache with one using new limits
+    global defaultCache
+    defaultCache = GameCache(maxGames, maxBytes, spillDir)
+    return defaultCache
+
+
+def loadGame(path: str):
+    # returns the StatObj of a stat file from the process-level cache
+    return defaultCache.load(path)
@@ -0,0 +1,180 @@
+'''
+Compact per-game index of Rio stat files
+
+A GameIndex keeps one record per game with the header fields (players, scores, dates, stadium,
+ping, lag spikes, ...) and a few outcome counters (strikeouts, input/chem errors, bobbles).
+Counters are counted once while the game is indexed, so reports over months of games read the
+index alone instead of decoding stat files or building StatObjs. Records are stored column by
+column in typed arrays and lists and the index saves to a single json file.
+
+Dates are parsed once with RioStatLib.parseDate into epoch seconds ("Start", "End"),
+unreadable dates are stored as -1.
+
+How to use:
+- ex:
+	import RioGameIndex
+	index = RioGameIndex.GameIndex()
+	index.addFiles(listOfStatFilePaths, processes=8)
+	index.save("games.index.json")
+
+	index = RioGameIndex.GameIndex.load("games.index.json")
+	pings = index.column("Average Ping")
+	firstGame = index.record(0)
+'''
+
+import json
+from array import array
+from multiprocessing import Pool
+
+import RioStatLib
+import RioUtil
+
+
+# numeric columns: (name, array typecode)
+NUMERIC_FIELDS = [
+    ("GameID", "Q"),
+    ("Start", "d"),
+    ("End", "d"),
+    ("Ranked", "b"),
+    ("Away Score", "h"),
+    ("Home Score", "h"),
+    ("Innings Selected", "b"),
+    ("Innings Played", "b"),
+    ("Average Ping", "i"),
+    ("Lag Spikes", "i"),
+    ("Events", "i"),
+    ("Strikeouts", "i"),
+    ("Input Errors", "i"),
+    ("Chem Errors", "i"),
+    ("Bobbles", "i"),
+    ("Home Runs", "i"),
+]
+
+TEXT_FIELDS = ["Path", "Version", "StadiumID", "Away Player", "Home Player", "Quitter Team"]
+
+
+def summarize(statJson: dict, path: str = None):
+    # returns the index record of a stat json as a dict
+    # counts outcomes with one loop over the events, without building a StatObj
+    strikeouts = inputErrors = chemErrors = bobbles = homeRuns = 0
+    for event in statJson["Events"]:
+        result = event["Result of AB"]
+        if result == "Strikeout":
+            strikeouts += 1
+        elif result == "Error - Input":
+            inputErrors += 1
+        elif result == "Error - Chem":
+            chemErrors += 1
+        elif result == "HR":
+            homeRuns += 1
+        contact = event.get("Pitch", {}).get("Contact", {})
+        if "First Fielder" in contact and contact["First Fielder"]["Fielder Bobble"] != "None":
+            bobbles += 1
+
+    start = RioStatLib.parseDate(statJson["Date - Start"])
+    end = RioStatLib.parseDate(statJson["Date - End"])
+    return {
+        "GameID": int(statJson["GameID"].replace(',', ''), 16),
+        "Start": -1.0 if start is None else start,
+        "End": -1.0 if end is None else end,
+        "Ranked": statJson["Ranked"],
+        "Away Score": statJson["Away Score"],
+        "Home Score": statJson["Home Score"],
+        "Innings Selected": statJson["Innings Selected"],
+        "Innings Played": statJson["Innings Played"],
+        "Average Ping": statJson["Average Ping"],
+        "Lag Spikes": statJson["Lag Spikes"],
+        "Events": len(statJson["Events"]),
+        "Strikeouts": strikeouts,
+        "Input Errors": inputErrors,
+        "Chem Errors": chemErrors,
+        "Bobbles": bobbles,
+        "Home Runs": homeRuns,
+        "Path": path,
+        "Version": statJson.get("Version", "Pre 0.1.7"),
+        "StadiumID": statJson["StadiumID"],
+        "Away Player": statJson["Away Player"],
+        "Home Player": statJson["Home Player"],
+        "Quitter Team": statJson["Quitter Team"],
+    }
+
+
+def summarizeFile(path: str):
+    # returns the index record of a stat file
+    with open(path, "rb") as statFile:
+        return summarize(RioStatLib.loadStatJson(statFile.read()), path)
+
+
+class GameIndex:
+    # one record per game, stored as columns
+    def __init__(self):
+        self.columns = {name: array(typecode) for name, typecode in NUMERIC_FIELDS}
+        self.columns.update({name: [] for name in TEXT_FIELDS})
+
+    def __len__(self):
+        return len(self.columns["GameID"])
+
+    def column(self, name: str):
+        # returns the array or list of a column
+        if name not in self.columns:
+            raise Exception(f'Invalid column {name}. Columns are {list(self.columns)}')
+        return self.columns[name]
+
+    def record(self, position: int):
+        # returns one game's record as a dict
+        return {name: values[position] for name, values in self.columns.items()}
+
+    def addRecord(self, record: dict):
+        # appends a record from summarize()
+        for name, values in self.columns.items():
+            values.append(record[name])
+        return self
+
+    def addStatJson(self, statJson: dict, path: str = None):
+        # indexes a decoded stat json
+        return self.addRecord(summarize(statJson, path))
+
+    def addStatObj(self, statObj, path: str = None):
+        # indexes a StatObj
+        return self.addRecord(summarize(statObj.statJson, path))
+
+    def addFiles(self, paths: list, processes: int = None):
+        # indexes stat files across a pool of worker processes. only the small records come back
+        paths = list(paths)
+        if processes == 1 or len(paths) < 2:
+            records = [summarizeFile(path) for path in paths]
+        else:
+            chunksize = RioUtil.poolChunksize(len(paths), processes)
+            with Pool(processes) as pool:
+                records = pool.map(summarizeFile, paths, chunksize=chunksize)
+        for record in records:
+            self.addRecord(record)
+        return self
+
+    def extend(self, other):
+        # appends every record of another GameIndex
+        for name, values in self.columns.items():
+            values.extend(other.columns[name])
+        return self
+
+    def select(self, positions):
+        # returns a new GameIndex holding only the records at positions, in that order
+        subset = GameIndex()
+        for name, values in self.columns.items():
+            subset.columns[name].extend(values[x] for x in positions)
+        return subset
+
+    def save(self, path: str):
+        # writes the index to a json file
+        with open(path, "w") as indexFile:
+            json.dump({name: list(values) for name, values in self.columns.items()}, indexFile)
+
+    @classmethod
+    def load(cls, path: str):
+        # reads an index written by save()
+        with open(path, "r") as indexFile:
+            saved = json.load(indexFile)
+        index = cls()
+        for name, values in index.columns.items():
+            values.extend(saved[name])
+        return index
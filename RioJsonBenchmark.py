@@ -0,0 +1,78 @@
+'''
+Benchmark of the json parsers in RioStatLib.JSON_PARSERS on real stat files
+
+Reads the files into memory first, then times for every installed parser
+- decode: loadStatJson only
+- decode + StatObj: StatObj.from_bytes
+and prints the time per game and the speedup over the standard library json module.
+orjson is optional (pip install orjson), without it only the json module is timed.
+
+How to use:
+	python RioJsonBenchmark.py path/to/stat_files --repeat 5
+	python RioJsonBenchmark.py game1.json game2.json
+'''
+
+import argparse
+import glob
+import os
+import time
+
+import RioStatLib
+
+
+def statFiles(paths: list):
+    # returns the bytes of every stat file, directories are searched for *.json
+    files = []
+    for path in paths:
+        names = sorted(glob.glob(os.path.join(path, "*.json"))) if os.path.isdir(path) else [path]
+        for name in names:
+            with open(name, "rb") as statFile:
+                files.append(statFile.read())
+    return files
+
+
+def timeParser(files: list, parser: str, buildStatObj: bool, repeat: int):
+    # returns the best time in seconds of repeat passes over every file
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for data in files:
+            if buildStatObj:
+                RioStatLib.StatObj.from_bytes(data, parser)
+            else:
+                RioStatLib.loadStatJson(data, parser)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def benchmark(files: list, repeat: int = 3):
+    # returns a dict of (parser, stage) -> best seconds over all files
+    results = {}
+    for parser in RioStatLib.JSON_PARSERS:
+        for stage, buildStatObj in [("decode", False), ("decode + StatObj", True)]:
+            results[(parser, stage)] = timeParser(files, parser, buildStatObj, repeat)
+    return results
+
+
+def main():
+    argParser = argparse.ArgumentParser(description="Time the installed json parsers on Rio stat files")
+    argParser.add_argument("paths", nargs="+", help="stat files or directories of stat files")
+    argParser.add_argument("--repeat", type=int, default=3, help="passes per parser, the best is reported")
+    args = argParser.parse_args()
+
+    files = statFiles(args.paths)
+    if not files:
+        raise SystemExit("No stat files found")
+    megabytes = sum(len(data) for data in files) / 1e6
+    print(f"{len(files)} games, {megabytes:.1f} MB, parsers: {list(RioStatLib.JSON_PARSERS)}")
+
+    results = benchmark(files, args.repeat)
+    for (parser, stage), seconds in results.items():
+        baseline = results[("json", stage)]
+        print(f"{parser:>8} {stage:<17} {seconds * 1000 / len(files):8.3f} ms/game "
+              f"{megabytes / seconds:8.1f} MB/s {baseline / seconds:6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+'''
+Builds season leaderboards from many Rio stat files
+
+Each game is reduced to raw counting stats (at bats, hits, outs pitched, ...) per character
+or per player. Counting stats can be summed across games in any order, so files can be split
+into shards, aggregated in separate processes and merged with a reduce step. Rate stats such
+as OPS and ERA are only computed at the end from the merged totals, which gives the exact
+season value instead of an average of per-game rates.
+
+How to use:
+- ex:
+	import RioLeaderboard
+	board = RioLeaderboard.buildLeaderboard(listOfStatFilePaths, groupBy="character", processes=4)
+	bestOPS = board.top("ops", 10, minimum=("atBats", 50))
+	bestERA = board.top("era", 10, minimum=("outsPitched", 90))
+
+- or feed StatObjs you have already built:
+	board = RioLeaderboard.Leaderboard("player")
+	for statObj in myStatObjs:
+		board.addGame(statObj)
+
+groupBy args:
+- "character" groups by CharID
+- "player" groups by the name of the player who used the character
+- "playerCharacter" groups by (player, CharID)
+'''
+
+import os
+from multiprocessing import Pool
+
+import RioStatLib
+
+
+# maps StatObj accessor names to the stat file keys they sum
+OFFENSIVE_STATS = {
+    "atBats": "At Bats",
+    "hits": "Hits",
+    "singles": "Singles",
+    "doubles": "Doubles",
+    "triples": "Triples",
+    "homeruns": "Homeruns",
+    "buntsLanded": "Successful Bunts",
+    "sacFlys": "Sac Flys",
+    "strikeouts": "Strikeouts",
+    "walksBallFour": "Walks (4 Balls)",
+    "walksHitByPitch": "Walks (Hit)",
+    "rbi": "RBI",
+    "basesStolen": "Bases Stolen",
+    "starHitsUsed": "Star Hits",
+}
+
+DEFENSIVE_STATS = {
+    "battersFaced": "Batters Faced",
+    "runsAllowed": "Runs Allowed",
+    "battersWalkedBallFour": "Batters Walked",
+    "battersHitByPitch": "Batters Hit",
+    "hitsAllowed": "Hits Allowed",
+    "homerunsAllowed": "HRs Allowed",
+    "pitchesThrown": "Pitches Thrown",
+    "strikeoutsPitched": "Strikeouts",
+    "starPitchesThrown": "Star Pitches Thrown",
+    "bigPlays": "Big Plays",
+    "outsPitched": "Outs Pitched",
+}
+
+RATE_STATS = ["battingAvg", "obp", "slg", "ops", "era", "inningsPitched", "walks", "battersWalked"]
+
+# stats where a smaller value ranks higher, by the kind of stat they are
+# batting strikeouts ("strikeouts") rank low first, pitching strikeouts ("strikeoutsPitched") high first
+LOWER_IS_BETTER = {
+    "offense": ["strikeouts"],
+    "defense": ["runsAllowed", "hitsAllowed", "homerunsAllowed", "battersWalkedBallFour", "battersHitByPitch"],
+    "rate": ["era", "battersWalked"],
+}
+
+
+def lowerIsBetter(statName: str):
+    # returns True when a smaller value of a stat ranks higher
+    if statName in OFFENSIVE_STATS:
+        return statName in LOWER_IS_BETTER["offense"]
+    if statName in DEFENSIVE_STATS:
+        return statName in LOWER_IS_BETTER["defense"]
+    return statName in LOWER_IS_BETTER["rate"]
+
+GROUP_BY_OPTIONS = ["character", "player", "playerCharacter"]
+
+
+def groupKey(groupBy: str, statObj, teamNum: int, characterStats: dict):
+    # returns the leaderboard key of a character appearance for a GROUP_BY_OPTIONS groupBy
+    if groupBy == "character":
+        return characterStats["CharID"]
+    if groupBy == "player":
+        return statObj.player(teamNum)
+    return (statObj.player(teamNum), characterStats["CharID"])
+
+
+def gameLines(statObj, groupBy: str):
+    # returns a dict of key -> StatLine of one game. a player's characters add up to one line,
+    # and every line counts the game once, so with groupBy "player" each player has 1 game, not 9
+    lines = {}
+    charStats = statObj.characterGameStats()
+    for teamNum in range(0, 2):
+        for rosterNum in range(0, 9):
+            characterStats = charStats[statObj.getTeamString(teamNum, rosterNum)]
+            key = groupKey(groupBy, statObj, teamNum, characterStats)
+            if key not in lines:
+                lines[key] = StatLine()
+                lines[key].games = 1
+            lines[key].addCharacter(characterStats)
+    return lines
+
+
+class StatLine:
+    # raw counting stats for one leaderboard entry
+    # rate stat methods use the same formulas as the StatObj methods of the same name
+    def __init__(self):
+        self.games = 0
+        self.offense = dict.fromkeys(OFFENSIVE_STATS, 0)
+        self.defense = dict.fromkeys(DEFENSIVE_STATS, 0)
+
+    def addCharacter(self, characterStats: dict):
+        # adds one character appearance from the "Character Game Stats" section of a stat file
+        # games is not touched, gameLines counts each key's game once
+        offensiveStats = characterStats["Offensive Stats"]
+        defensiveStats = characterStats["Defensive Stats"]
+        for stat, key in OFFENSIVE_STATS.items():
+            self.offense[stat] += offensiveStats[key]
+        for stat, key in DEFENSIVE_STATS.items():
+            self.defense[stat] += defensiveStats[key]
+
+    def merge(self, other):
+        # adds the totals of another StatLine into this one
+        self.games += other.games
+        for stat in self.offense:
+            self.offense[stat] += other.offense[stat]
+        for stat in self.defense:
+            self.defense[stat] += other.defense[stat]
+        return self
+
+    def subtract(self, other):
+        # takes the totals of another StatLine out of this one, the reverse of merge
+        self.games -= other.games
+        for stat in self.offense:
+            self.offense[stat] -= other.offense[stat]
+        for stat in self.defense:
+            self.defense[stat] -= other.defense[stat]
+        return self
+
+    def stat(self, statName: str):
+        # returns a counting stat or rate stat by its StatObj method name
+        if statName in self.offense:
+            return self.offense[statName]
+        if statName in self.defense:
+            return self.defense[statName]
+        if statName == "games":
+            return self.games
+        if statName in RATE_STATS:
+            return getattr(self, statName)()
+        raise Exception(f'Invalid stat {statName}. Function accepts {["games"] + list(OFFENSIVE_STATS) + list(DEFENSIVE_STATS) + RATE_STATS}')
+
+    def walks(self):
+        return self.offense["walksBallFour"] + self.offense["walksHitByPitch"]
+
+    def battersWalked(self):
+        return self.defense["battersWalkedBallFour"] + self.defense["battersHitByPitch"]
+
+    def battingAvg(self):
+        return float(self.offense["hits"]) / float(self.offense["atBats"])
+
+    def obp(self):
+        return float(self.offense["hits"] + self.walks()) / float(self.offense["atBats"])
+
+    def slg(self):
+        totalBases = (self.offense["singles"] + self.offense["doubles"] * 2
+                      + self.offense["triples"] * 3 + self.offense["homeruns"] * 4)
+        return float(totalBases) / float(self.offense["atBats"] - self.walks())
+
+    def ops(self):
+        return self.obp() + self.slg()
+
+    def inningsPitched(self):
+        return float(self.defense["outsPitched"]) / 3
+
+    def era(self):
+        return 9 * float(self.defense["runsAllowed"]) / self.inningsPitched()
+
+
+class Leaderboard:
+    # mergeable collection of StatLines keyed by character, player or (player, character)
+    def __init__(self, groupBy: str = "character"):
+        if groupBy not in GROUP_BY_OPTIONS:
+            raise Exception(f'Invalid groupBy arg {groupBy}. Function accepts {GROUP_BY_OPTIONS}')
+        self.groupBy = groupBy
+        self.gamesAdded = 0
+        self.lines = {}
+
+    def addGame(self, statObj):
+        # adds every character appearance of a game to the leaderboard, see gameLines
+        for key, line in gameLines(statObj, self.groupBy).items():
+            if key not in self.lines:
+                self.lines[key] = StatLine()
+            self.lines[key].merge(line)
+        self.gamesAdded += 1
+        return self
+
+    def merge(self, other):
+        # adds the totals of another Leaderboard built with the same groupBy into this one
+        if other.groupBy != self.groupBy:
+            raise Exception(f'Cannot merge a leaderboard grouped by {other.groupBy} into one grouped by {self.groupBy}')
+        for key, line in other.lines.items():
+            if key not in self.lines:
+                self.lines[key] = StatLine()
+            self.lines[key].merge(line)
+        self.gamesAdded += other.gamesAdded
+        return self
+
+    def statLine(self, key):
+        # returns the StatLine of a character, player or (player, character)
+        # returns an empty StatLine if the key never appeared rather than raising an error
+        if key not in self.lines:
+            return StatLine()
+        return self.lines[key]
+
+    def top(self, statName: str, n: int = 10, minimum: tuple = None, reverse: bool = None):
+        # returns a list of (key, value) sorted best first
+        # minimum: optional (statName, value) qualifier, ex: ("atBats", 50)
+        # reverse: optional, defaults to descending unless lowerIsBetter(statName)
+        # entries whose rate stat (or minimum rate stat) has a zero denominator are left out
+        if reverse is None:
+            reverse = not lowerIsBetter(statName)
+        ranked = []
+        for key, line in self.lines.items():
+            try:
+                if minimum is not None and line.stat(minimum[0]) < minimum[1]:
+                    continue
+                ranked.append((key, line.stat(statName)))
+            except ZeroDivisionError:
+                continue
+        ranked.sort(key=lambda entry: entry[1], reverse=reverse)
+        return ranked[:n]
+
+
+def shard(items: list, shardCount: int):
+    # splits a list into shardCount interleaved lists of roughly equal size
+    shardCount = max(1, shardCount)
+    return [items[x::shardCount] for x in range(0, shardCount) if items[x::shardCount]]
+
+
+def aggregateFiles(paths: list, groupBy: str = "character"):
+    # builds the partial Leaderboard for one shard of stat file paths
+    board = Leaderboard(groupBy)
+    for path in paths:
+        board.addGame(RioStatLib.StatObj.from_path(path))
+    return board
+
+
+def _aggregateShard(args):
+    return aggregateFiles(*args)
+
+
+def reduceLeaderboards(boards: list):
+    # merges partial Leaderboards into a single Leaderboard
+    if not boards:
+        raise Exception('reduceLeaderboards needs at least one Leaderboard')
+    result = Leaderboard(boards[0].groupBy)
+    for board in boards:
+        result.merge(board)
+    return result
+
+
+def buildLeaderboard(paths: list, groupBy: str = "character", processes: int = None, shardCount: int = None):
+    # builds a Leaderboard from stat file paths across a pool of worker processes
+    # processes: optional, defaults to os.cpu_count(). 1 runs in this process
+    # shardCount: optional, defaults to 4 shards per process so slow shards balance out
+    if processes == 1:
+        return aggregateFiles(paths, groupBy)
+
+    if processes is None:
+        processes = os.cpu_count() or 1
+    if shardCount is None:
+        shardCount = processes * 4
+    shards = shard(list(paths), shardCount)
+    if not shards:
+        return Leaderboard(groupBy)
+
+    with Pool(processes) as pool:
+        boards = pool.map(_aggregateShard, [(s, groupBy) for s in shards])
+    return reduceLeaderboards(boards)
@@ -0,0 +1,114 @@
+'''
+Netplay connection quality analytics over a RioGameIndex.GameIndex
+
+StatObj.ping() and StatObj.lagspikes() are per game. These reports read 'Average Ping',
+'Lag Spikes' and the outcome counters (input errors, chem errors, bobbles, strikeouts) straight
+from the columns of a GameIndex, so months of games are reported without decoding a single
+stat file or event. Both players of a game share its ping and lag spikes.
+
+Reports:
+- playerReport(): per player ping/lag and outcome rates, and how input errors move with ping
+- windowReport(windowDays): the same per time window (by 'Date - Start')
+- pingBucketReport(bucketSize): outcome rates per ping bucket, ex: 0-49ms, 50-99ms
+
+How to use:
+- ex:
+	import RioGameIndex, RioNetplay
+	index = RioGameIndex.GameIndex.load("games.index.json")
+	byPlayer = RioNetplay.playerReport(index, minGames=10)
+	weekly = RioNetplay.windowReport(index, windowDays=7)
+	byPing = RioNetplay.pingBucketReport(index, bucketSize=50)
+'''
+
+import math
+
+import RioUtil
+
+
+COUNTERS = ["Average Ping", "Lag Spikes", "Input Errors", "Chem Errors", "Bobbles", "Strikeouts"]
+
+DAY_SECONDS = 86400
+
+
+class LatencyGroup:
+    # ping, lag spikes and outcome counters of a group of games
+    def __init__(self):
+        self.games = 0
+        self.totals = {name: 0 for name in COUNTERS}
+        self.maxPing = 0
+        self.pings = []
+        self.inputErrors = []
+
+    def add(self, record: dict):
+        # adds a game's counters. record maps each of COUNTERS to a value
+        self.games += 1
+        for name in COUNTERS:
+            self.totals[name] += record[name]
+        self.maxPing = max(self.maxPing, record["Average Ping"])
+        self.pings.append(record["Average Ping"])
+        self.inputErrors.append(record["Input Errors"])
+        return self
+
+    def report(self):
+        # returns a dict of 'Games', 'Avg Ping', 'Max Ping', then per game averages of
+        # 'Lag Spikes', 'Input Errors', 'Chem Errors', 'Bobbles', 'Strikeouts'
+        # and 'Ping vs Input Errors', the correlation of ping and input errors per game
+        games = self.games
+        report = {"Games": games,
+                  "Avg Ping": float(self.totals["Average Ping"]) / games,
+                  "Max Ping": self.maxPing}
+        for name in COUNTERS[1:]:
+            report[name] = float(self.totals[name]) / games
+        report["Ping vs Input Errors"] = RioUtil.correlation(self.pings, self.inputErrors)
+        return report
+
+
+def _rows(index, positions=None):
+    # yields (position, {counter: value}) of the index
+    columns = [index.column(name) for name in COUNTERS]
+    for position in range(len(index)) if positions is None else positions:
+        yield position, {name: column[position] for name, column in zip(COUNTERS, columns)}
+
+
+def playerReport(index, minGames: int = 1, rankedOnly: bool = False):
+    # returns a dict of player -> LatencyGroup.report() for players with at least minGames
+    # rankedOnly: optional, only count ranked games
+    groups = {}
+    awayPlayers = index.column("Away Player")
+    homePlayers = index.column("Home Player")
+    ranked = index.column("Ranked")
+    for position, record in _rows(index):
+        if rankedOnly and not ranked[position]:
+            continue
+        for player in {awayPlayers[position], homePlayers[position]}:
+            groups.setdefault(player, LatencyGroup()).add(record)
+    return {player: group.report() for player, group in sorted(groups.items()) if group.games >= minGames}
+
+
+def windowReport(index, windowDays: float = 7, player: str = None):
+    # returns a dict of window start (epoch seconds) -> LatencyGroup.report(), oldest first
+    # windows are windowDays long and aligned to the epoch, ex: windowDays=1 gives UTC days
+    # games with an unreadable start date are skipped
+    # player: optional, only count that player's games
+    windowSeconds = windowDays * DAY_SECONDS
+    starts = index.column("Start")
+    awayPlayers = index.column("Away Player")
+    homePlayers = index.column("Home Player")
+    groups = {}
+    for position, record in _rows(index):
+        if starts[position] < 0:
+            continue
+        if player is not None and player not in (awayPlayers[position], homePlayers[position]):
+            continue
+        window = math.floor(starts[position] / windowSeconds) * windowSeconds
+        groups.setdefault(window, LatencyGroup()).add(record)
+    return {window: groups[window].report() for window in sorted(groups)}
+
+
+def pingBucketReport(index, bucketSize: int = 50):
+    # returns a dict of bucket lower bound (ms) -> LatencyGroup.report()
+    groups = {}
+    for position, record in _rows(index):
+        bucket = record["Average Ping"] // bucketSize * bucketSize
+        groups.setdefault(bucket, LatencyGroup()).add(record)
+    return {bucket: groups[bucket].report() for bucket in sorted(groups)}
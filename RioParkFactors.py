@@ -0,0 +1,157 @@
+'''
+Stadium park factors over many Rio stat files
+
+ParkFactors keeps running totals per stadium ('StadiumID') of games, innings, runs and home runs,
+and the landing position of every ball in play (RioColumns.ContactColumns). A park factor is a
+stadium's rate per inning over the rate per inning of every stadium together, so 1.2 means 20%
+more runs (or home runs) than an average stadium. Innings are 'Innings Played' * 2 half innings
+per game, skipped bottom halves are not taken out.
+
+Totals are updated per game, so new games can be added at any time. Run and home run totals
+can also come straight from a RioGameIndex.GameIndex without decoding any stat file; landing
+positions need the full game (addGame). A game is only counted once, by gameID, also when
+ParkFactors built from overlapping games are merged.
+
+How to use:
+- ex:
+	import RioParkFactors
+	parks = RioParkFactors.ParkFactors()
+	for statObj in myStatObjs:
+		parks.addGame(statObj)
+	factors = parks.factors(minGames=20)
+	factors["Bowser Castle"]["Run Factor"]
+	landing = parks.landingSummary()
+
+- from an index:
+	parks.addIndex(RioGameIndex.GameIndex.load("games.index.json"))
+'''
+
+import math
+
+import RioColumns
+
+
+TOTALS = ["Games", "Half Innings", "Runs", "Home Runs"]
+
+
+class ParkFactors:
+    # per stadium offense over any number of games
+    def __init__(self):
+        self.totals = {}
+        self.games = {}  # gameID -> (stadium, innings played, runs, home runs)
+        self.contacts = RioColumns.ContactColumns()
+        self.stadiums = []  # stadium per ContactColumns game index
+        self.contactGameIDs = set()  # gameIDs whose balls in play are in contacts
+
+    def __addTotals(self, gameID: int, stadium: str, inningsPlayed: int, runs: int, homeRuns: int):
+        self.games[gameID] = (stadium, inningsPlayed, runs, homeRuns)
+        totals = self.totals.get(stadium)
+        if totals is None:
+            totals = self.totals[stadium] = dict.fromkeys(TOTALS, 0)
+        totals["Games"] += 1
+        totals["Half Innings"] += 2 * inningsPlayed
+        totals["Runs"] += runs
+        totals["Home Runs"] += homeRuns
+
+    def addGame(self, statObj):
+        # adds a game's runs, home runs and balls in play. returns False if the game was already added
+        # a game added from an index only has its totals already, so just its balls in play are added
+        gameID = statObj.gameID()
+        if gameID in self.contactGameIDs:
+            return False
+        stadium = statObj.stadium()
+        if gameID not in self.games:
+            statJson = statObj.statJson
+            self.__addTotals(gameID, stadium, statObj.inningsPlayed(),
+                             statJson["Away Score"] + statJson["Home Score"], len(statObj.hitEvents(4)))
+        self.contacts.addGame(statObj)
+        self.stadiums.append(stadium)
+        self.contactGameIDs.add(gameID)
+        return True
+
+    def addIndex(self, index):
+        # adds the runs and home runs of every game of a RioGameIndex.GameIndex not added yet
+        # returns how many games were added
+        col = index.columns
+        added = 0
+        for gameID, stadium, innings, away, home, homeRuns in zip(
+                col["GameID"], col["StadiumID"], col["Innings Played"], col["Away Score"], col["Home Score"],
+                col["Home Runs"]):
+            if gameID in self.games:
+                continue
+            self.__addTotals(gameID, stadium, innings, away + home, homeRuns)
+            added += 1
+        return added
+
+    def merge(self, other):
+        # adds the totals and balls in play of the games of another ParkFactors not added here yet
+        # balls in play of a game added here from an index only are still taken from other
+        for gameID, record in other.games.items():
+            if gameID not in self.games:
+                self.__addTotals(gameID, *record)
+        skipGameIDs = set(self.contactGameIDs)
+        self.stadiums.extend(stadium for gameID, stadium in zip(other.contacts.gameIDs, other.stadiums)
+                             if gameID not in skipGameIDs)
+        self.contacts.extend(other.contacts, skipGameIDs)
+        self.contactGameIDs.update(other.contactGameIDs)
+        return self
+
+    def factors(self, minGames: int = 1):
+        # returns a dict of stadium -> dict of the TOTALS, 'Runs Per Game', 'Home Runs Per Game',
+        # 'Run Factor' and 'Home Run Factor', for stadiums with at least minGames
+        # factors are None when no stadium has a home run (or run)
+        league = dict.fromkeys(TOTALS, 0)
+        for totals in self.totals.values():
+            for name in TOTALS:
+                league[name] += totals[name]
+
+        def rate(totals, name):
+            return float(totals[name]) / totals["Half Innings"] if totals["Half Innings"] else 0.0
+
+        result = {}
+        for stadium, totals in sorted(self.totals.items()):
+            if totals["Games"] < minGames:
+                continue
+            line = dict(totals)
+            line["Runs Per Game"] = float(totals["Runs"]) / totals["Games"]
+            line["Home Runs Per Game"] = float(totals["Home Runs"]) / totals["Games"]
+            for name, factorName in [("Runs", "Run Factor"), ("Home Runs", "Home Run Factor")]:
+                leagueRate = rate(league, name)
+                line[factorName] = rate(totals, name) / leagueRate if leagueRate else None
+            result[stadium] = line
+        return result
+
+    def landing(self, stadium: str):
+        # returns a dict of 'Landing X', 'Landing Z', 'Result of AB' lists of every ball in play at a stadium
+        col = self.contacts.columns
+        resultNames = self.contacts.codebook("Result of AB").values
+        landing = {"Landing X": [], "Landing Z": [], "Result of AB": []}
+        for game, x, z, result in zip(col["Game"], col["Landing X"], col["Landing Z"], col["Result of AB"]):
+            if self.stadiums[game] == stadium:
+                landing["Landing X"].append(x)
+                landing["Landing Z"].append(z)
+                landing["Result of AB"].append(resultNames[result])
+        return landing
+
+    def landingSummary(self):
+        # returns a dict of stadium -> dict of 'Balls In Play', 'Avg Distance', 'Avg Home Run Distance',
+        # 'Home Runs Per Ball In Play'. distance is from (0, 0) to the landing position
+        # stadiums without balls in play (only added from an index) are left out
+        col = self.contacts.columns
+        homeRun = self.contacts.code("Result of AB", "HR")
+        sums = {}
+        for game, x, z, result in zip(col["Game"], col["Landing X"], col["Landing Z"], col["Result of AB"]):
+            entry = sums.get(self.stadiums[game])
+            if entry is None:
+                entry = sums[self.stadiums[game]] = [0, 0.0, 0, 0.0]
+            distance = math.sqrt(x * x + z * z)
+            entry[0] += 1
+            entry[1] += distance
+            if result == homeRun:
+                entry[2] += 1
+                entry[3] += distance
+        return {stadium: {"Balls In Play": balls,
+                          "Avg Distance": distance / balls,
+                          "Avg Home Run Distance": homeRunDistance / homeRuns if homeRuns else None,
+                          "Home Runs Per Ball In Play": float(homeRuns) / balls}
+                for stadium, (balls, distance, homeRuns, homeRunDistance) in sorted(sums.items())}
@@ -0,0 +1,212 @@
+'''
+Player ratings (Elo or Glicko) updated incrementally over the stream of ranked games
+
+RatingEngine keeps one rating per player in flat arrays indexed by a small player id, so a
+full history of tens of thousands of games replays quickly and the state saves to a small json
+file. New games are applied on top of a loaded state, and games already applied are skipped by
+gameID, so a nightly job only needs to feed the games it has not seen.
+
+Games must be fed in date order. A game's result only needs the header of a stat file
+(players, scores, Ranked, Quitter Team, GameID), see gameResult().
+
+How to use:
+- ex:
+	import RioRatings
+	engine = RioRatings.RatingEngine("glicko")
+	for statObj in myStatObjsInDateOrder:
+		engine.addGame(statObj)
+	engine.save("ratings.json")
+
+- next night:
+	engine = RioRatings.RatingEngine.load("ratings.json")
+	engine.addStatJsons(newStatJsonsInDateOrder)
+	top = engine.leaderboard(10)
+'''
+
+import json
+import math
+from array import array
+
+import RioStatLib
+
+
+SYSTEMS = ["elo", "glicko"]
+
+DEFAULT_PARAMS = {
+    "elo": {"initialRating": 1500.0, "k": 32.0, "scale": 400.0},
+    # rdPerDay: RD growth per day of inactivity. games without a timestamp count as one day
+    "glicko": {"initialRating": 1500.0, "initialRD": 350.0, "minRD": 30.0, "rdPerDay": 7.0},
+}
+
+GLICKO_Q = math.log(10) / 400
+
+
+def gameResult(statJson: dict):
+    # returns (gameID, isRanked, away player, home player, away outcome) from a stat json header
+    # away outcome: 1 == away win, 0 == home win, 0.5 == tie. a player who quit loses
+    # "Away Player" and "Away Score" use the same labels in every version, so they always match
+    awayPlayer = statJson["Away Player"]
+    homePlayer = statJson["Home Player"]
+    quitter = statJson.get("Quitter Team", "")
+    if quitter == awayPlayer:
+        outcome = 0.0
+    elif quitter == homePlayer:
+        outcome = 1.0
+    elif statJson["Away Score"] > statJson["Home Score"]:
+        outcome = 1.0
+    elif statJson["Away Score"] < statJson["Home Score"]:
+        outcome = 0.0
+    else:
+        outcome = 0.5
+    gameID = int(statJson["GameID"].replace(',', ''), 16)
+    return gameID, statJson["Ranked"] == 1, awayPlayer, homePlayer, outcome
+
+
+class RatingEngine:
+    # Elo or Glicko-1 ratings over a stream of games
+    # params: optional overrides of DEFAULT_PARAMS for the system
+    # rankedOnly: optional, skip games where isRanked() is False
+    def __init__(self, system: str = "elo", params: dict = None, rankedOnly: bool = True):
+        if system not in SYSTEMS:
+            raise Exception(f'Invalid rating system {system}. Function accepts {SYSTEMS}')
+        self.system = system
+        self.params = dict(DEFAULT_PARAMS[system])
+        self.params.update(params or {})
+        self.rankedOnly = rankedOnly
+
+        self.players = []
+        self.playerIds = {}
+        self.ratings = array("d")
+        self.deviations = array("d")
+        self.games = array("i")
+        self.lastPlayed = array("d")
+        self.seenGameIDs = set()
+        self.gamesApplied = 0
+
+    def playerId(self, player: str):
+        # returns the id of a player, adding them at the initial rating if they are new
+        playerId = self.playerIds.get(player)
+        if playerId is None:
+            playerId = len(self.players)
+            self.playerIds[player] = playerId
+            self.players.append(player)
+            self.ratings.append(self.params["initialRating"])
+            self.deviations.append(self.params.get("initialRD", 0.0))
+            self.games.append(0)
+            self.lastPlayed.append(-1.0)
+        return playerId
+
+    def addGame(self, statObj, timestamp: float = None):
+        # applies a StatObj's result. returns False if it was skipped
+        # timestamp: optional epoch seconds, defaults to the game's start date
+        timestamp = statObj.startTimestamp() if timestamp is None else timestamp
+        return self.addResult(*gameResult(statObj.statJson), timestamp=timestamp)
+
+    def addStatJsons(self, statJsons: list):
+        # applies many stat json dicts in order, each at its 'Date - Start'. returns how many were applied
+        return sum(1 for statJson in statJsons
+                   if self.addResult(*gameResult(statJson), timestamp=RioStatLib.parseDate(statJson.get("Date - Start"))))
+
+    def addResult(self, gameID: int, isRanked: bool, awayPlayer: str, homePlayer: str, awayOutcome: float,
+                  timestamp: float = None):
+        # applies one game result. returns False if it was skipped
+        # timestamp: optional epoch seconds, used by glicko to grow RD with inactivity
+        if gameID in self.seenGameIDs or (self.rankedOnly and not isRanked) or awayPlayer == homePlayer:
+            return False
+        self.seenGameIDs.add(gameID)
+        away = self.playerId(awayPlayer)
+        home = self.playerId(homePlayer)
+        if self.system == "elo":
+            self.__updateElo(away, home, awayOutcome)
+        else:
+            self.__updateGlicko(away, home, awayOutcome, timestamp)
+        self.games[away] += 1
+        self.games[home] += 1
+        self.gamesApplied += 1
+        return True
+
+    def __updateElo(self, away: int, home: int, awayOutcome: float):
+        ratings = self.ratings
+        expected = 1.0 / (1.0 + 10 ** ((ratings[home] - ratings[away]) / self.params["scale"]))
+        change = self.params["k"] * (awayOutcome - expected)
+        ratings[away] += change
+        ratings[home] -= change
+
+    def __inflateRD(self, player: int, timestamp: float):
+        # grows a player's RD for the time since their last game
+        if timestamp is None or self.lastPlayed[player] < 0:
+            days = 1.0
+        else:
+            days = max(0.0, (timestamp - self.lastPlayed[player]) / 86400.0)
+        rd = math.sqrt(self.deviations[player] ** 2 + self.params["rdPerDay"] ** 2 * days)
+        return min(rd, self.params["initialRD"])
+
+    def __updateGlicko(self, away: int, home: int, awayOutcome: float, timestamp: float):
+        rds = [self.__inflateRD(away, timestamp), self.__inflateRD(home, timestamp)]
+        ratings = [self.ratings[away], self.ratings[home]]
+        outcomes = [awayOutcome, 1.0 - awayOutcome]
+        for me, player in enumerate([away, home]):
+            them = 1 - me
+            g = 1.0 / math.sqrt(1.0 + 3.0 * GLICKO_Q ** 2 * rds[them] ** 2 / math.pi ** 2)
+            expected = 1.0 / (1.0 + 10 ** (-g * (ratings[me] - ratings[them]) / 400.0))
+            dSquared = 1.0 / (GLICKO_Q ** 2 * g ** 2 * expected * (1.0 - expected))
+            denominator = 1.0 / rds[me] ** 2 + 1.0 / dSquared
+            self.ratings[player] = ratings[me] + GLICKO_Q / denominator * g * (outcomes[me] - expected)
+            self.deviations[player] = max(math.sqrt(1.0 / denominator), self.params["minRD"])
+            if timestamp is not None:
+                self.lastPlayed[player] = timestamp
+
+    def rating(self, player: str):
+        # returns (rating, deviation, games) of a player. deviation is 0 for elo
+        # returns None if the player has no rated games
+        playerId = self.playerIds.get(player)
+        if playerId is None:
+            return None
+        return (self.ratings[playerId], self.deviations[playerId], self.games[playerId])
+
+    def leaderboard(self, n: int = None, minGames: int = 0):
+        # returns a list of (player, rating, deviation, games), highest rating first
+        board = [(self.players[x], self.ratings[x], self.deviations[x], self.games[x])
+                 for x in range(len(self.players)) if self.games[x] >= minGames]
+        board.sort(key=lambda entry: entry[1], reverse=True)
+        return board if n is None else board[:n]
+
+    def toDict(self):
+        # returns the full engine state as json-serializable lists and numbers
+        return {
+            "system": self.system,
+            "params": self.params,
+            "rankedOnly": self.rankedOnly,
+            "players": self.players,
+            "ratings": self.ratings.tolist(),
+            "deviations": self.deviations.tolist(),
+            "games": self.games.tolist(),
+            "lastPlayed": self.lastPlayed.tolist(),
+            "seenGameIDs": sorted(self.seenGameIDs),
+            "gamesApplied": self.gamesApplied,
+        }
+
+    @classmethod
+    def fromDict(cls, state: dict):
+        # rebuilds an engine from toDict()
+        engine = cls(state["system"], state["params"], state["rankedOnly"])
+        engine.players = list(state["players"])
+        engine.playerIds = {player: x for x, player in enumerate(engine.players)}
+        engine.ratings = array("d", state["ratings"])
+        engine.deviations = array("d", state["deviations"])
+        engine.games = array("i", state["games"])
+        engine.lastPlayed = array("d", state["lastPlayed"])
+        engine.seenGameIDs = set(state["seenGameIDs"])
+        engine.gamesApplied = state["gamesApplied"]
+        return engine
+
+    def save(self, path: str):
+        # writes the engine state to a json file
+        with open(path, "w") as stateFile:
+            json.dump(self.toDict(), stateFile)
+
+    @classmethod
+    def load(cls, path: str):
+        # reads an engine state written by save()
+        with open(path, "r") as stateFile:
+            return cls.fromDict(json.load(stateFile))
@@ -0,0 +1,288 @@
+'''
+Game replay and Monte Carlo simulation from Rio stat file events
+
+GameReplay walks the events of a game once and keeps the game state before every event
+(inning, half, outs, count, runners, score, stars, pitcher stamina, lineup spot) in one typed
+array per field, plus the change each event made (runs, outs on the play, runners after the
+play). The state before or after any event is then a lookup at one array position.
+
+TransitionModel mines, from any number of games, how often each pitch moves the half inning
+from one (balls, strikes, outs, runners) state to the next and how many runs score on the way.
+simulate() plays the rest of a game from any state many times with those empirical
+probabilities and reports win probabilities and expected final scores. Runs are the only
+thing simulated, stars, stamina and mercy rules are not. With the same seed a simulation
+always returns the same result.
+
+Runners is a bitmask of occupied bases: 1 == 1B, 2 == 2B, 4 == 3B.
+'Away' scores and stars are the team batting in the top half, in VERSION_LIST_HOME_AWAY_FLIPPED
+versions they are read from the 'Home' labelled fields.
+
+How to use:
+- ex:
+	import RioReplay
+	model = RioReplay.TransitionModel()
+	for statObj in myStatObjs:
+		model.addGame(statObj)
+
+	replay = RioReplay.GameReplay(myStatObj)
+	state = replay.stateBefore(40)
+	after = replay.stateAfter(40)
+	whatIf = replay.simulate(40, model, trials=5000, seed=1)
+	whatIf["Away Win"]
+'''
+
+import random
+from array import array
+from bisect import bisect_right
+
+import RioStatLib
+
+
+# state fields: (name, array typecode)
+STATE_FIELDS = [
+    ("Inning", "b"),
+    ("Half Inning", "b"),
+    ("Outs", "b"),
+    ("Balls", "b"),
+    ("Strikes", "b"),
+    ("Runners", "b"),
+    ("Away Score", "h"),
+    ("Home Score", "h"),
+    ("Away Stars", "b"),
+    ("Home Stars", "b"),
+    ("Pitcher Stamina", "b"),
+    ("Lineup Spot", "b"),
+]
+
+# change made by each event: (name, array typecode)
+DELTA_FIELDS = [
+    ("Runs", "b"),
+    ("Outs On Play", "b"),
+    ("Runners After", "b"),
+]
+
+RUNNER_BITS = {"Runner 1B": 1, "Runner 2B": 2, "Runner 3B": 4}
+
+# outcome of a transition that ends the half inning
+END_OF_HALF = -1
+
+
+def runnersAfter(event: dict):
+    # returns the runners bitmask after an event from the result base of every runner
+    # runners who were put out or scored leave the bases
+    runners = 0
+    for key in ["Runner Batter", "Runner 1B", "Runner 2B", "Runner 3B"]:
+        runner = event.get(key)
+        if runner is None or runner["Out Type"] != "None":
+            continue
+        base = runner["Runner Result Base"]
+        if 1 <= base <= 3:
+            runners |= 1 << (base - 1)
+    return runners
+
+
+class GameReplay:
+    # state of a game before and after each event
+    def __init__(self, statObj):
+        self.gameID = statObj.gameID()
+        self.inningsTotal = statObj.inningsTotal()
+        self.state = {name: array(typecode) for name, typecode in STATE_FIELDS}
+        self.deltas = {name: array(typecode) for name, typecode in DELTA_FIELDS}
+        self.eventNums = array("i")
+        self.positions = {}
+
+        # state field -> event key. the Away/Home labels are swapped in flipped versions
+        eventKeys = {name: name for name in ["Inning", "Half Inning", "Outs", "Balls", "Strikes", "Away Score",
+                                             "Home Score", "Away Stars", "Home Stars", "Pitcher Stamina"]}
+        if statObj.version() in RioStatLib.VERSION_LIST_HOME_AWAY_FLIPPED:
+            for field in ["Score", "Stars"]:
+                eventKeys[f"Away {field}"], eventKeys[f"Home {field}"] = f"Home {field}", f"Away {field}"
+
+        timeline = statObj.scoringTimeline()
+        state = self.state
+        for x, event in enumerate(statObj.events()):
+            self.positions[event["Event Num"]] = x
+            self.eventNums.append(event["Event Num"])
+            for name, key in eventKeys.items():
+                state[name].append(event[key])
+            state["Runners"].append(sum(bit for key, bit in RUNNER_BITS.items() if key in event))
+            state["Lineup Spot"].append(event["Batter Roster Loc"])
+            self.deltas["Runs"].append(timeline["Runs"][x])
+            self.deltas["Outs On Play"].append(event["Num Outs During Play"])
+            self.deltas["Runners After"].append(runnersAfter(event))
+
+        self.finalScore = (statObj.statJson[eventKeys["Away Score"]], statObj.statJson[eventKeys["Home Score"]])
+
+    def __len__(self):
+        return len(self.eventNums)
+
+    def position(self, eventNum: int):
+        # returns the array position of an event
+        if eventNum not in self.positions:
+            raise Exception(f'Invalid event num {eventNum}. Game {self.gameID} has events '
+                            f'{self.eventNums[0] if len(self) else None} -> {self.eventNums[-1] if len(self) else None}')
+        return self.positions[eventNum]
+
+    def stateBefore(self, eventNum: int):
+        # returns a dict of the game state at the start of an event
+        position = self.position(eventNum)
+        return {name: values[position] for name, values in self.state.items()}
+
+    def delta(self, eventNum: int):
+        # returns a dict of what an event changed: 'Runs', 'Outs On Play', 'Runners After'
+        position = self.position(eventNum)
+        return {name: values[position] for name, values in self.deltas.items()}
+
+    def stateAfter(self, eventNum: int):
+        # returns a dict of the game state at the end of an event
+        # this is the state before the next event, or the end of game state after the last event
+        position = self.position(eventNum)
+        if position + 1 < len(self):
+            return self.stateBefore(self.eventNums[position + 1])
+        after = self.stateBefore(eventNum)
+        after["Away Score"], after["Home Score"] = self.finalScore
+        after["Outs"] = min(3, after["Outs"] + self.deltas["Outs On Play"][position])
+        after["Balls"] = after["Strikes"] = 0
+        after["Runners"] = 0 if after["Outs"] >= 3 else self.deltas["Runners After"][position]
+        return after
+
+    def endsHalfInning(self, position: int):
+        # returns if the half inning ended on the event at a position
+        # the last event of the game only ends a half inning with the third out
+        if position + 1 < len(self):
+            return (self.state["Inning"][position + 1] != self.state["Inning"][position]
+                    or self.state["Half Inning"][position + 1] != self.state["Half Inning"][position])
+        return self.state["Outs"][position] + self.deltas["Outs On Play"][position] >= 3
+
+    def simulate(self, eventNum: int, model, trials: int = 1000, seed: int = None, extraInnings: int = 3):
+        # simulates the rest of the game from the start of an event, see simulate()
+        return simulate(model, self.stateBefore(eventNum), self.inningsTotal, trials, seed, extraInnings)
+
+
+class TransitionModel:
+    # empirical pitch to pitch transitions of (balls, strikes, outs, runners) within a half inning
+    def __init__(self):
+        # state -> {outcome: count}. outcome is (next state, runs) or (END_OF_HALF, runs)
+        self.transitions = {}
+        self.__cumulative = {}
+
+    def addGame(self, statObj):
+        # adds the transitions of every event of a game
+        return self.addReplay(GameReplay(statObj))
+
+    def addReplay(self, replay: GameReplay):
+        # adds the transitions of every event of a GameReplay
+        state = replay.state
+        for position in range(len(replay)):
+            ends = replay.endsHalfInning(position)
+            if position + 1 == len(replay) and not ends:
+                # the game ended mid half inning (walk-off or quit), where it was going is unknown
+                continue
+            before = (state["Balls"][position], state["Strikes"][position],
+                      state["Outs"][position], state["Runners"][position])
+            if ends:
+                after = END_OF_HALF
+            else:
+                after = (state["Balls"][position + 1], state["Strikes"][position + 1],
+                         state["Outs"][position + 1], state["Runners"][position + 1])
+            self.__count(before, (after, replay.deltas["Runs"][position]), 1)
+        return self
+
+    def merge(self, other):
+        # adds the transitions of another TransitionModel
+        for before, outcomes in other.transitions.items():
+            for outcome, count in outcomes.items():
+                self.__count(before, outcome, count)
+        return self
+
+    def __count(self, before: tuple, outcome: tuple, count: int):
+        outcomes = self.transitions.setdefault(before, {})
+        outcomes[outcome] = outcomes.get(outcome, 0) + count
+        self.__cumulative.pop(before, None)
+
+    def probabilities(self, before: tuple):
+        # returns a dict of outcome -> probability from a (balls, strikes, outs, runners) state
+        outcomes = self.transitions.get(before, {})
+        total = float(sum(outcomes.values()))
+        return {outcome: count / total for outcome, count in outcomes.items()}
+
+    def sample(self, before: tuple, rng: random.Random):
+        # returns a random outcome from a state, weighted by how often it was seen
+        # states never seen fall back to the same outs and runners on a 0-0 count, then to an out
+        for state in [before, (0, 0) + tuple(before[2:])]:
+            if state in self.transitions:
+                break
+        else:
+            outs = before[2] + 1
+            return (END_OF_HALF, 0) if outs >= 3 else ((0, 0, outs, before[3]), 0)
+
+        cumulative = self.__cumulative.get(state)
+        if cumulative is None:
+            outcomes = list(self.transitions[state].items())
+            weights = array("q")
+            total = 0
+            for _, count in outcomes:
+                total += count
+                weights.append(total)
+            cumulative = self.__cumulative[state] = ([outcome for outcome, _ in outcomes], weights)
+        outcomes, weights = cumulative
+        return outcomes[bisect_right(weights, rng.randrange(weights[-1]))]
+
+
+def simulateHalfInning(model: TransitionModel, before: tuple, rng: random.Random, homeDeficit: int = None,
+                       maxPitches: int = 500):
+    # returns the runs scored in the rest of a half inning from a (balls, strikes, outs, runners) state
+    # homeDeficit: optional, in a bottom half that can end the game, stop as soon as the home team leads
+    runs = 0
+    for _ in range(maxPitches):
+        after, scored = model.sample(before, rng)
+        runs += scored
+        if after == END_OF_HALF or (homeDeficit is not None and runs > homeDeficit):
+            break
+        before = after
+    return runs
+
+
+def simulate(model: TransitionModel, state: dict, inningsTotal: int, trials: int = 1000, seed: int = None,
+             extraInnings: int = 3):
+    # plays the rest of a game trials times from a state (GameReplay.stateBefore)
+    # the bottom half of the last inning is skipped when the home team leads, and ends on a walk-off
+    # tied games go to extra innings, up to extraInnings more, then end tied
+    # returns a dict of 'Trials', 'Away Win', 'Home Win', 'Tie' (probabilities),
+    # 'Away Runs', 'Home Runs' (expected final scores) and 'Final Scores' ({(away, home): count})
+    if not isinstance(trials, int) or trials < 1:
+        raise Exception(f'Invalid trials {trials}. Function accepts ints of 1 or more')
+    rng = random.Random(seed)
+    lastInning = inningsTotal + extraInnings
+    finalScores = {}
+    for _ in range(trials):
+        scores = [state["Away Score"], state["Home Score"]]
+        inning = state["Inning"]
+        half = state["Half Inning"]
+        before = (state["Balls"], state["Strikes"], state["Outs"], state["Runners"])
+        while True:
+            lastHalf = half == 1 and inning >= inningsTotal
+            homeDeficit = scores[0] - scores[1] if lastHalf else None
+            scores[half] += simulateHalfInning(model, before, rng, homeDeficit)
+            before = (0, 0, 0, 0)
+            if inning >= inningsTotal:
+                if half == 0 and scores[1] > scores[0]:
+                    break
+                if half == 1 and (scores[0] != scores[1] or inning >= lastInning):
+                    break
+            inning += half
+            half = 1 - half
+        key = (scores[0], scores[1])
+        finalScores[key] = finalScores.get(key, 0) + 1
+
+    awayWins = sum(count for (away, home), count in finalScores.items() if away > home)
+    homeWins = sum(count for (away, home), count in finalScores.items() if home > away)
+    return {
+        "Trials": trials,
+        "Away Win": float(awayWins) / trials,
+        "Home Win": float(homeWins) / trials,
+        "Tie": float(trials - awayWins - homeWins) / trials,
+        "Away Runs": float(sum(away * count for (away, home), count in finalScores.items())) / trials,
+        "Home Runs": float(sum(home * count for (away, home), count in finalScores.items())) / trials,
+        "Final Scores": finalScores,
+    }
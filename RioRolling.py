@@ -0,0 +1,102 @@
+'''
+Rolling form stats ("last 10 games", "last 30 days") over a stream of games
+
+RollingStats keeps, per character, player or (player, character), the counting stats of every
+game still inside the window and a running RioLeaderboard.StatLine of their sum. A new game adds
+its counting stats to the running totals and games falling out of the window are subtracted
+again, so every rolling line is always current and each game costs one add and at most one
+subtract per stat, never a rescan of history. Rate stats (OPS, ERA, ...) come from the running
+totals with the same formulas as StatObj.
+
+Windows:
+- games: each key keeps only its last games games
+- days: games that started more than days before the newest game fall out
+Both can be set together. Games must be added in date order.
+
+How to use:
+- ex:
+	import RioRolling
+	lastTen = RioRolling.RollingStats("character", games=10)
+	lastMonth = RioRolling.RollingStats("player", days=30)
+	for statObj in myStatObjsInDateOrder:
+		lastTen.addGame(statObj)
+		lastMonth.addGame(statObj)
+	lastTen.line("Mario").ops()
+	lastMonth.top("era", 10, minimum=("outsPitched", 30))
+'''
+
+from collections import deque
+
+import RioLeaderboard
+
+
+DAY_SECONDS = 86400
+
+
+class RollingStats:
+    # rolling StatLines over the last games games and/or days days
+    def __init__(self, groupBy: str = "character", games: int = None, days: float = None):
+        if games is None and days is None:
+            raise Exception('RollingStats needs a window: games, days or both')
+        self.board = RioLeaderboard.Leaderboard(groupBy)
+        self.groupBy = groupBy
+        self.games = games
+        self.days = days
+        self.windows = {}  # key -> deque of (timestamp, StatLine of one game)
+        self.history = deque()  # (timestamp, key, StatLine of one game) in the order added
+        self.latest = None
+
+    def addGame(self, statObj, timestamp: float = None):
+        # adds a game and evicts what falls out of the windows
+        # timestamp: optional epoch seconds, defaults to the game's start date
+        timestamp = statObj.startTimestamp() if timestamp is None else timestamp
+        if timestamp is None:
+            raise Exception(f'Game {statObj.gameID()} has no readable start date, pass a timestamp')
+        if self.latest is not None and timestamp < self.latest:
+            raise Exception(f'Games must be added in date order. Game {statObj.gameID()} is older than the last game added')
+        self.latest = timestamp
+
+        for key, gameLine in RioLeaderboard.gameLines(statObj, self.groupBy).items():
+            entry = (timestamp, key, gameLine)
+            self.windows.setdefault(key, deque()).append(entry)
+            self.board.lines.setdefault(key, RioLeaderboard.StatLine()).merge(gameLine)
+            if self.days is not None:
+                self.history.append(entry)
+            if self.games is not None and len(self.windows[key]) > self.games:
+                self.__evict(self.windows[key].popleft())
+        self.board.gamesAdded += 1
+        self.advance(timestamp)
+        return self
+
+    def __evict(self, entry: tuple):
+        _, key, gameLine = entry
+        self.board.lines[key].subtract(gameLine)
+        if not self.windows[key]:
+            del self.windows[key]
+            del self.board.lines[key]
+
+    def advance(self, now: float):
+        # evicts the games that started more than days before now, without adding a game
+        if self.days is None:
+            return self
+        cutoff = now - self.days * DAY_SECONDS
+        while self.history and self.history[0][0] < cutoff:
+            entry = self.history.popleft()
+            window = self.windows.get(entry[1])
+            # the entry may already be gone from the games window
+            if window and window[0] is entry:
+                window.popleft()
+                self.__evict(entry)
+        return self
+
+    def keys(self):
+        # returns the keys with at least one game in the window
+        return list(self.board.lines)
+
+    def line(self, key):
+        # returns the rolling StatLine of a key, an empty StatLine if it has no game in the window
+        return self.board.statLine(key)
+
+    def top(self, statName: str, n: int = 10, minimum: tuple = None, reverse: bool = None):
+        # returns a list of (key, value) sorted best first, see RioLeaderboard.Leaderboard.top
+        return self.board.top(statName, n, minimum, reverse)
@@ -0,0 +1,185 @@
+'''
+Roster composition mining: win rates by character, character pair, captain and full roster
+
+Every team in every game becomes one team-game record. Characters get a small int id
+(RioColumns.Codebook) and a roster is stored as a bitset with one bit per character id, so a
+full roster is one int, and any character combination on a roster is a subset of its bits.
+Each record also keeps the bitset of its starred (Superstar) characters, the captain id and the
+team's outcome: 1 win, 0 loss, 0.5 tie, and a player who quit loses (RioRatings.gameResult).
+
+Counting walks the records once and sums games and wins per combination, top() then ranks
+combinations by win rate with heapq.
+
+How to use:
+- ex:
+	import RioRosters
+	rosters = RioRosters.RosterStats()
+	for statObj in myStatObjs:
+		rosters.addGame(statObj)
+	bestPairs = rosters.top(size=2, n=10, minGames=30)
+	bestCaptains = rosters.top(by="captain", n=5)
+	bestStarredPairs = rosters.top(size=2, starredOnly=True, minGames=10)
+	fullRosters = rosters.top(by="roster", minGames=5)
+	rosters.comboStats(("Mario", "Luigi"))
+'''
+
+import heapq
+from array import array
+from itertools import combinations
+
+import RioColumns
+import RioRatings
+import RioStatLib
+
+
+BY_OPTIONS = ["combo", "captain", "roster"]
+
+# captain id of a team without a Captain flagged character
+NO_CAPTAIN = -1
+
+
+def bitsOf(bitset: int):
+    # returns the list of set bit positions of an int, lowest first
+    bits = []
+    while bitset:
+        lowest = bitset & -bitset
+        bits.append(lowest.bit_length() - 1)
+        bitset ^= lowest
+    return bits
+
+
+class RosterStats:
+    # one record per team per game
+    def __init__(self):
+        self.characters = RioColumns.Codebook()
+        self.rosters = []  # bitset of every character on the team
+        self.starred = []  # bitset of the team's starred characters
+        self.captains = array("h")  # captain id, NO_CAPTAIN when no character is flagged Captain
+        self.outcomes = array("f")
+        self.players = []
+        self.games = []  # gameID of every pair of records, records 2 * x and 2 * x + 1 are game x
+        self.gameIDs = set()
+
+    def __len__(self):
+        return len(self.rosters)
+
+    def characterId(self, charID: str):
+        # returns the id of a character or -1 if it never appeared
+        return self.characters.lookup(charID)
+
+    def bitset(self, charIDs):
+        # returns the bitset of some characters, None if one of them never appeared
+        bitset = 0
+        for charID in charIDs:
+            characterId = self.characterId(charID)
+            if characterId == -1:
+                return None
+            bitset |= 1 << characterId
+        return bitset
+
+    def names(self, bitset: int):
+        # returns the CharIDs of a bitset as a tuple
+        return tuple(self.characters.values[bit] for bit in bitsOf(bitset))
+
+    def addGame(self, statObj):
+        # adds both teams of a game. returns False if the game was already added
+        gameID, _, _, _, awayOutcome = RioRatings.gameResult(statObj.statJson)
+        if gameID in self.gameIDs:
+            return False
+        self.gameIDs.add(gameID)
+        self.games.append(gameID)
+        # team 0 is the home team in the versions with flipped teams
+        awayTeam = 1 if statObj.version() in RioStatLib.VERSION_LIST_HOME_AWAY_FLIPPED else 0
+        charStats = statObj.characterGameStats()
+        for teamNum in range(0, 2):
+            roster = starred = 0
+            captain = None
+            for rosterNum in range(0, 9):
+                character = charStats[statObj.getTeamString(teamNum, rosterNum)]
+                bit = 1 << self.characters.code(character["CharID"])
+                roster |= bit
+                if character["Superstar"] == 1:
+                    starred |= bit
+                if character["Captain"] == 1:
+                    captain = self.characters.code(character["CharID"])
+            self.rosters.append(roster)
+            self.starred.append(starred)
+            self.captains.append(NO_CAPTAIN if captain is None else captain)
+            self.outcomes.append(awayOutcome if teamNum == awayTeam else 1.0 - awayOutcome)
+            self.players.append(statObj.player(teamNum))
+        return True
+
+    def merge(self, other):
+        # adds the records of the games of another RosterStats not added here yet
+        remap = self.characters.remap(other.characters)
+        skipGameIDs = set(self.gameIDs)
+        for x in range(len(other)):
+            if other.games[x // 2] in skipGameIDs:
+                continue
+            if x % 2 == 0:
+                self.games.append(other.games[x // 2])
+            self.rosters.append(sum(1 << remap[bit] for bit in bitsOf(other.rosters[x])))
+            self.starred.append(sum(1 << remap[bit] for bit in bitsOf(other.starred[x])))
+            captain = other.captains[x]
+            self.captains.append(NO_CAPTAIN if captain == NO_CAPTAIN else remap[captain])
+            self.outcomes.append(other.outcomes[x])
+            self.players.append(other.players[x])
+        self.gameIDs |= other.gameIDs
+        return self
+
+    def counts(self, by: str = "combo", size: int = 2, starredOnly: bool = False, player: str = None):
+        # returns a dict of key -> [team games, wins]
+        # by: "combo" keys are bitsets of size characters on the same roster (starred characters only with
+        #     starredOnly), "captain" keys are captain ids, "roster" keys are full roster bitsets
+        # player: optional, only count that player's teams
+        if by not in BY_OPTIONS:
+            raise Exception(f'Invalid by arg {by}. Function accepts {BY_OPTIONS}')
+        counts = {}
+        bitsets = self.starred if starredOnly else self.rosters
+        for x, outcome in enumerate(self.outcomes):
+            if player is not None and self.players[x] != player:
+                continue
+            if by == "captain":
+                # teams without a captain are left out of captain stats
+                keys = [] if self.captains[x] == NO_CAPTAIN else [self.captains[x]]
+            elif by == "roster":
+                keys = [self.rosters[x]]
+            elif size == 1:
+                keys = [1 << bit for bit in bitsOf(bitsets[x])]
+            else:
+                keys = [sum(1 << bit for bit in combo) for combo in combinations(bitsOf(bitsets[x]), size)]
+            for key in keys:
+                entry = counts.get(key)
+                if entry is None:
+                    counts[key] = [1, outcome]
+                else:
+                    entry[0] += 1
+                    entry[1] += outcome
+        return counts
+
+    def __label(self, by: str, key: int):
+        if by == "captain":
+            return self.characters.values[key]
+        return self.names(key)
+
+    def top(self, by: str = "combo", size: int = 2, n: int = 10, minGames: int = 1, starredOnly: bool = False,
+            player: str = None, lowest: bool = False):
+        # returns a list of (CharIDs or captain, team games, win rate), best win rate first
+        # lowest: optional, return the worst win rates instead
+        entries = [(wins / games, games, key) for key, (games, wins) in
+                   self.counts(by, size, starredOnly, player).items() if games >= minGames]
+        pick = heapq.nsmallest if lowest else heapq.nlargest
+        return [(self.__label(by, key), games, winRate) for winRate, games, key in pick(n, entries)]
+
+    def comboStats(self, charIDs, starredOnly: bool = False):
+        # returns a dict of 'Games', 'Wins', 'Win Rate' of the teams having every character of charIDs
+        # starredOnly: optional, every character of charIDs must be starred
+        bitset = self.bitset(charIDs)
+        games = wins = 0
+        if bitset is not None:
+            bitsets = self.starred if starredOnly else self.rosters
+            for roster, outcome in zip(bitsets, self.outcomes):
+                if roster & bitset == bitset:
+                    games += 1
+                    wins += outcome
+        return {"Games": games, "Wins": wins, "Win Rate": wins / games if games else None}
@@ -0,0 +1,445 @@
+'''
+Shares many parsed Rio stat files with a pool of worker processes without pickling them
+
+Passing StatObjs or statJson dicts to a multiprocessing pool pickles every game to every
+worker. Two shared stores avoid that, both either a multiprocessing.shared_memory block or an
+mmap-backed file that workers attach to by name:
+- SharedColumnStore: the typed arrays of a RioColumns.ColumnSet (EventColumns, ContactColumns,
+  RunnerColumns, ...) laid out back to back. Workers get every column as a read-only memoryview
+  of the block, so per event fields are read with no copy and no json decoding at all.
+- SharedGameStore: the stat json of every game, for work that needs a full StatObj. A worker
+  decodes only the games it is given, straight from the block, into a read-only SharedStatObj
+  (dicts are read-only mappings and lists are tuples). Decoding still costs as much as reading
+  the file, the saving is that nothing is pickled through the pool.
+
+Game store layout:
+- 4 bytes magic b"RIOG"
+- uint32 number of games
+- uint64 offset table with (number of games + 1) entries. game i is bytes offsets[i] -> offsets[i+1]
+- stat json bytes of every game back to back
+
+Column store layout:
+- 4 bytes magic b"RIOC"
+- uint64 length of the json metadata: ColumnSet type, gameIDs, codebook values and
+  (name, typecode, offset, length) of every column
+- the json metadata, then every column's array bytes, each starting on an 8 byte boundary
+
+How to use:
+- ex:
+	import RioSharedGames
+
+	def homeTeamOPS(statObj):
+		return statObj.ops(1)
+
+	if __name__ == "__main__":
+		store = RioSharedGames.SharedGameStore.fromPaths(listOfStatFilePaths)
+		try:
+			results = RioSharedGames.mapGames(homeTeamOPS, store, processes=4)
+		finally:
+			store.close()
+			store.unlink()
+
+- columns, where function(events, rows) gets a read-only EventColumns and a range of its records:
+	def starPitches(events, rows):
+		starPitch = events.column("Star Pitch")
+		return sum(starPitch[x] for x in rows)
+
+	events = RioColumns.EventColumns()
+	for statObj in myStatObjs:
+		events.addGame(statObj)
+	store = RioSharedGames.SharedColumnStore.fromColumnSet(events)
+	try:
+		total = sum(RioSharedGames.mapColumns(starPitches, store, processes=4))
+	finally:
+		store.close()
+		store.unlink()
+
+- or write the buffer to disk once and let any process mmap it:
+	RioSharedGames.writeStoreFile("games.riog", listOfStatFilePaths)
+	store = RioSharedGames.SharedGameStore.openFile("games.riog")
+'''
+
+import json
+import mmap
+import os
+import struct
+from functools import partial
+from multiprocessing import Pool, shared_memory
+from types import MappingProxyType
+
+import RioColumns
+import RioStatLib
+import RioUtil
+
+
+MAGIC = b"RIOG"
+HEADER_FMT = "<4sI"
+OFFSET_FMT = "<Q"
+HEADER_SIZE = struct.calcsize(HEADER_FMT)
+OFFSET_SIZE = struct.calcsize(OFFSET_FMT)
+
+COLUMN_MAGIC = b"RIOC"
+COLUMN_HEADER_FMT = "<4sQ"
+COLUMN_HEADER_SIZE = struct.calcsize(COLUMN_HEADER_FMT)
+COLUMN_ALIGNMENT = 8
+
+
+def freezeJson(value):
+    # returns a read-only copy of decoded json: dicts become read-only mappings and lists tuples
+    if isinstance(value, dict):
+        return MappingProxyType({key: freezeJson(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freezeJson(item) for item in value)
+    return value
+
+
+def decodeGame(gameBytes):
+    # decodes the stat json of a game from a bytes-like object, without copying it to bytes first
+    # orjson reads the buffer directly, json needs it as a str
+    if RioStatLib.jsonParser == "json" and not isinstance(gameBytes, (bytes, bytearray)):
+        gameBytes = str(gameBytes, "utf-8")
+    return RioStatLib.loadStatJson(gameBytes)
+
+
+class SharedStatObj(RioStatLib.StatObj):
+    # StatObj whose statJson is decoded from a SharedGameStore
+    # statJson is frozen by freezeJson, so the view cannot modify the shared game
+    def __init__(self, gameBytes):
+        super().__init__(freezeJson(decodeGame(gameBytes)))
+
+
+def packGames(gameBytesList: list, buffer=None):
+    # writes games into the store layout
+    # returns the size in bytes needed if no buffer is given
+    count = len(gameBytesList)
+    dataStart = HEADER_SIZE + OFFSET_SIZE * (count + 1)
+    offsets = [dataStart]
+    for gameBytes in gameBytesList:
+        offsets.append(offsets[-1] + len(gameBytes))
+    if buffer is None:
+        return offsets[-1]
+
+    struct.pack_into(HEADER_FMT, buffer, 0, MAGIC, count)
+    struct.pack_into(f"<{count + 1}Q", buffer, HEADER_SIZE, *offsets)
+    for x, gameBytes in enumerate(gameBytesList):
+        buffer[offsets[x]:offsets[x + 1]] = gameBytes
+    return offsets[-1]
+
+
+def readGameBytes(paths: list):
+    # reads stat files as raw bytes without decoding them
+    gameBytesList = []
+    for path in paths:
+        with open(path, "rb") as statFile:
+            gameBytesList.append(statFile.read())
+    return gameBytesList
+
+
+def encodeGames(statJsons: list):
+    # encodes statJson dicts as compact json bytes
+    return [json.dumps(statJson, separators=(",", ":")).encode("utf-8") for statJson in statJsons]
+
+
+class SharedGameStore:
+    # read access to games packed into a shared memory block or mmap-backed file
+    # use fromPaths/fromStatJsons to create a new shared memory store,
+    # attach to open one created by another process and openFile for files from writeStoreFile
+    def __init__(self, buffer, handle: tuple, sharedMemory=None, mappedFile=None):
+        self.__buffer = memoryview(buffer)
+        self.__handle = handle
+        self.__sharedMemory = sharedMemory
+        self.__mappedFile = mappedFile
+        self.closed = False
+
+        magic, self.__count = struct.unpack_from(HEADER_FMT, self.__buffer, 0)
+        if magic != MAGIC:
+            raise Exception(f'Invalid shared game store {handle[1]}. Buffer does not start with {MAGIC}')
+        self.__offsets = struct.unpack_from(f"<{self.__count + 1}Q", self.__buffer, HEADER_SIZE)
+
+    @classmethod
+    def fromGameBytes(cls, gameBytesList: list):
+        # creates a new shared memory store. the creating process is responsible for unlink()
+        size = packGames(gameBytesList)
+        sharedMemory = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        packGames(gameBytesList, sharedMemory.buf)
+        return cls(sharedMemory.buf, ("shm", sharedMemory.name), sharedMemory=sharedMemory)
+
+    @classmethod
+    def fromPaths(cls, paths: list):
+        # creates a new shared memory store from stat file paths
+        # files are copied in as raw bytes, they are only decoded when a game is viewed
+        return cls.fromGameBytes(readGameBytes(paths))
+
+    @classmethod
+    def fromStatJsons(cls, statJsons: list):
+        # creates a new shared memory store from already loaded statJson dicts
+        return cls.fromGameBytes(encodeGames(statJsons))
+
+    @classmethod
+    def openFile(cls, path: str):
+        # opens a store file written by writeStoreFile as a read-only mmap
+        with open(path, "rb") as storeFile:
+            mappedFile = mmap.mmap(storeFile.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(mappedFile, ("file", os.path.abspath(path)), mappedFile=mappedFile)
+
+    @classmethod
+    def attach(cls, handle: tuple):
+        # attaches to a store from its handle() without copying it
+        kind, location = handle
+        if kind == "file":
+            return cls.openFile(location)
+        if kind != "shm":
+            raise Exception(f'Invalid shared game store handle {handle}')
+
+        # pool workers share the resource tracker of the process that created the block,
+        # so attaching here does not make the block outlive or die with the worker
+        sharedMemory = shared_memory.SharedMemory(name=location)
+        return cls(sharedMemory.buf, handle, sharedMemory=sharedMemory)
+
+    def handle(self):
+        # returns a small picklable tuple other processes can pass to attach()
+        return self.__handle
+
+    def __len__(self):
+        return self.__count
+
+    def __gameView(self, index: int):
+        # returns a memoryview of the stat json bytes of a game, the caller releases it
+        self.__errorCheck_index(index)
+        if self.closed:
+            raise Exception(f'Shared game store {self.__handle[1]} is closed')
+        return self.__buffer[self.__offsets[index]:self.__offsets[index + 1]]
+
+    def gameBytes(self, index: int):
+        # returns a copy of the stat json bytes of a game
+        with self.__gameView(index) as view:
+            return bytes(view)
+
+    def statJson(self, index: int):
+        # returns the decoded, read-only statJson of a game, decoded straight from the buffer
+        with self.__gameView(index) as view:
+            return freezeJson(decodeGame(view))
+
+    def statObj(self, index: int):
+        # returns a read-only SharedStatObj of a game
+        with self.__gameView(index) as view:
+            return SharedStatObj(view)
+
+    def close(self):
+        # releases this process' view of the buffer. the store can not be read afterwards
+        # safe to call more than once
+        if self.closed:
+            return
+        self.closed = True
+        self.__buffer.release()
+        if self.__sharedMemory is not None:
+            self.__sharedMemory.close()
+        if self.__mappedFile is not None:
+            self.__mappedFile.close()
+
+    def unlink(self):
+        # frees a shared memory store. only the creating process should call this
+        if self.__sharedMemory is not None:
+            self.__sharedMemory.unlink()
+
+    def __errorCheck_index(self, index: int):
+        if index < 0 or index >= self.__count:
+            raise Exception(f'Invalid game index {index}. Store holds {self.__count} games')
+
+
+def writeStoreFile(path: str, paths: list = None, statJsons: list = None):
+    # writes a store file from stat file paths or statJson dicts that SharedGameStore.openFile can mmap
+    gameBytesList = readGameBytes(paths or []) + encodeGames(statJsons or [])
+    buffer = bytearray(packGames(gameBytesList))
+    packGames(gameBytesList, buffer)
+    with open(path, "wb") as storeFile:
+        storeFile.write(buffer)
+    return path
+
+
+# the store each pool worker attached to in _initWorker
+_workerStore = None
+
+
+def _initWorker(handle: tuple):
+    global _workerStore
+    _workerStore = SharedGameStore.attach(handle)
+
+
+def _runOnGame(function, index: int):
+    return function(_workerStore.statObj(index))
+
+
+def mapGames(function, store: SharedGameStore, processes: int = None, indices: list = None, chunksize: int = None):
+    # calls function(statObj) for every game in the store across a pool of worker processes
+    # function must be picklable (defined at module level). returns results in index order
+    # indices: optional, defaults to every game in the store
+    if indices is None:
+        indices = range(len(store))
+    indices = list(indices)
+    if chunksize is None:
+        chunksize = RioUtil.poolChunksize(len(indices), processes)
+
+    with Pool(processes, initializer=_initWorker, initargs=(store.handle(),)) as pool:
+        return pool.map(partial(_runOnGame, function), indices, chunksize=chunksize)
+
+
+def packColumns(columnSet, buffer=None):
+    # writes the columns of a ColumnSet into the column store layout
+    # returns the size in bytes needed if no buffer is given
+    columns = []
+    offset = 0
+    for name, typecode in columnSet.SCHEMA:
+        column = columnSet.columns[name]
+        columns.append([name, typecode, offset, len(column)])
+        offset += len(column) * column.itemsize
+        offset += -offset % COLUMN_ALIGNMENT
+    metadata = json.dumps({"Type": type(columnSet).__name__, "Game IDs": list(columnSet.gameIDs),
+                           "Codebooks": {name: codebook.values for name, codebook in columnSet.codebooks.items()},
+                           "Columns": columns}, separators=(",", ":")).encode("utf-8")
+    dataStart = COLUMN_HEADER_SIZE + len(metadata)
+    dataStart += -dataStart % COLUMN_ALIGNMENT
+    if buffer is None:
+        return dataStart + offset
+
+    struct.pack_into(COLUMN_HEADER_FMT, buffer, 0, COLUMN_MAGIC, len(metadata))
+    buffer[COLUMN_HEADER_SIZE:COLUMN_HEADER_SIZE + len(metadata)] = metadata
+    for name, _, columnOffset, length in columns:
+        column = columnSet.columns[name]
+        start = dataStart + columnOffset
+        buffer[start:start + length * column.itemsize] = column.tobytes()
+    return dataStart + offset
+
+
+class SharedColumnStore:
+    # read access to the columns of a ColumnSet packed into a shared memory block or mmap-backed file
+    # use fromColumnSet to create a new shared memory store, attach to open one created by another
+    # process and openFile for files from writeColumnFile
+    def __init__(self, buffer, handle: tuple, sharedMemory=None, mappedFile=None):
+        self.__buffer = memoryview(buffer)
+        self.__handle = handle
+        self.__sharedMemory = sharedMemory
+        self.__mappedFile = mappedFile
+        self.__views = []
+        self.closed = False
+
+        magic, metadataSize = struct.unpack_from(COLUMN_HEADER_FMT, self.__buffer, 0)
+        if magic != COLUMN_MAGIC:
+            raise Exception(f'Invalid shared column store {handle[1]}. Buffer does not start with {COLUMN_MAGIC}')
+        metadata = json.loads(str(self.__buffer[COLUMN_HEADER_SIZE:COLUMN_HEADER_SIZE + metadataSize], "utf-8"))
+        self.__dataStart = COLUMN_HEADER_SIZE + metadataSize
+        self.__dataStart += -self.__dataStart % COLUMN_ALIGNMENT
+        self.__metadata = metadata
+
+        columnSetType = getattr(RioColumns, metadata["Type"], None)
+        if columnSetType is None or not issubclass(columnSetType, RioColumns.ColumnSet):
+            raise Exception(f'Invalid shared column store {handle[1]}. Unknown ColumnSet type {metadata["Type"]}')
+        self.columnSet = self.__readOnlyColumnSet(columnSetType)
+
+    def __readOnlyColumnSet(self, columnSetType):
+        # builds a ColumnSet of the stored type whose columns are read-only views of the buffer
+        columnSet = columnSetType.__new__(columnSetType)
+        columnSet.columns = {}
+        for name, typecode, offset, length in self.__metadata["Columns"]:
+            start = self.__dataStart + offset
+            itemsize = struct.calcsize(typecode)
+            view = self.__buffer[start:start + length * itemsize].toreadonly().cast(typecode)
+            self.__views.append(view)
+            columnSet.columns[name] = view
+        columnSet.codebooks = {name: RioColumns.Codebook(values)
+                               for name, values in self.__metadata["Codebooks"].items()}
+        columnSet.gameIDs = self.__metadata["Game IDs"]
+        return columnSet
+
+    @classmethod
+    def fromColumnSet(cls, columnSet):
+        # creates a new shared memory store. the creating process is responsible for unlink()
+        size = packColumns(columnSet)
+        sharedMemory = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        packColumns(columnSet, sharedMemory.buf)
+        return cls(sharedMemory.buf, ("shm", sharedMemory.name), sharedMemory=sharedMemory)
+
+    @classmethod
+    def openFile(cls, path: str):
+        # opens a store file written by writeColumnFile as a read-only mmap
+        with open(path, "rb") as storeFile:
+            mappedFile = mmap.mmap(storeFile.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(mappedFile, ("file", os.path.abspath(path)), mappedFile=mappedFile)
+
+    @classmethod
+    def attach(cls, handle: tuple):
+        # attaches to a store from its handle() without copying it
+        kind, location = handle
+        if kind == "file":
+            return cls.openFile(location)
+        if kind != "shm":
+            raise Exception(f'Invalid shared column store handle {handle}')
+        sharedMemory = shared_memory.SharedMemory(name=location)
+        return cls(sharedMemory.buf, handle, sharedMemory=sharedMemory)
+
+    def handle(self):
+        # returns a small picklable tuple other processes can pass to attach()
+        return self.__handle
+
+    def __len__(self):
+        return len(self.columnSet)
+
+    def close(self):
+        # releases every column view and this process' view of the buffer. the columnSet can not be
+        # read afterwards. slices taken from a column must be released first. safe to call more than once
+        if self.closed:
+            return
+        self.closed = True
+        for view in self.__views:
+            view.release()
+        self.__views = []
+        self.__buffer.release()
+        if self.__sharedMemory is not None:
+            self.__sharedMemory.close()
+        if self.__mappedFile is not None:
+            self.__mappedFile.close()
+
+    def unlink(self):
+        # frees a shared memory store. only the creating process should call this
+        if self.__sharedMemory is not None:
+            self.__sharedMemory.unlink()
+
+
+def writeColumnFile(path: str, columnSet):
+    # writes a column store file of a ColumnSet that SharedColumnStore.openFile can mmap
+    buffer = bytearray(packColumns(columnSet))
+    packColumns(columnSet, buffer)
+    with open(path, "wb") as storeFile:
+        storeFile.write(buffer)
+    return path
+
+
+# the column store each pool worker attached to in _initColumnWorker
+_workerColumns = None
+
+
+def _initColumnWorker(handle: tuple):
+    global _workerColumns
+    _workerColumns = SharedColumnStore.attach(handle)
+
+
+def _runOnRows(function, rows: tuple):
+    return function(_workerColumns.columnSet, range(*rows))
+
+
+def mapColumns(function, store: SharedColumnStore, processes: int = None, shardCount: int = None):
+    # calls function(columnSet, rows) across a pool of worker processes, where columnSet is the
+    # store's read-only ColumnSet and rows a range of record positions. every record is in one range
+    # and a game's records are never split. function must be picklable (defined at module level)
+    # returns the results in record order
+    # shardCount: optional, defaults to 4 ranges per process
+    if processes is None:
+        processes = os.cpu_count() or 1
+    games = store.columnSet.columns["Game"]
+    gameCount = len(store.columnSet.gameIDs)
+    shardCount = max(1, min(shardCount or processes * 4, gameCount))
+    bounds = [store.columnSet.gameRows(gameCount * x // shardCount).start for x in range(shardCount)] + [len(games)]
+    ranges = [(bounds[x], bounds[x + 1]) for x in range(shardCount) if bounds[x] < bounds[x + 1]]
+
+    with Pool(processes, initializer=_initColumnWorker, initargs=(store.handle(),)) as pool:
+        return pool.map(partial(_runOnRows, function), ranges)
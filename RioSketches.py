@@ -0,0 +1,323 @@
+'''
+Streaming quantile sketches for corpus wide percentiles
+
+Percentile ranks like "Pitch Speed 92nd percentile" used to need every value of every game in
+one list. A QuantileSketch instead counts values in logarithmic buckets (DDSketch style): every
+quantile it returns is within relativeAccuracy (1% by default) of the true value, memory is a
+few hundred buckets however many values are added, and two sketches merge by adding their
+bucket counts, so workers can sketch shards of a corpus and the results merge exactly.
+
+CorpusSketches keeps a sketch per field over all games and per character:
+- "Pitch Speed": every pitch, per pitcher
+- "Contact Quality", "Ball Max Height": every ball with contact, per batter
+- "OPS": per character game with at least one at bat, per character
+- "ERA": per character game with at least one out pitched, per character
+
+How to use:
+- ex:
+	import RioSketches
+	sketches = RioSketches.buildSketches(listOfStatFilePaths, processes=8)
+	sketches.percentile("Pitch Speed", 190)                 # percent of pitches at or below 190
+	sketches.quantile("Contact Quality", 0.5)               # median contact quality
+	sketches.quantile("Pitch Speed", 0.9, character="Bowser")
+	sketches.save("sketches.json")
+'''
+
+import json
+import math
+import os
+from multiprocessing import Pool
+
+import RioLeaderboard
+import RioStatLib
+
+
+class QuantileSketch:
+    # mergeable quantile sketch with relative accuracy guarantees
+    # relativeAccuracy: quantiles are within this fraction of the true value
+    # maxBuckets: optional cap per sign, the lowest buckets are collapsed together past it
+    def __init__(self, relativeAccuracy: float = 0.01, maxBuckets: int = 2048):
+        if not 0 < relativeAccuracy < 1:
+            raise Exception(f'Invalid relativeAccuracy {relativeAccuracy}. Must be between 0 and 1')
+        self.relativeAccuracy = relativeAccuracy
+        self.maxBuckets = maxBuckets
+        self.gamma = (1 + relativeAccuracy) / (1 - relativeAccuracy)
+        self.logGamma = math.log(self.gamma)
+        # smallest magnitude given its own bucket, smaller values count as zero
+        self.minValue = 1e-9
+        self.positive = {}
+        self.negative = {}
+        self.zeros = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def __key(self, value: float):
+        return math.ceil(math.log(value) / self.logGamma)
+
+    def __bucketValue(self, key: int):
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+    def add(self, value: float, count: int = 1):
+        # adds a value count times
+        if abs(value) <= self.minValue:
+            self.zeros += count
+        else:
+            store = self.positive if value > 0 else self.negative
+            key = self.__key(abs(value))
+            store[key] = store.get(key, 0) + count
+            if len(store) > self.maxBuckets:
+                self.__collapse(store)
+        self.count += count
+        self.total += value * count
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        return self
+
+    def __collapse(self, store: dict):
+        # folds the lowest magnitude buckets into one so the store has maxBuckets buckets
+        keys = sorted(store)
+        lowest = keys[len(keys) - self.maxBuckets]
+        for key in keys[:len(keys) - self.maxBuckets]:
+            store[lowest] += store.pop(key)
+
+    def merge(self, other):
+        # adds the counts of another sketch with the same relativeAccuracy
+        if other.relativeAccuracy != self.relativeAccuracy:
+            raise Exception(f'Can not merge sketches with relativeAccuracy {self.relativeAccuracy} '
+                            f'and {other.relativeAccuracy}')
+        for store, otherStore in [(self.positive, other.positive), (self.negative, other.negative)]:
+            for key, count in otherStore.items():
+                store[key] = store.get(key, 0) + count
+            if len(store) > self.maxBuckets:
+                self.__collapse(store)
+        self.zeros += other.zeros
+        self.count += other.count
+        self.total += other.total
+        for value in [other.min, other.max]:
+            if value is not None:
+                self.min = value if self.min is None else min(self.min, value)
+                self.max = value if self.max is None else max(self.max, value)
+        return self
+
+    def __position(self, value: float):
+        # returns the sort position of the bucket a value falls in
+        if abs(value) <= self.minValue:
+            return (0, 0)
+        if value > 0:
+            return (1, self.__key(value))
+        return (-1, -self.__key(-value))
+
+    def __buckets(self):
+        # yields (position, value, count) of every bucket, smallest value first
+        for key in sorted(self.negative, reverse=True):
+            yield (-1, -key), -self.__bucketValue(key), self.negative[key]
+        if self.zeros:
+            yield (0, 0), 0.0, self.zeros
+        for key in sorted(self.positive):
+            yield (1, key), self.__bucketValue(key), self.positive[key]
+
+    def quantile(self, q: float):
+        # returns the value at quantile q (0 -> 1). returns None if the sketch is empty
+        if not 0 <= q <= 1:
+            raise Exception(f'Invalid quantile {q}. Must be between 0 and 1')
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = 0
+        for _, value, count in self.__buckets():
+            seen += count
+            if seen > rank:
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def rank(self, value: float):
+        # returns the fraction of values at or below value (0 -> 1). returns None if the sketch is empty
+        # values sharing value's bucket count as below it
+        if self.count == 0:
+            return None
+        if value < self.min:
+            return 0.0
+        if value >= self.max:
+            return 1.0
+        position = self.__position(value)
+        atOrBelow = 0
+        for bucketPosition, _, count in self.__buckets():
+            if bucketPosition > position:
+                break
+            atOrBelow += count
+        return float(atOrBelow) / self.count
+
+    def mean(self):
+        # returns the exact mean of the values added. returns None if the sketch is empty
+        return self.total / self.count if self.count else None
+
+    def toDict(self):
+        # returns the sketch as json-serializable values
+        return {
+            "relativeAccuracy": self.relativeAccuracy,
+            "maxBuckets": self.maxBuckets,
+            "positive": [[key, count] for key, count in self.positive.items()],
+            "negative": [[key, count] for key, count in self.negative.items()],
+            "zeros": self.zeros,
+            "count": self.count,
+            "total": self.total,
+            "min": self.min,
+            "max": self.max,
+        }
+
+    @classmethod
+    def fromDict(cls, state: dict):
+        # rebuilds a sketch from toDict()
+        sketch = cls(state["relativeAccuracy"], state["maxBuckets"])
+        sketch.positive = {key: count for key, count in state["positive"]}
+        sketch.negative = {key: count for key, count in state["negative"]}
+        for name in ["zeros", "count", "total", "min", "max"]:
+            setattr(sketch, name, state[name])
+        return sketch
+
+
+FIELDS = ["Pitch Speed", "Contact Quality", "Ball Max Height", "OPS", "ERA"]
+
+
+class CorpusSketches:
+    # a QuantileSketch per field of FIELDS, over all games and per character
+    def __init__(self, relativeAccuracy: float = 0.01):
+        self.relativeAccuracy = relativeAccuracy
+        self.sketches = {field: QuantileSketch(relativeAccuracy) for field in FIELDS}
+        self.characterSketches = {}
+        self.games = 0
+
+    def __add(self, field: str, character: str, value: float):
+        self.sketches[field].add(value)
+        key = (field, character)
+        sketch = self.characterSketches.get(key)
+        if sketch is None:
+            sketch = self.characterSketches[key] = QuantileSketch(self.relativeAccuracy)
+        sketch.add(value)
+
+    def addGame(self, statObj):
+        # adds the pitches, contacts and character games of a game
+        self.games += 1
+        rosters = [statObj.characterName(0), statObj.characterName(1)]
+        for event in statObj.events():
+            pitch = event.get("Pitch")
+            if pitch is None:
+                continue
+            battingTeam = event["Half Inning"]
+            self.__add("Pitch Speed", pitch["Pitcher Char Id"], pitch["Pitch Speed"])
+            contact = pitch.get("Contact")
+            if contact is None:
+                continue
+            batter = rosters[battingTeam][event["Batter Roster Loc"]]
+            self.__add("Contact Quality", batter, contact["Contact Quality"])
+            self.__add("Ball Max Height", batter, contact["Ball Max Height"])
+
+        # one OPS/ERA value per character per game, a character on both teams counts as one line
+        for character, line in RioLeaderboard.gameLines(statObj, "character").items():
+            if line.offense["atBats"] > line.walks():
+                self.__add("OPS", character, line.ops())
+            if line.defense["outsPitched"] > 0:
+                self.__add("ERA", character, line.era())
+        return self
+
+    def merge(self, other):
+        # adds the sketches of another CorpusSketches
+        self.games += other.games
+        for field, sketch in other.sketches.items():
+            self.sketches[field].merge(sketch)
+        for key, sketch in other.characterSketches.items():
+            if key in self.characterSketches:
+                self.characterSketches[key].merge(sketch)
+            else:
+                self.characterSketches[key] = QuantileSketch.fromDict(sketch.toDict())
+        return self
+
+    def sketch(self, field: str, character: str = None):
+        # returns the QuantileSketch of a field, over all characters or one character
+        if field not in FIELDS:
+            raise Exception(f'Invalid sketch field {field}. Function accepts {FIELDS}')
+        if character is None:
+            return self.sketches[field]
+        return self.characterSketches.get((field, character), QuantileSketch(self.relativeAccuracy))
+
+    def quantile(self, field: str, q: float, character: str = None):
+        # returns the value of a field at quantile q (0 -> 1)
+        return self.sketch(field, character).quantile(q)
+
+    def percentile(self, field: str, value: float, character: str = None):
+        # returns the percentile rank (0 -> 100) of a value of a field
+        rank = self.sketch(field, character).rank(value)
+        return None if rank is None else 100 * rank
+
+    def summary(self, field: str, character: str = None):
+        # returns a dict of 'Count', 'Mean', 'Min', 'P10', 'P25', 'Median', 'P75', 'P90', 'P99', 'Max'
+        sketch = self.sketch(field, character)
+        result = {"Count": sketch.count, "Mean": sketch.mean(), "Min": sketch.min}
+        for name, q in [("P10", 0.1), ("P25", 0.25), ("Median", 0.5), ("P75", 0.75), ("P90", 0.9), ("P99", 0.99)]:
+            result[name] = sketch.quantile(q)
+        result["Max"] = sketch.max
+        return result
+
+    def toDict(self):
+        # returns every sketch as json-serializable values
+        return {
+            "relativeAccuracy": self.relativeAccuracy,
+            "games": self.games,
+            "sketches": {field: sketch.toDict() for field, sketch in self.sketches.items()},
+            "characterSketches": [[field, character, sketch.toDict()]
+                                  for (field, character), sketch in self.characterSketches.items()],
+        }
+
+    @classmethod
+    def fromDict(cls, state: dict):
+        # rebuilds CorpusSketches from toDict()
+        sketches = cls(state["relativeAccuracy"])
+        sketches.games = state["games"]
+        sketches.sketches = {field: QuantileSketch.fromDict(sketch) for field, sketch in state["sketches"].items()}
+        sketches.characterSketches = {(field, character): QuantileSketch.fromDict(sketch)
+                                      for field, character, sketch in state["characterSketches"]}
+        return sketches
+
+    def save(self, path: str):
+        # writes the sketches to a json file
+        with open(path, "w") as sketchFile:
+            json.dump(self.toDict(), sketchFile)
+
+    @classmethod
+    def load(cls, path: str):
+        # reads sketches written by save()
+        with open(path, "r") as sketchFile:
+            return cls.fromDict(json.load(sketchFile))
+
+
+def sketchFiles(paths: list, relativeAccuracy: float = 0.01):
+    # builds the CorpusSketches of one shard of stat file paths
+    sketches = CorpusSketches(relativeAccuracy)
+    for path in paths:
+        sketches.addGame(RioStatLib.StatObj.from_path(path))
+    return sketches
+
+
+def _sketchShard(args):
+    return sketchFiles(*args)
+
+
+def buildSketches(paths: list, relativeAccuracy: float = 0.01, processes: int = None, shardCount: int = None):
+    # builds CorpusSketches from stat file paths across a pool of worker processes
+    # processes: optional, defaults to os.cpu_count(). 1 runs in this process
+    # shardCount: optional, defaults to 4 shards per process
+    if processes == 1:
+        return sketchFiles(paths, relativeAccuracy)
+    if processes is None:
+        processes = os.cpu_count() or 1
+    shards = RioLeaderboard.shard(list(paths), shardCount or processes * 4)
+
+    result = CorpusSketches(relativeAccuracy)
+    if not shards:
+        return result
+    with Pool(processes) as pool:
+        for sketches in pool.imap_unordered(_sketchShard, [(s, relativeAccuracy) for s in shards]):
+            result.merge(sketches)
+    return result
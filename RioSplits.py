@@ -0,0 +1,180 @@
+'''
+Situational split engine over many Rio stat files
+
+Splits like "vs left handed pitchers", "with 2 outs", "full count" or "late innings" all
+combine a handful of event fields. SplitEngine packs those fields into one small int per event
+(the situation key) when a game is added. Plate appearance outcomes are then grouped by
+situation key in a single pass, and any split is answered by folding the few hundred distinct
+situation keys into the requested dimensions instead of rescanning events. Results are cached
+per split definition until more games are added.
+
+The situation of a plate appearance is the one on the pitch that ended it, ex: a walk on a
+3-1 count is counted under count (3, 1).
+
+Dimensions:
+- "count": (balls, strikes)      - "balls", "strikes"
+- "outs": 0 -> 2                 - "runners": bitmask of occupied bases, 1 == 1B, 2 == 2B, 4 == 3B
+- "risp": runner on 2B or 3B     - "inning": inning number
+- "late": inning >= lateInning   - "half": 0 == top, 1 == bottom
+- "batterHand", "pitcherHand": "Left" or "Right"
+- "platoon": True when the batter has the platoon advantage, batting from the opposite side the pitcher throws from
+
+How to use:
+- ex:
+	import RioSplits
+	splits = RioSplits.SplitEngine(lateInning=7)
+	for statObj in myStatObjs:
+		splits.addGame(statObj)
+	vsLefties = splits.split("pitcherHand")["Left"]
+	twoOuts = splits.split("outs")[2]
+	fullCount = splits.split("count")[(3, 2)]
+	marioLateAndClose = splits.split("late", "risp", batter="Mario")
+'''
+
+from array import array
+
+import RioChemistry
+import RioColumns
+
+
+# situation key layout: field -> (lowest bit, mask)
+KEY_FIELDS = {
+    "balls": (0, 0b11),
+    "strikes": (2, 0b11),
+    "outs": (4, 0b11),
+    "runners": (6, 0b111),
+    "half": (9, 0b1),
+    "batterLefty": (10, 0b1),
+    "pitcherLefty": (11, 0b1),
+    "inning": (12, 0b11111),
+}
+
+DIMENSIONS = ["count", "balls", "strikes", "outs", "runners", "risp", "inning", "late", "half",
+              "batterHand", "pitcherHand", "platoon"]
+
+
+def packSituation(balls: int, strikes: int, outs: int, runners: int, half: int, batterLefty: int,
+                  pitcherLefty: int, inning: int):
+    # returns the situation key of an event. innings past 31 share the key of inning 31
+    inning = min(inning, KEY_FIELDS["inning"][1])
+    return (balls | strikes << 2 | outs << 4 | runners << 6 | half << 9 | batterLefty << 10
+            | pitcherLefty << 11 | inning << 12)
+
+
+def unpackSituation(key: int):
+    # returns a dict of the fields of a situation key
+    return {name: (key >> shift) & mask for name, (shift, mask) in KEY_FIELDS.items()}
+
+
+class SplitEngine:
+    # situational splits of plate appearance outcomes over any number of games
+    # lateInning: optional, first inning counted as "late"
+    def __init__(self, lateInning: int = 7):
+        self.lateInning = lateInning
+        self.events = RioColumns.EventColumns()
+        self.situations = array("I")
+        self.__cache = {}
+
+    def addGame(self, statObj):
+        # adds the events of a game and computes their situation keys
+        start = len(self.events)
+        self.events.addGame(statObj)
+        self.__addSituations(start)
+        return self
+
+    def merge(self, other):
+        # adds the events of another SplitEngine
+        start = len(self.events)
+        self.events.extend(other.events)
+        self.__addSituations(start)
+        return self
+
+    def __addSituations(self, start: int):
+        col = self.events.columns
+        columns = [col[name][start:] for name in ["Balls", "Strikes", "Outs", "Runners", "Half Inning",
+                                                   "Batter Hand", "Pitcher Hand", "Inning"]]
+        self.situations.extend(packSituation(*fields) for fields in zip(*columns))
+        self.__cache = {}
+
+    def dimensionValue(self, dimension: str, situation: dict):
+        # returns the value of a dimension for an unpacked situation
+        if dimension == "count":
+            return (situation["balls"], situation["strikes"])
+        if dimension in ["balls", "strikes", "outs", "runners", "inning", "half"]:
+            return situation[dimension]
+        if dimension == "risp":
+            return bool(situation["runners"] & 6)
+        if dimension == "late":
+            return situation["inning"] >= self.lateInning
+        if dimension == "batterHand":
+            return "Left" if situation["batterLefty"] else "Right"
+        if dimension == "pitcherHand":
+            return "Left" if situation["pitcherLefty"] else "Right"
+        if dimension == "platoon":
+            return situation["batterLefty"] != situation["pitcherLefty"]
+        raise Exception(f'Invalid split dimension {dimension}. Function accepts {DIMENSIONS}')
+
+    def situationCounts(self, batter: str = None, pitcher: str = None):
+        # returns a dict of situation key -> {result code: [plate appearances, rbi]}
+        # batter/pitcher: optional CharID to only count that character's plate appearances
+        cacheKey = ("situations", batter, pitcher)
+        if cacheKey in self.__cache:
+            return self.__cache[cacheKey]
+
+        batterCode = None if batter is None else self.events.code("Batter", batter)
+        pitcherCode = None if pitcher is None else self.events.code("Pitcher", pitcher)
+        col = self.events.columns
+        counts = {}
+        for situation, endsPA, result, rbi, batterOfEvent, pitcherOfEvent in zip(
+                self.situations, col["Ends PA"], col["Result of AB"], col["RBI"], col["Batter"], col["Pitcher"]):
+            if not endsPA:
+                continue
+            if batter is not None and batterOfEvent != batterCode:
+                continue
+            if pitcher is not None and pitcherOfEvent != pitcherCode:
+                continue
+            results = counts.get(situation)
+            if results is None:
+                results = counts[situation] = {}
+            entry = results.get(result)
+            if entry is None:
+                results[result] = [1, rbi]
+            else:
+                entry[0] += 1
+                entry[1] += rbi
+
+        self.__cache[cacheKey] = counts
+        return counts
+
+    def splitTallies(self, *dimensions, batter: str = None, pitcher: str = None):
+        # returns a dict of split key -> RioChemistry.OutcomeTally
+        # the key is the dimension's value for one dimension, or a tuple of values for several
+        if not dimensions:
+            raise Exception(f'split needs at least one dimension. Function accepts {DIMENSIONS}')
+        for dimension in dimensions:
+            if dimension not in DIMENSIONS:
+                raise Exception(f'Invalid split dimension {dimension}. Function accepts {DIMENSIONS}')
+        cacheKey = (dimensions, batter, pitcher)
+        if cacheKey in self.__cache:
+            return self.__cache[cacheKey]
+
+        resultNames = self.events.codebook("Result of AB").values
+        tallies = {}
+        for situation, results in self.situationCounts(batter, pitcher).items():
+            unpacked = unpackSituation(situation)
+            values = tuple(self.dimensionValue(dimension, unpacked) for dimension in dimensions)
+            key = values[0] if len(values) == 1 else values
+            tally = tallies.get(key)
+            if tally is None:
+                tally = tallies[key] = RioChemistry.OutcomeTally()
+            for result, (count, rbi) in results.items():
+                tally.add(resultNames[result], rbi, count)
+
+        self.__cache[cacheKey] = tallies
+        return tallies
+
+    def split(self, *dimensions, batter: str = None, pitcher: str = None):
+        # returns a dict of split key -> outcome summary (PA, AB, H, HR, BB, K, RBI, AVG, OBP, SLG, OPS, K%)
+        # batter/pitcher: optional CharID to only count that character's plate appearances
+        tallies = self.splitTallies(*dimensions, batter=batter, pitcher=pitcher)
+        return {key: tallies[key].summary() for key in sorted(tallies)}
@@ -0,0 +1,151 @@
+'''
+Star power analytics over many Rio stat files
+
+Every event records each team's star count ('Away Stars', 'Home Stars'), whether a star
+chance was up, whether the pitch was a Star Pitch and whether the batter used a Star swing.
+StarStats reads those from RioColumns.EventColumns and reports
+- star timelines of a game: each team's star count at the start of every event
+- stars earned and spent per player, from the changes in star count between events
+- run value of star swings vs other swings and of star pitches vs other pitches
+- per player star efficiency: runs scored per star swing, runs allowed per star pitch
+
+Team 0 bats in the top half and team 1 in the bottom half, as in the event 'Half Inning'. Players
+and star counts follow StatObj.player(): in VERSION_LIST_HOME_AWAY_FLIPPED versions the 'Home'
+labelled fields belong to team 0.
+
+How to use:
+- ex:
+	import RioStars
+	stars = RioStars.StarStats()
+	for statObj in myStatObjs:
+		stars.addGame(statObj)
+	runValue = stars.runValue()
+	efficiency = stars.playerEfficiency()
+	timeline = stars.starTimeline(myStatObjs[0].gameID())
+'''
+
+from array import array
+
+import RioColumns
+import RioStatLib
+
+
+class StarStats:
+    # star usage over any number of games
+    def __init__(self):
+        self.events = RioColumns.EventColumns()
+        self.players = []  # [team 0 player, team 1 player] per game index
+        self.flipped = array("b")  # per game index, 1 when the game's home/away labels are flipped
+
+    def addGame(self, statObj):
+        # adds the events of a game
+        self.events.addGame(statObj)
+        self.players.append([statObj.player(0), statObj.player(1)])
+        self.flipped.append(statObj.version() in RioStatLib.VERSION_LIST_HOME_AWAY_FLIPPED)
+        return self
+
+    def merge(self, other):
+        # adds the events of another StarStats
+        self.events.extend(other.events)
+        self.players.extend(other.players)
+        self.flipped.extend(other.flipped)
+        return self
+
+    def starTimeline(self, gameID: int):
+        # returns {'Event Num': list, 'Team 0 Stars': list, 'Team 1 Stars': list} of a game
+        # star counts are the counts at the start of each event
+        # team 0 bats in the top half in every version, so flipped games read the 'Home Stars' as team 0
+        if gameID not in self.events.gameIDs:
+            raise Exception(f'Invalid gameID {gameID}. Game was not added')
+        gameIndex = self.events.gameIDs.index(gameID)
+        rows = self.events.gameRows(gameIndex)
+        col = self.events.columns
+        starColumns = [col["Away Stars"], col["Home Stars"]]
+        if self.flipped[gameIndex]:
+            starColumns.reverse()
+        return {"Event Num": col["Event Num"][rows.start:rows.stop].tolist(),
+                "Team 0 Stars": starColumns[0][rows.start:rows.stop].tolist(),
+                "Team 1 Stars": starColumns[1][rows.start:rows.stop].tolist()}
+
+    def starEconomy(self):
+        # returns a dict of player -> dict of
+        # 'Games', 'Stars Earned', 'Stars Spent', 'Star Swings', 'Star Pitches',
+        # 'Runs On Star Swings', 'Runs Allowed On Star Pitches'
+        # stars earned/spent are increases/decreases in the player's star count from one event to the next
+        col = self.events.columns
+        economy = {}
+
+        def line(player):
+            if player not in economy:
+                economy[player] = {"Games": 0, "Stars Earned": 0, "Stars Spent": 0, "Star Swings": 0,
+                                   "Star Pitches": 0, "Runs On Star Swings": 0, "Runs Allowed On Star Pitches": 0}
+            return economy[player]
+
+        starSwing = self.events.code("Type of Swing", "Star")
+        for gameIndex, players in enumerate(self.players):
+            lines = [line(players[0]), line(players[1])]
+            lines[0]["Games"] += 1
+            lines[1]["Games"] += 1
+            rows = self.events.gameRows(gameIndex)
+            starColumns = [col["Away Stars"], col["Home Stars"]]
+            if self.flipped[gameIndex]:
+                starColumns.reverse()
+            for teamNum, starColumn in enumerate(starColumns):
+                counts = starColumn[rows.start:rows.stop]
+                for before, after in zip(counts, counts[1:]):
+                    if after > before:
+                        lines[teamNum]["Stars Earned"] += after - before
+                    elif after < before:
+                        lines[teamNum]["Stars Spent"] += before - after
+
+            for half, swing, starPitch, runs in zip(col["Half Inning"][rows.start:rows.stop],
+                                                    col["Type of Swing"][rows.start:rows.stop],
+                                                    col["Star Pitch"][rows.start:rows.stop],
+                                                    col["Runs"][rows.start:rows.stop]):
+                if swing == starSwing:
+                    lines[half]["Star Swings"] += 1
+                    lines[half]["Runs On Star Swings"] += runs
+                if starPitch:
+                    lines[abs(half - 1)]["Star Pitches"] += 1
+                    lines[abs(half - 1)]["Runs Allowed On Star Pitches"] += runs
+        return economy
+
+    def playerEfficiency(self):
+        # returns a dict of player -> star economy plus
+        # 'Runs Per Star Swing' and 'Runs Allowed Per Star Pitch' (None with no star swings/pitches)
+        result = {}
+        for player, line in self.starEconomy().items():
+            line = dict(line)
+            line["Runs Per Star Swing"] = (float(line["Runs On Star Swings"]) / line["Star Swings"]
+                                           if line["Star Swings"] else None)
+            line["Runs Allowed Per Star Pitch"] = (float(line["Runs Allowed On Star Pitches"]) / line["Star Pitches"]
+                                                   if line["Star Pitches"] else None)
+            result[player] = line
+        return result
+
+    def runValue(self):
+        # returns a dict of 'Star Swing', 'Other Swing', 'Star Pitch', 'Other Pitch' -> dict of
+        # 'Pitches', 'Runs', 'Runs Per Pitch', 'Hits', 'Five Stars'
+        # swings only count pitches the batter swung at
+        col = self.events.columns
+        resultNames = self.events.codebook("Result of AB").values
+        isHit = [result in RioColumns.HIT_BASES for result in resultNames]
+        noSwing = self.events.code("Type of Swing", "None")
+        starSwing = self.events.code("Type of Swing", "Star")
+        totals = {name: [0, 0, 0, 0] for name in ["Star Swing", "Other Swing", "Star Pitch", "Other Pitch"]}
+
+        for swing, starPitch, runs, result, fiveStar in zip(
+                col["Type of Swing"], col["Star Pitch"], col["Runs"], col["Result of AB"], col["Five Star"]):
+            hit = isHit[result]
+            groups = [totals["Star Pitch" if starPitch else "Other Pitch"]]
+            if swing != noSwing:
+                groups.append(totals["Star Swing" if swing == starSwing else "Other Swing"])
+            for entry in groups:
+                entry[0] += 1
+                entry[1] += runs
+                entry[2] += hit
+                entry[3] += fiveStar
+
+        return {name: {"Pitches": pitches, "Runs": runs, "Runs Per Pitch": float(runs) / pitches if pitches else 0.0,
+                       "Hits": hits, "Five Stars": fiveStars}
+                for name, (pitches, runs, hits, fiveStars) in totals.items()}
@@ -19,6 +19,15 @@ How to use:
 		awayTeamSLG = myStats.slg(1)
 		booERA = myStats.era(0, 4) # Boo in this example is the 4th character on the home team
 
+- or let StatObj read the file, with orjson when it is installed (see JSON_PARSERS):
+	myStats = RioStatLib.StatObj.from_path("path/to/RioStatFile.json")
+
+Optional dependencies:
+- orjson (pip install orjson): a faster json decoder. When it is installed it is added to
+  JSON_PARSERS and becomes the default parser. Without it the standard library json module is
+  used and everything works the same, only slower. RioStatLib.setJsonParser("json") picks the
+  standard library parser even when orjson is installed
+
 Team args:
 - arg == 0 means team0 which is the away team (home team for Project Rio pre 1.9.2)
 - arg == 1 means team1 which is the home team (away team for Project Rio 1.9.2 and later)
@@ -35,6 +44,67 @@ Roster args:
 # rosterNum: optional (no arg == all characters on team), 0 -> 8 for each of the 9 roster spots
 '''
 
+import calendar
+import json
+import time
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# versions where "Home Player" is team 0
+VERSION_LIST_HOME_AWAY_FLIPPED = ["Pre 0.1.7", "0.1.7a", "0.1.8", "0.1.9", "1.9.1"]
+# versions where Character Game Stats keys are "Team 0 Roster 0" rather than "Away Roster 0"
+VERSION_LIST_OLD_TEAM_STRUCTURE = ["Pre 0.1.7", "0.1.7a", "0.1.8", "0.1.9", "1.9.1", "1.9.2", "1.9.3", "1.9.4"]
+
+# formats "Date - Start" / "Date - End" have been written in, tried in order
+DATE_FORMATS = ["%a %b %d %H:%M:%S %Y", "%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S", "%m/%d/%Y %H:%M:%S"]
+
+
+def parseDate(date):
+    # converts a stat file date to unix epoch seconds, reading it as UTC
+    # accepts epoch numbers or numeric strings as they are. returns None if the date can not be read
+    if isinstance(date, (int, float)):
+        return float(date)
+    date = str(date).strip()
+    try:
+        return float(date)
+    except ValueError:
+        pass
+    for dateFormat in DATE_FORMATS:
+        try:
+            return float(calendar.timegm(time.strptime(date, dateFormat)))
+        except ValueError:
+            continue
+    return None
+
+
+# parser name -> function decoding stat file bytes or str into a dict
+JSON_PARSERS = {"json": json.loads}
+if orjson is not None:
+    JSON_PARSERS["orjson"] = orjson.loads
+
+# parser used when none is given, the fastest one installed
+jsonParser = "orjson" if orjson is not None else "json"
+
+
+def setJsonParser(name: str):
+    # sets the default parser of loadStatJson, StatObj.from_bytes and StatObj.from_path
+    global jsonParser
+    if name not in JSON_PARSERS:
+        raise Exception(f'Invalid json parser {name}. Installed parsers are {list(JSON_PARSERS)}')
+    jsonParser = name
+
+
+def loadStatJson(data, parser: str = None):
+    # decodes stat file bytes or str into a stat json dict
+    # parser: optional name in JSON_PARSERS, defaults to jsonParser
+    parser = jsonParser if parser is None else parser
+    if parser not in JSON_PARSERS:
+        raise Exception(f'Invalid json parser {parser}. Installed parsers are {list(JSON_PARSERS)}')
+    return JSON_PARSERS[parser](data)
+
 
 # create stat obj
 class StatObj:
@@ -122,11 +192,57 @@ class StatObj:
             for i in range(1, self.statJson['Innings Played']+1):
                 gameEvents['Inning'][i] = set()
 
+            # lists are indexed by event position, scores are the score after the event
+            scoringTimeline = {
+                'Event Num': [],
+                'Away Score': [],
+                'Home Score': [],
+                'Runs': [],
+                'Line Score': {
+                    0: [0] * self.statJson['Innings Played'],
+                    1: [0] * self.statJson['Innings Played']
+                },
+                'Lead Change': set(),
+                'Leverage': set()
+            }
+            # score key of the team batting in each half inning
+            # the Away/Home labels are swapped in VERSION_LIST_HOME_AWAY_FLIPPED versions
+            if self.version() in VERSION_LIST_HOME_AWAY_FLIPPED:
+                battingScoreKeys = ['Home Score', 'Away Score']
+            else:
+                battingScoreKeys = ['Away Score', 'Home Score']
+
+            # the score on an event is the score before the play, so the score after an event
+            # is only known on the next event. each event closes out the one before it
+            # a lead change is a team taking the lead after the other team last held it
+            lastLeader = -1
+            def closeEvent(closedEvent, away, home):
+                nonlocal lastLeader
+                scoringTimeline['Away Score'].append(away)
+                scoringTimeline['Home Score'].append(home)
+                battingScoreKey = battingScoreKeys[closedEvent['Half Inning']]
+                runs = (away if battingScoreKey == 'Away Score' else home) - closedEvent[battingScoreKey]
+                scoringTimeline['Runs'].append(runs)
+                scoringTimeline['Line Score'][closedEvent['Half Inning']][closedEvent['Inning']-1] += runs
+
+                if away == home:
+                    return
+                leader = 0 if away > home else 1
+                if lastLeader != -1 and leader != lastLeader:
+                    scoringTimeline['Lead Change'].add(closedEvent['Event Num'])
+                lastLeader = leader
+
+            previousEvent = None
             for event in self.statJson['Events']:
                 eventNum = event["Event Num"]
                 batting_team = event['Half Inning']
                 fielding_team = abs(event['Half Inning']-1)
 
+                if previousEvent is not None:
+                    closeEvent(previousEvent, event['Away Score'], event['Home Score'])
+                previousEvent = event
+                scoringTimeline['Event Num'].append(eventNum)
+
                 batter = self.characterName(batting_team, event["Batter Roster Loc"])
                 pitcher = self.characterName(fielding_team, event["Pitcher Roster Loc"])
 
@@ -152,6 +268,14 @@ class StatObj:
                                'Runner 3B': 3}
                 
                 no_runners = all(value not in event.keys() for value in runner_keys)
+
+                # tying or go-ahead run is on base or at the plate
+                runners_on = sum(1 for key in runner_keys if key in event.keys())
+                batting_score = event[battingScoreKeys[batting_team]]
+                fielding_score = event[battingScoreKeys[fielding_team]]
+                if 0 <= fielding_score - batting_score <= runners_on + 1:
+                    scoringTimeline['Leverage'].add(eventNum)
+
                 if no_runners:
                     gameEvents['Runner On Base'][0].add(eventNum)
                 else:
@@ -207,9 +331,28 @@ class StatObj:
                 if fielding_data['Fielder Manual Selected'] != 'No Selected Char':
                     gameEvents['Manual Character Selection'].add(eventNum)
 
-            return gameEvents, characterEvents
+            # the final score is the score after the final event
+            if previousEvent is not None:
+                closeEvent(previousEvent, self.statJson['Away Score'], self.statJson['Home Score'])
+
+            return gameEvents, characterEvents, scoringTimeline
         
-        self.gameEventsDict, self.characterEventsDict = eventsFilter()
+        self.gameEventsDict, self.characterEventsDict, self.scoringTimelineDict = eventsFilter()
+
+        # dates parsed once to unix epoch seconds, None if the date can not be read
+        self.startTime = parseDate(self.statJson["Date - Start"])
+        self.endTime = parseDate(self.statJson["Date - End"])
+
+    @classmethod
+    def from_bytes(cls, data, parser: str = None):
+        # returns a StatObj from stat file bytes or str, see loadStatJson
+        return cls(loadStatJson(data, parser))
+
+    @classmethod
+    def from_path(cls, path: str, parser: str = None):
+        # returns a StatObj from a stat file path, see loadStatJson
+        with open(path, "rb") as statFile:
+            return cls(loadStatJson(statFile.read(), parser))
 
     def get_class_methods(self):
         attributes = dir(self.__class__)
@@ -220,13 +363,27 @@ class StatObj:
         # returns it in int form
         return int(self.statJson["GameID"].replace(',', ''), 16)
 
-    # should look to convert to unix or some other standard date fmt
+    # raw date strings, see startTimestamp/endTimestamp for unix epoch seconds
     def startDate(self):
         return self.statJson["Date - Start"]
     
     def endDate(self):
         return self.statJson["Date - End"]
 
+    def startTimestamp(self):
+        # returns the start date as unix epoch seconds (UTC), None if the date can not be read
+        return self.startTime
+
+    def endTimestamp(self):
+        # returns the end date as unix epoch seconds (UTC), None if the date can not be read
+        return self.endTime
+
+    def duration(self):
+        # returns how long the game took in seconds, None if either date can not be read
+        if self.startTime is None or self.endTime is None:
+            return None
+        return self.endTime - self.startTime
+
     def version(self):
         if "Version" in self.statJson.keys():
             return self.statJson["Version"]
@@ -252,8 +409,6 @@ class StatObj:
         # teamNum: 0 == away team, 1 == home team
         # For Project Rio versions 1.9.2 and later
         # teamNum: 0 == away team, 1 == home team
-        VERSION_LIST_HOME_AWAY_FLIPPED = ["Pre 0.1.7", "0.1.7a", "0.1.8", "0.1.9", "1.9.1"]
-
         if self.version() in VERSION_LIST_HOME_AWAY_FLIPPED:
             if teamNum == 0:
                 return self.statJson["Home Player"]
@@ -339,7 +494,6 @@ class StatObj:
         self.__errorCheck_teamNum(teamNum)
         self.__errorCheck_rosterNum(rosterNum)
 
-        VERSION_LIST_OLD_TEAM_STRUCTURE = ["Pre 0.1.7", "0.1.7a", "0.1.8", "0.1.9", "1.9.1", "1.9.2", "1.9.3", "1.9.4"]
         if self.version() in VERSION_LIST_OLD_TEAM_STRUCTURE:
             return f"Team {teamNum} Roster {rosterNum}"
 
@@ -390,8 +544,9 @@ class StatObj:
         # teamNum: 0 == away team, 1 == home team
         self.__errorCheck_teamNum(teamNum)
         captain = ""
-        for character in self.characterGameStats():
-            if character["Captain"] == 1 and int(character["Team"]) == teamNum:
+        for x in range(0, 9):
+            character = self.statJson["Character Game Stats"][self.getTeamString(teamNum, x)]
+            if character["Captain"] == 1:
                 captain = character["CharID"]
         return captain
 
@@ -998,6 +1153,38 @@ class StatObj:
         # rosterNum: optional (no arg == all characters on team), 0 -> 8 for each of the 9 roster spots
         return self.obp(teamNum, rosterNum) + self.slg(teamNum, rosterNum)
 
+    # stat matrix
+
+    def statMatrixColumns(self):
+        # returns the column labels characterStatMatrix builds by default
+        # every numeric stat as ("Offensive Stats" or "Defensive Stats", stat name) in stat file order
+        # every character in a file has the same stat keys, so the first one is enough
+        columns = []
+        character = next(iter(self.characterGameStats().values()))
+        for section in ["Offensive Stats", "Defensive Stats"]:
+            for stat, value in character[section].items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    columns.append((section, stat))
+        return columns
+
+    def characterStatMatrix(self, columns: list = None):
+        # returns (rowLabels, columnLabels, matrix) with every stat of every character in one call
+        # rowLabels: list of (teamNum, rosterNum, CharID), away roster 0 -> 8 then home roster 0 -> 8
+        # columnLabels: list of ("Offensive Stats" or "Defensive Stats", stat name)
+        # matrix: list of rows, matrix[row][col]
+        # columns: optional list of column labels to build. stats missing from this game are 0
+        if columns is None:
+            columns = self.statMatrixColumns()
+        charStats = self.characterGameStats()
+        rowLabels = []
+        matrix = []
+        for teamNum in range(0, 2):
+            for rosterNum in range(0, 9):
+                character = charStats[self.getTeamString(teamNum, rosterNum)]
+                rowLabels.append((teamNum, rosterNum, character["CharID"]))
+                matrix.append([character[section].get(stat, 0) for section, stat in columns])
+        return rowLabels, columns, matrix
+
     # event stats
     # these all probably involve looping through all the events
     def events(self):
@@ -1262,6 +1449,52 @@ class StatObj:
         self.__errorCheck_eventNum(eventNum)
         eventList = self.events()
         return set(eventList[eventNum].keys()).intersection(['Runner 1B', 'Runner 2B', 'Runner 3B'])
+
+    # scoring timeline
+    # built in the same pass as the event sets, lists are indexed by event position
+
+    def scoringTimeline(self):
+        # returns the full scoring timeline dict
+        # 'Event Num': event number at each position
+        # 'Away Score' / 'Home Score': score after each event
+        # 'Runs': runs the batting team scored on each event
+        # 'Line Score': {0: runs per inning batting in the top half, 1: runs per inning batting in the bottom half}
+        # 'Lead Change': set of events where a team took the lead from the other team
+        # 'Leverage': set of events where the tying or go-ahead run was on base or at the plate
+        return self.scoringTimelineDict
+
+    def scoreAfterEvent(self, eventNum: int):
+        # returns (away score, home score) after the specified event
+        self.__errorCheck_eventNum(eventNum)
+        return (self.scoringTimelineDict['Away Score'][eventNum], self.scoringTimelineDict['Home Score'][eventNum])
+
+    def runsOfEvent(self, eventNum: int):
+        # returns how many runs scored on the specified event
+        self.__errorCheck_eventNum(eventNum)
+        return self.scoringTimelineDict['Runs'][eventNum]
+
+    def lineScore(self, halfInningNum: int):
+        # returns a list of runs scored in the specified half of each inning played
+        # halfInningNum: 0 == top half, 1 == bottom half
+        # keyed by half inning rather than teamNum, which means different teams across versions
+        self.__errorCheck_halfInningNum(halfInningNum)
+        return self.scoringTimelineDict['Line Score'][halfInningNum]
+
+    def runsInHalfInning(self, inningNum: int, halfInningNum: int):
+        # returns how many runs scored in the specified half inning
+        # returns 0 if the inning was not played
+        self.__errorCheck_halfInningNum(halfInningNum)
+        if inningNum not in self.gameEventsDict['Inning'].keys():
+            return 0
+        return self.scoringTimelineDict['Line Score'][halfInningNum][inningNum-1]
+
+    def leadChangeEvents(self):
+        # returns a set of events where a team took the lead from the other team
+        return self.scoringTimelineDict['Lead Change']
+
+    def leveragePointEvents(self):
+        # returns a set of events where the tying or go-ahead run was on base or at the plate
+        return self.scoringTimelineDict['Leverage']
     
     # manual exception handling stuff
     def __errorCheck_teamNum(self, teamNum: int):
@@ -1391,3 +1624,27 @@ class StatObj:
       }
     },
     '''
+
+
+def stackStatMatrices(statObjs: list, columns: list = None):
+    # stacks characterStatMatrix of many games into one matrix
+    # returns (rowLabels, columnLabels, matrix) where rowLabels are (gameID, teamNum, rosterNum, CharID)
+    # columns: optional list of column labels. defaults to every column seen in any of the games
+    statObjs = list(statObjs)
+    if columns is None:
+        columns = []
+        seen = set()
+        for statObj in statObjs:
+            for column in statObj.statMatrixColumns():
+                if column not in seen:
+                    seen.add(column)
+                    columns.append(column)
+
+    rowLabels = []
+    matrix = []
+    for statObj in statObjs:
+        gameID = statObj.gameID()
+        gameRows, _, gameMatrix = statObj.characterStatMatrix(columns)
+        rowLabels.extend((gameID,) + row for row in gameRows)
+        matrix.extend(gameMatrix)
+    return rowLabels, columns, matrix
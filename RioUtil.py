@@ -0,0 +1,37 @@
+'''
+Small helpers shared by the Rio analysis modules
+
+RioStatLib stays about reading stat files. Helpers that several analysis modules need but that
+have nothing to do with stat files live here.
+
+How to use:
+- ex:
+	import RioUtil
+	chunksize = RioUtil.poolChunksize(len(paths), processes=8)
+	r = RioUtil.correlation(pings, inputErrors)
+'''
+
+import math
+import os
+
+
+def poolChunksize(itemCount: int, processes: int = None, chunksPerProcess: int = 4):
+    # returns a multiprocessing Pool chunksize giving each process about chunksPerProcess chunks of items
+    # processes: optional, defaults to os.cpu_count()
+    return max(1, itemCount // ((processes or os.cpu_count() or 1) * chunksPerProcess))
+
+
+def correlation(xs: list, ys: list):
+    # returns the pearson correlation of two equal length sequences
+    # returns None with fewer than 2 values or when either sequence is constant
+    n = len(xs)
+    if n < 2:
+        return None
+    meanX = float(sum(xs)) / n
+    meanY = float(sum(ys)) / n
+    covariance = sum((x - meanX) * (y - meanY) for x, y in zip(xs, ys))
+    varianceX = sum((x - meanX) ** 2 for x in xs)
+    varianceY = sum((y - meanY) ** 2 for y in ys)
+    if varianceX == 0 or varianceY == 0:
+        return None
+    return covariance / math.sqrt(varianceX * varianceY)
@@ -0,0 +1,330 @@
+'''
+Validates Rio stat files before they are loaded
+
+Partial uploads and files from unexpected versions can make StatObj raise halfway through a
+batch job, ex: an event whose 'Inning' is larger than 'Innings Played' raises a KeyError in
+eventsFilter. The checks here look at a file against the schema of its version() and report
+every problem found in one pass instead of stopping at the first one.
+
+Issues come in two levels:
+- errors: the file breaks the schema or StatObj can not be built from it
+- warnings: the file can be loaded but something looks off (ex: an event without a 'Pitch')
+
+How to use:
+- ex:
+	import RioValidate
+	reports = RioValidate.validateDirectory("path/to/stat/files", processes=8)
+	for report in reports:
+		if not report.isValid():
+			print(report)
+
+- load a directory and move bad files aside instead of stopping:
+	for statObj in RioValidate.loadValidGames("path/to/stat/files", quarantineDir="path/to/quarantine"):
+		...
+'''
+
+import glob
+import os
+import shutil
+from multiprocessing import Pool
+
+import RioStatLib
+import RioUtil
+
+
+HEADER_KEYS = {
+    "GameID": str,
+    "Date - Start": str,
+    "Date - End": str,
+    "Ranked": int,
+    "StadiumID": str,
+    "Away Player": str,
+    "Home Player": str,
+    "Away Score": int,
+    "Home Score": int,
+    "Innings Selected": int,
+    "Innings Played": int,
+    "Quitter Team": str,
+    "Average Ping": int,
+    "Lag Spikes": int,
+    "Character Game Stats": dict,
+    "Events": list,
+}
+
+CHARACTER_KEYS = {
+    "CharID": str,
+    "Superstar": int,
+    "Captain": int,
+    "Fielding Hand": str,
+    "Batting Hand": str,
+    "Offensive Stats": dict,
+    "Defensive Stats": dict,
+}
+
+OFFENSIVE_STAT_KEYS = ["At Bats", "Hits", "Singles", "Doubles", "Triples", "Homeruns", "Successful Bunts",
+                       "Sac Flys", "Strikeouts", "Walks (4 Balls)", "Walks (Hit)", "RBI", "Bases Stolen",
+                       "Star Hits"]
+
+DEFENSIVE_STAT_KEYS = ["Batters Faced", "Runs Allowed", "Batters Walked", "Batters Hit", "Hits Allowed",
+                       "HRs Allowed", "Pitches Thrown", "Stamina", "Was Pitcher", "Strikeouts",
+                       "Star Pitches Thrown", "Big Plays", "Outs Pitched", "Pitches Per Position",
+                       "Outs Per Position"]
+
+# event key -> (lowest value, highest value). None means no limit
+EVENT_KEYS = {
+    "Event Num": (0, None),
+    "Inning": (1, None),
+    "Half Inning": (0, 1),
+    "Away Score": (0, None),
+    "Home Score": (0, None),
+    "Balls": (0, 3),
+    "Strikes": (0, 2),
+    "Outs": (0, 2),
+    "Chemistry Links on Base": (0, 3),
+    "Pitcher Roster Loc": (0, 8),
+    "Batter Roster Loc": (0, 8),
+    "RBI": (0, 4),
+}
+
+RUNNER_KEYS = ["Runner Roster Loc", "Runner Char Id", "Runner Initial Base", "Out Type", "Out Location",
+               "Steal", "Runner Result Base"]
+
+PITCH_KEYS = ["Star Pitch", "Type of Swing"]
+
+CONTACT_KEYS = ["Star Swing Five-Star"]
+
+FIRST_FIELDER_KEYS = ["Fielder Character", "Fielder Bobble", "Fielder Action", "Fielder Position",
+                      "Fielder Manual Selected"]
+
+RESULT_OF_AB = ["None", "Strikeout", "Walk BB", "Walk HBP", "Out", "Caught", "Caught line-drive", "Single",
+                "Double", "Triple", "HR", "Error - Input", "Error - Chem", "Bunt", "SacFly",
+                "Ground Ball Double Play", "Foul"]
+
+# Character Game Stats keys, see RioStatLib.VERSION_LIST_OLD_TEAM_STRUCTURE
+ROSTER_KEYS = [f"{teamStr} Roster {rosterNum}" for teamStr in ["Away", "Home"] for rosterNum in range(0, 9)]
+OLD_ROSTER_KEYS = [f"Team {teamNum} Roster {rosterNum}" for teamNum in range(0, 2) for rosterNum in range(0, 9)]
+
+DEFAULT_SCHEMA = {
+    "headerKeys": HEADER_KEYS,
+    "rosterKeys": ROSTER_KEYS,
+    "characterKeys": CHARACTER_KEYS,
+    "offensiveStatKeys": OFFENSIVE_STAT_KEYS,
+    "defensiveStatKeys": DEFENSIVE_STAT_KEYS,
+    "eventKeys": EVENT_KEYS,
+    "runnerKeys": RUNNER_KEYS,
+    "pitchKeys": PITCH_KEYS,
+    "contactKeys": CONTACT_KEYS,
+    "firstFielderKeys": FIRST_FIELDER_KEYS,
+    "resultOfAB": RESULT_OF_AB,
+}
+# version -> schema overrides. versions not listed use DEFAULT_SCHEMA as is
+# the versions RioStatLib knows to differ are the ones with the old "Team 0 Roster 0" keys
+VERSION_SCHEMAS = {version: {"rosterKeys": OLD_ROSTER_KEYS} for version in RioStatLib.VERSION_LIST_OLD_TEAM_STRUCTURE}
+
+
+def schemaFor(version: str):
+    # returns the schema dict used to check files of a version
+    schema = dict(DEFAULT_SCHEMA)
+    schema.update(VERSION_SCHEMAS.get(version, {}))
+    return schema
+
+
+def rosterKeys(version: str):
+    # returns the 18 Character Game Stats keys a file of this version has
+    return schemaFor(version)["rosterKeys"]
+
+
+class ValidationReport:
+    # every issue found in one stat file
+    def __init__(self, path: str = None, version: str = None):
+        self.path = path
+        self.version = version
+        self.gameID = None
+        self.errors = []
+        self.warnings = []
+        self.statJson = None  # the decoded stat json of a valid file, when validateFile was asked to keep it
+
+    def isValid(self):
+        return not self.errors
+
+    def error(self, location: str, message: str):
+        self.errors.append(f"{location}: {message}")
+
+    def warning(self, location: str, message: str):
+        self.warnings.append(f"{location}: {message}")
+
+    def __str__(self):
+        lines = [f"{self.path} (version {self.version}): {len(self.errors)} errors, {len(self.warnings)} warnings"]
+        lines.extend(f"  error   {issue}" for issue in self.errors)
+        lines.extend(f"  warning {issue}" for issue in self.warnings)
+        return "\n".join(lines)
+
+
+def _checkKeys(report, location: str, obj, keys):
+    # reports missing keys, and keys of the wrong type when keys is a dict of key -> type
+    if not isinstance(obj, dict):
+        report.error(location, f"expected an object, found {type(obj).__name__}")
+        return False
+    ok = True
+    for key in keys:
+        if key not in obj:
+            report.error(location, f"missing '{key}'")
+            ok = False
+        elif isinstance(keys, dict) and not isinstance(obj[key], keys[key]):
+            report.error(location, f"'{key}' should be {keys[key].__name__}, found {type(obj[key]).__name__}")
+            ok = False
+    return ok
+
+
+def validateStatJson(statJson: dict, path: str = None, buildStatObj: bool = True):
+    # returns a ValidationReport of a decoded stat json
+    # buildStatObj: optional, also build a StatObj when no errors were found to catch anything the schema missed
+    version = statJson.get("Version", "Pre 0.1.7") if isinstance(statJson, dict) else None
+    report = ValidationReport(path, version)
+    schema = schemaFor(version)
+
+    if not _checkKeys(report, "header", statJson, schema["headerKeys"]):
+        if not isinstance(statJson, dict) or not isinstance(statJson.get("Events"), list):
+            return report
+    report.gameID = statJson.get("GameID")
+    inningsPlayed = statJson.get("Innings Played")
+
+    charStats = statJson.get("Character Game Stats")
+    if isinstance(charStats, dict):
+        for rosterKey in schema["rosterKeys"]:
+            if rosterKey not in charStats:
+                report.error("Character Game Stats", f"missing '{rosterKey}'")
+                continue
+            character = charStats[rosterKey]
+            location = f"Character Game Stats/{rosterKey}"
+            if not _checkKeys(report, location, character, schema["characterKeys"]):
+                continue
+            _checkKeys(report, f"{location}/Offensive Stats", character["Offensive Stats"], schema["offensiveStatKeys"])
+            _checkKeys(report, f"{location}/Defensive Stats", character["Defensive Stats"], schema["defensiveStatKeys"])
+
+    events = statJson.get("Events")
+    if not events:
+        report.error("Events", "no events")
+        events = []
+    for x, event in enumerate(events):
+        location = f"Events[{x}]"
+        if not _checkKeys(report, location, event, list(schema["eventKeys"])):
+            continue
+        for key, (low, high) in schema["eventKeys"].items():
+            value = event[key]
+            if not isinstance(value, int) or (low is not None and value < low) or (high is not None and value > high):
+                report.error(location, f"'{key}' {value!r} outside {low} -> {high}")
+        if event["Event Num"] != x:
+            report.warning(location, f"'Event Num' {event['Event Num']} does not match its position")
+        if isinstance(inningsPlayed, int) and isinstance(event["Inning"], int) and event["Inning"] > inningsPlayed:
+            report.error(location, f"'Inning' {event['Inning']} is greater than 'Innings Played' {inningsPlayed}")
+        if "Result of AB" not in event:
+            report.error(location, "missing 'Result of AB'")
+        elif event["Result of AB"] not in schema["resultOfAB"]:
+            report.error(location, f"unknown 'Result of AB' {event['Result of AB']!r}")
+
+        for runnerKey in ["Runner Batter", "Runner 1B", "Runner 2B", "Runner 3B"]:
+            if runnerKey in event:
+                _checkKeys(report, f"{location}/{runnerKey}", event[runnerKey], schema["runnerKeys"])
+
+        if "Pitch" not in event:
+            report.warning(location, "missing 'Pitch'")
+            continue
+        pitch = event["Pitch"]
+        if not _checkKeys(report, f"{location}/Pitch", pitch, schema["pitchKeys"]) or "Contact" not in pitch:
+            continue
+        contact = pitch["Contact"]
+        if not _checkKeys(report, f"{location}/Pitch/Contact", contact, schema["contactKeys"]) or "First Fielder" not in contact:
+            continue
+        _checkKeys(report, f"{location}/Pitch/Contact/First Fielder", contact["First Fielder"], schema["firstFielderKeys"])
+
+    if buildStatObj and report.isValid():
+        try:
+            RioStatLib.StatObj(statJson)
+        except Exception as e:
+            report.error("StatObj", f"{type(e).__name__}: {e}")
+    return report
+
+
+def validateFile(path: str, buildStatObj: bool = True, keepStatJson: bool = False):
+    # returns a ValidationReport of a stat file. unreadable or non-json files are reported, not raised
+    # keepStatJson: optional, keep the decoded stat json of a valid file in report.statJson
+    try:
+        with open(path, "rb") as statFile:
+            statJson = RioStatLib.loadStatJson(statFile.read())
+    except (OSError, ValueError) as e:
+        report = ValidationReport(path)
+        report.error("file", f"{type(e).__name__}: {e}")
+        return report
+    report = validateStatJson(statJson, path, buildStatObj)
+    if keepStatJson and report.isValid():
+        report.statJson = statJson
+    return report
+
+
+def statFilePaths(directory: str, pattern: str = "*.json"):
+    # returns the sorted stat file paths in a directory
+    return sorted(glob.glob(os.path.join(directory, pattern)))
+
+
+def validateFiles(paths: list, processes: int = None, buildStatObj: bool = True, keepStatJson: bool = False):
+    # validates stat files across a pool of worker processes
+    # returns a list of ValidationReports in the same order as paths
+    # keepStatJson: optional, see validateFile
+    paths = list(paths)
+    if processes == 1 or len(paths) < 2:
+        return [validateFile(path, buildStatObj, keepStatJson) for path in paths]
+    chunksize = RioUtil.poolChunksize(len(paths), processes)
+    with Pool(processes) as pool:
+        return pool.starmap(validateFile, [(path, buildStatObj, keepStatJson) for path in paths],
+                            chunksize=chunksize)
+
+
+def validateDirectory(directory: str, processes: int = None, pattern: str = "*.json", buildStatObj: bool = True):
+    # validates every stat file in a directory across a pool of worker processes
+    return validateFiles(statFilePaths(directory, pattern), processes, buildStatObj)
+
+
+def quarantine(report: ValidationReport, quarantineDir: str):
+    # moves a stat file into quarantineDir and writes its report next to it as <file name>.errors.txt
+    os.makedirs(quarantineDir, exist_ok=True)
+    destination = os.path.join(quarantineDir, os.path.basename(report.path))
+    shutil.move(report.path, destination)
+    with open(f"{destination}.errors.txt", "w") as reportFile:
+        reportFile.write(str(report))
+    return destination
+
+
+def _validateKeeping(path: str):
+    return validateFile(path, buildStatObj=False, keepStatJson=True)
+
+
+def _streamReports(paths: list, processes: int = None):
+    # yields the keepStatJson ValidationReport of every path in order, as the pool finishes them
+    # only a few decoded files are held at once, unlike validateFiles which returns every report together
+    if processes == 1 or len(paths) < 2:
+        for path in paths:
+            yield _validateKeeping(path)
+        return
+    chunksize = RioUtil.poolChunksize(len(paths), processes)
+    with Pool(processes) as pool:
+        yield from pool.imap(_validateKeeping, paths, chunksize=chunksize)
+
+
+def loadValidGames(directory: str, quarantineDir: str = None, processes: int = None, pattern: str = "*.json"):
+    # yields a StatObj for every valid stat file in a directory
+    # files with errors are moved to quarantineDir when given, otherwise they are skipped
+    # validation and decoding run in parallel, the workers send back the decoded stat json of valid
+    # files so each file is decoded once. StatObjs are built in this process as they are yielded
+    for report in _streamReports(statFilePaths(directory, pattern), processes):
+        statObj = None
+        if report.isValid():
+            try:
+                statObj = RioStatLib.StatObj(report.statJson)
+            except Exception as e:
+                report.error("StatObj", f"{type(e).__name__}: {e}")
+            report.statJson = None
+        if statObj is not None:
+            yield statObj
+        elif quarantineDir is not None:
+            quarantine(report, quarantineDir)
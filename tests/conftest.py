@@ -0,0 +1,35 @@
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import RioStatLib
+from syntheticGames import makeGame
+
+
+GAME_COUNT = 24
+
+
+@pytest.fixture(scope="session")
+def statJsons():
+    # synthetic games in start date order
+    return [makeGame(seed) for seed in range(GAME_COUNT)]
+
+
+@pytest.fixture
+def statObjs(statJsons):
+    return [RioStatLib.StatObj(json.loads(json.dumps(statJson))) for statJson in statJsons]
+
+
+@pytest.fixture
+def gameFiles(statJsons, tmp_path):
+    # the synthetic games written to stat files, in game order
+    paths = []
+    for x, statJson in enumerate(statJsons):
+        path = tmp_path / f"game{x:02d}.json"
+        path.write_text(json.dumps(statJson))
+        paths.append(str(path))
+    return paths
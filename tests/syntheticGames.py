@@ -0,0 +1,180 @@
+'''
+Synthetic Rio stat files for the tests
+
+makeGame(seed) builds a complete, deterministic stat json in the 1.9.5 layout: 18 characters,
+every event with a Pitch, contact and first fielder data on balls in play, runners that advance
+and score, and a start date one hour after the game before it. flipVersion() rewrites a game
+into the layout of an old version where team 0 is the home team.
+'''
+
+import random
+import time
+
+
+CHARS = ["Mario", "Luigi", "Peach", "Daisy", "Yoshi", "Birdo", "Wario", "Waluigi", "Boo", "Bowser",
+         "Dixie", "Diddy", "DK", "Toad(R)", "Toad(B)", "Koopa(G)", "Koopa(R)", "Baby Mario", "Baby Luigi", "Petey"]
+RESULTS = ["None", "Strikeout", "Walk BB", "Walk HBP", "Out", "Single", "Double", "Triple", "HR",
+           "Error - Input", "Error - Chem", "Bunt", "SacFly", "Ground Ball Double Play", "Foul"]
+POS = ["P", "C", "1B", "2B", "3B", "SS", "LF", "CF", "RF"]
+
+
+def _runner(loc, cid, init, res, steal="None", out="None", outloc=0):
+    return {"Runner Roster Loc": loc, "Runner Char Id": cid, "Runner Initial Base": init,
+            "Out Type": out, "Out Location": outloc, "Steal": steal, "Runner Result Base": res}
+
+
+def makeGame(seed: int, version: str = "1.9.5"):
+    # returns the stat json of a synthetic game
+    r = random.Random(seed)
+    chars = r.sample(CHARS, 18)
+    teams = [chars[:9], chars[9:]]
+    cgs = {}
+    for t in range(2):
+        for i in range(9):
+            key = f"{'Away' if t == 0 else 'Home'} Roster {i}"
+            cgs[key] = {
+                "Team": str(t), "RosterID": i, "CharID": teams[t][i],
+                "Superstar": r.randint(0, 1), "Captain": 1 if i == 0 else 0,
+                "Fielding Hand": r.choice(["Left", "Right"]), "Batting Hand": r.choice(["Left", "Right"]),
+                "Defensive Stats": {"Batters Faced": r.randint(0, 30), "Runs Allowed": r.randint(0, 6),
+                                    "Earned Runs": r.randint(0, 5), "Batters Walked": r.randint(0, 3),
+                                    "Batters Hit": r.randint(0, 2), "Hits Allowed": r.randint(0, 9),
+                                    "HRs Allowed": r.randint(0, 3), "Pitches Thrown": r.randint(0, 90),
+                                    "Stamina": r.randint(0, 10), "Was Pitcher": 1 if i == 0 else 0,
+                                    "Strikeouts": r.randint(0, 8), "Star Pitches Thrown": r.randint(0, 3),
+                                    "Big Plays": r.randint(0, 3), "Outs Pitched": r.randint(1, 27),
+                                    "Pitches Per Position": [{p: r.randint(0, 30) for p in POS}],
+                                    "Outs Per Position": [{p: r.randint(0, 5) for p in POS}]},
+                "Offensive Stats": {"At Bats": r.randint(1, 5), "Hits": r.randint(0, 3), "Singles": r.randint(0, 2),
+                                    "Doubles": r.randint(0, 1), "Triples": r.randint(0, 1), "Homeruns": r.randint(0, 1),
+                                    "Successful Bunts": 0, "Sac Flys": 0, "Strikeouts": r.randint(0, 2),
+                                    "Walks (4 Balls)": r.randint(0, 1), "Walks (Hit)": 0, "RBI": r.randint(0, 3),
+                                    "Bases Stolen": r.randint(0, 1), "Star Hits": r.randint(0, 1)},
+            }
+    innings = r.choice([3, 5, 7, 9])
+    played = innings if r.random() > 0.2 else innings - 1
+    events = []
+    n = 0
+    score = [0, 0]
+    stars = [0, 0]
+    batter_idx = [0, 0]
+    stamina = [10, 10]
+    for inn in range(1, played + 1):
+        for half in range(2):
+            outs = 0
+            bases = [None, None, None]
+            while outs < 3:
+                balls = strikes = 0
+                while True:
+                    bat = batter_idx[half]
+                    ev = {"Event Num": n, "Inning": inn, "Half Inning": half, "Away Score": score[0],
+                          "Home Score": score[1], "Balls": balls, "Strikes": strikes, "Outs": outs,
+                          "Star Chance": r.randint(0, 1), "Away Stars": stars[0], "Home Stars": stars[1],
+                          "Pitcher Stamina": stamina[1 - half], "Chemistry Links on Base": r.randint(0, 3),
+                          "Pitcher Roster Loc": 0, "Batter Roster Loc": bat, "Catcher Roster Loc": 1,
+                          "RBI": 0, "Num Outs During Play": 0, "Result of AB": "None"}
+                    ev["Runner Batter"] = _runner(bat, teams[half][bat], 0, 0)
+                    for b in range(3):
+                        if bases[b] is not None:
+                            st = r.choice(["None"] * 8 + ["Ready", "Normal", "Perfect"])
+                            ev[f"Runner {b + 1}B"] = _runner(bases[b], teams[half][bases[b]], b + 1, b + 1, st)
+                    swing = r.choice(["None", "Slap", "Charge", "Star", "Bunt"])
+                    pitch = {"Pitcher Team Id": 1 - half, "Pitcher Char Id": teams[1 - half][0],
+                             "Pitch Type": "Curve", "Charge Type": "N/A", "Star Pitch": int(r.random() < 0.05),
+                             "Pitch Speed": r.randint(120, 190), "Ball Position - Strikezone": r.uniform(-1, 1),
+                             "In Strikezone": r.randint(0, 1), "Bat Contact Pos - X": 0.0,
+                             "Bat Contact Pos - Z": 1.5, "DB": 0, "Type of Swing": swing}
+                    ev["Pitch"] = pitch
+                    stamina[1 - half] = max(0, stamina[1 - half] - (1 if r.random() < 0.1 else 0))
+                    if r.random() < 0.2:
+                        stars[half] = min(5, stars[half] + 1)
+                    res = r.choice(RESULTS)
+                    if swing != "None" and res not in ("Walk BB", "Walk HBP", "Strikeout", "None"):
+                        c = {"Type of Contact": "Nice - Right", "Charge Power Up": 0, "Charge Power Down": 0,
+                             "Star Swing Five-Star": int(r.random() < 0.02), "Input Direction - Push/Pull": "None",
+                             "Input Direction - Stick": "None", "Frame of Swing Upon Contact": "2",
+                             "Ball Power": "139", "Vert Angle": "158", "Horiz Angle": "1,722",
+                             "Contact Absolute": 100.0, "Contact Quality": r.random(), "RNG1": "4,552",
+                             "RNG2": "5,350", "RNG3": "183", "Ball Velocity - X": 0.1, "Ball Velocity - Y": 0.1,
+                             "Ball Velocity - Z": 0.1, "Ball Contact Pos - X": 0.1, "Ball Contact Pos - Z": 1.5,
+                             "Ball Landing Position - X": r.uniform(-60, 60), "Ball Landing Position - Y": 0.1,
+                             "Ball Landing Position - Z": r.uniform(0, 90), "Ball Max Height": r.uniform(0, 20),
+                             "Ball Hang Time": "89", "Contact Result - Primary": "Fair",
+                             "Contact Result - Secondary": res}
+                        if r.random() < 0.8:
+                            c["First Fielder"] = {"Fielder Roster Location": r.randint(0, 8),
+                                                  "Fielder Position": r.choice(POS),
+                                                  "Fielder Character": teams[1 - half][r.randint(0, 8)],
+                                                  "Fielder Action": r.choice(["None", "Sliding", "Walljump"]),
+                                                  "Fielder Jump": 0, "Fielder Manual Selected": "No Selected Char",
+                                                  "Fielder Position - X": 0.0, "Fielder Position - Y": 0.0,
+                                                  "Fielder Position - Z": 0.0,
+                                                  "Fielder Bobble": r.choice(["None"] * 6 + ["Bobble", "Fumble"])}
+                        pitch["Contact"] = c
+                    else:
+                        if res not in ("Walk BB", "Walk HBP", "Strikeout"):
+                            res = "None"
+                    if res == "None":
+                        if r.random() < 0.5 and balls < 3:
+                            balls += 1
+                        elif strikes < 2:
+                            strikes += 1
+                        else:
+                            res = "Strikeout"
+                    ev["Result of AB"] = res
+                    n += 1
+                    if res == "None":
+                        events.append(ev)
+                        continue
+                    if res in ("Strikeout", "Out", "Foul", "Ground Ball Double Play", "SacFly", "Bunt"):
+                        outs += 1
+                        ev["Num Outs During Play"] = 1
+                        ev["Runner Batter"]["Out Type"] = "Caught" if res != "Strikeout" else "Strike-out"
+                        ev["Runner Batter"]["Out Location"] = 0 if res == "Strikeout" else 1
+                    else:
+                        adv = {"Single": 1, "Double": 2, "Triple": 3, "HR": 4}.get(res, 1)
+                        runs = 0
+                        newb = [None, None, None]
+                        for b in range(2, -1, -1):
+                            if bases[b] is not None:
+                                dest = b + 1 + adv
+                                ev[f"Runner {b + 1}B"]["Runner Result Base"] = min(dest, 4)
+                                if dest >= 4:
+                                    runs += 1
+                                else:
+                                    newb[dest - 1] = bases[b]
+                        ev["Runner Batter"]["Runner Result Base"] = adv
+                        if adv >= 4:
+                            runs += 1
+                        else:
+                            newb[adv - 1] = bat
+                        bases = newb
+                        score[half] += runs
+                        ev["RBI"] = runs
+                    events.append(ev)
+                    batter_idx[half] = (batter_idx[half] + 1) % 9
+                    break
+    statJson = {"GameID": "%x" % r.getrandbits(40), "Date - Start": time.strftime("%a %b %d %H:%M:%S %Y", time.gmtime(1690000000 + seed * 3600)),
+         "Date - End": time.strftime("%a %b %d %H:%M:%S %Y", time.gmtime(1690000000 + seed * 3600 + 1800)),
+         "Ranked": r.randint(0, 1), "Netplay": 1, "StadiumID": r.choice(["Mario Stadium", "Bowser Castle", "Yoshi Park"]),
+         "Away Player": r.choice(["alice", "bob", "carol", "dave"]), "Home Player": r.choice(["erin", "frank", "gina"]),
+         "Away Score": score[0], "Home Score": score[1], "Innings Selected": innings, "Innings Played": played,
+         "Quitter Team": "", "Average Ping": r.randint(5, 150), "Lag Spikes": r.randint(0, 10), "Version": version,
+         "Character Game Stats": cgs, "Events": events}
+    return statJson
+
+
+
+def flipVersion(statJson: dict, version: str = "1.9.1"):
+    # returns the same game as written by an old version: "Team 0/1 Roster" keys, and the
+    # Away/Home labelled players, scores and stars swapped because team 0 is the home team there
+    flipped = dict(statJson)
+    flipped["Version"] = version
+    for field in ["Player", "Score"]:
+        flipped[f"Away {field}"], flipped[f"Home {field}"] = statJson[f"Home {field}"], statJson[f"Away {field}"]
+    flipped["Character Game Stats"] = {key.replace("Away", "Team 0").replace("Home", "Team 1"): value
+                                       for key, value in statJson["Character Game Stats"].items()}
+    flipped["Events"] = [dict(event, **{"Away Stars": event["Home Stars"], "Home Stars": event["Away Stars"],
+                                              "Away Score": event["Home Score"], "Home Score": event["Away Score"]})
+                         for event in statJson["Events"]]
+    return flipped
@@ -0,0 +1,64 @@
+import gzip
+import os
+import tarfile
+import zipfile
+
+import pytest
+
+import RioArchive
+
+
+def gameOPS(name, statObj):
+    return name, statObj.gameID(), statObj.ops(1)
+
+
+def writeArchive(gameFiles, path):
+    # writes the game files into an archive of the type of path
+    archive = RioArchive.archiveType(path)
+    if archive == "tar":
+        with tarfile.open(path, "w:gz" if path.endswith(".gz") else "w") as tar:
+            for gamePath in gameFiles:
+                tar.add(gamePath, arcname=os.path.basename(gamePath))
+    elif archive == "zip":
+        with zipfile.ZipFile(path, "w") as archiveFile:
+            for gamePath in gameFiles:
+                archiveFile.write(gamePath, os.path.basename(gamePath))
+    else:
+        with gzip.open(path, "wb") as lines:
+            for gamePath in gameFiles:
+                with open(gamePath, "rb") as statFile:
+                    lines.write(statFile.read().replace(b"\n", b"") + b"\n")
+    return path
+
+
+@pytest.mark.parametrize("fileName", ["games.tar", "games.tar.gz", "games.zip", "games.jsonl.gz"])
+def test_poolMatchesSerial(gameFiles, statObjs, tmp_path, fileName):
+    path = writeArchive(gameFiles, str(tmp_path / fileName))
+    serial = list(RioArchive.mapArchive(path, gameOPS, processes=1))
+    pooled = list(RioArchive.mapArchive(path, gameOPS, processes=2, maxPending=3))
+    assert pooled == serial
+    assert [gameID for _, gameID, _ in serial] == [statObj.gameID() for statObj in statObjs]
+    assert [ops for _, _, ops in serial] == [statObj.ops(1) for statObj in statObjs]
+
+
+def test_readArchiveYieldsStatObjs(gameFiles, statObjs, tmp_path):
+    path = writeArchive(gameFiles[:4], str(tmp_path / "games.zip"))
+    assert [statObj.statJson for statObj in RioArchive.readArchive(path, processes=1)] == \
+           [statObj.statJson for statObj in statObjs[:4]]
+
+
+def test_archiveTypeBySuffix():
+    assert RioArchive.archiveType("season4.TGZ") == "tar"
+    assert RioArchive.archiveType("season4.tar.zst") == "zstd"
+    assert RioArchive.archiveType("season4.jsonl") == "jsonl"
+
+
+def test_unsupportedArchiveRaises():
+    with pytest.raises(Exception, match="Unsupported archive"):
+        RioArchive.archiveType("season4.rar")
+
+
+@pytest.mark.skipif(RioArchive.zstandard is not None, reason="zstandard is installed")
+def test_zstdWithoutPackageRaises(tmp_path):
+    with pytest.raises(Exception, match="needs the zstandard package"):
+        list(RioArchive.archiveMembers(str(tmp_path / "games.tar.zst")))
@@ -0,0 +1,82 @@
+import pytest
+
+import RioBaserunning
+import RioColumns
+
+
+RUNNER_KEYS = ["Runner Batter", "Runner 1B", "Runner 2B", "Runner 3B"]
+
+
+def runnerEntries(statObjs):
+    for statObj in statObjs:
+        for event in statObj.events():
+            for key in RUNNER_KEYS:
+                if key in event:
+                    yield key, event[key]
+
+
+def test_runnerColumnsHoldEveryRunner(statObjs):
+    runners = RioColumns.RunnerColumns()
+    for statObj in statObjs:
+        runners.addGame(statObj)
+    entries = list(runnerEntries(statObjs))
+    assert len(runners.columns["Character"]) == len(entries)
+    assert [runners.codebook("Character").values[code] for code in runners.columns["Character"]] == \
+           [runner["Runner Char Id"] for _, runner in entries]
+
+
+def test_runsScoredMatchesRunnerRecords(statObjs):
+    baserunning = RioBaserunning.BaserunningStats()
+    for statObj in statObjs:
+        baserunning.addGame(statObj)
+    expected = {}
+    for _, runner in runnerEntries(statObjs):
+        if runner["Runner Result Base"] == 4 and runner["Out Type"] == "None":
+            expected[runner["Runner Char Id"]] = expected.get(runner["Runner Char Id"], 0) + 1
+    assert baserunning.runsScored() == expected
+
+
+def test_extendSkipsGamesAlreadyAdded(statObjs):
+    runners = RioColumns.RunnerColumns()
+    for statObj in statObjs[:10]:
+        runners.addGame(statObj)
+    overlap = RioColumns.RunnerColumns()
+    for statObj in statObjs[6:]:
+        overlap.addGame(statObj)
+    whole = RioColumns.RunnerColumns()
+    for statObj in statObjs:
+        whole.addGame(statObj)
+    runners.extend(overlap, set(runners.gameIDs))
+    assert runners.gameIDs == whole.gameIDs
+    for name, _ in whole.SCHEMA:
+        if name in whole.codebooks:
+            decoded = [runners.codebook(name).values[code] for code in runners.column(name)]
+            assert decoded == [whole.codebook(name).values[code] for code in whole.column(name)]
+        else:
+            assert list(runners.column(name)) == list(whole.column(name))
+
+
+def test_mergeOfHalvesMatchesWhole(statObjs):
+    whole = RioBaserunning.BaserunningStats()
+    first, second = RioBaserunning.BaserunningStats(), RioBaserunning.BaserunningStats()
+    for x, statObj in enumerate(statObjs):
+        whole.addGame(statObj)
+        (first if x % 2 else second).addGame(statObj)
+    merged = first.merge(second)
+    assert merged.extraBasesTaken() == whole.extraBasesTaken()
+    assert merged.stealSuccess() == whole.stealSuccess()
+    assert merged.outsOnBases(includeBatter=True) == whole.outsOnBases(includeBatter=True)
+    assert merged.runsScored() == whole.runsScored()
+
+
+def test_tallyRefreshesAfterAddGame(statObjs):
+    baserunning = RioBaserunning.BaserunningStats().addGame(statObjs[0])
+    before = sum(baserunning.runsScored().values())
+    baserunning.addGame(statObjs[1])
+    assert sum(baserunning.runsScored().values()) >= before
+    assert all(0.0 <= line["Rate"] <= 1.0 for line in baserunning.stealSuccess().values())
+
+
+def test_invalidCodedColumnRaises():
+    with pytest.raises(Exception, match="Invalid coded column"):
+        RioColumns.RunnerColumns().codebook("Batter")
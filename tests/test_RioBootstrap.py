@@ -0,0 +1,94 @@
+import pytest
+
+import RioBootstrap
+import RioLeaderboard
+
+
+BACKENDS = [None] + ([RioBootstrap.numpy] if RioBootstrap.numpy is not None else [])
+
+
+@pytest.fixture(params=BACKENDS, ids=lambda backend: "random" if backend is None else "numpy")
+def backend(request, monkeypatch):
+    monkeypatch.setattr(RioBootstrap, "numpy", request.param)
+    return request.param
+
+
+@pytest.fixture
+def boot(statObjs):
+    boot = RioBootstrap.BootstrapStats("character")
+    for statObj in statObjs:
+        boot.addGame(statObj)
+    return boot
+
+
+def test_estimateMatchesLeaderboard(statObjs, boot, backend):
+    line = RioLeaderboard.Leaderboard("character")
+    for statObj in statObjs:
+        line.addGame(statObj)
+    for key in list(boot.games)[:5]:
+        interval = boot.interval(key, "ops", resamples=50, seed=1)
+        assert interval["Estimate"] == pytest.approx(line.statLine(key).ops())
+        assert interval["Games"] == len(boot.rows(key))
+        assert interval["Low"] <= interval["High"]
+
+
+@pytest.mark.parametrize("unit", RioBootstrap.UNITS)
+def test_poolMatchesSerial(boot, backend, unit):
+    serial = boot.intervals("obp", unit=unit, resamples=100, seed=7, minimum=("atBats", 5))
+    pooled = boot.intervals("obp", unit=unit, resamples=100, seed=7, minimum=("atBats", 5), processes=2)
+    assert pooled == serial
+    assert all(boot.total(key, "atBats") >= 5 for key in serial)
+
+
+def test_sameSeedSameInterval(boot, backend):
+    key = next(iter(boot.games))
+    assert boot.interval(key, "slg", resamples=200, seed=3) == boot.interval(key, "slg", resamples=200, seed=3)
+
+
+def test_blockedResamplingMatchesOneBlock(boot, monkeypatch):
+    if RioBootstrap.numpy is None:
+        pytest.skip("numpy is not installed")
+    key = next(iter(boot.games))
+    whole = boot.interval(key, "ops", resamples=300, seed=5)
+    monkeypatch.setattr(RioBootstrap, "RESAMPLE_BLOCK_CELLS", 7)
+    blocked = boot.interval(key, "ops", resamples=300, seed=5)
+    assert blocked["Resamples"] == whole["Resamples"]
+    assert blocked["Estimate"] == whole["Estimate"]
+
+
+@pytest.mark.parametrize("unit", RioBootstrap.UNITS)
+def test_numpyMatchesRandomWithinTolerance(boot, monkeypatch, unit):
+    # the backends draw different resamples, so only the interval bounds are compared, within a tenth of the width
+    if RioBootstrap.numpy is None:
+        pytest.skip("numpy is not installed")
+    key = max(boot.games, key=lambda key: len(boot.rows(key)))
+    vectorized = boot.interval(key, "ops", unit=unit, resamples=4000, seed=2)
+    monkeypatch.setattr(RioBootstrap, "numpy", None)
+    looped = boot.interval(key, "ops", unit=unit, resamples=4000, seed=2)
+    width = vectorized["High"] - vectorized["Low"]
+    assert looped["Estimate"] == vectorized["Estimate"]
+    assert looped["Low"] == pytest.approx(vectorized["Low"], abs=0.1 * width)
+    assert looped["High"] == pytest.approx(vectorized["High"], abs=0.1 * width)
+
+
+def test_mergeOfHalvesMatchesWhole(statObjs, boot):
+    first, second = RioBootstrap.BootstrapStats("character"), RioBootstrap.BootstrapStats("character")
+    for x, statObj in enumerate(statObjs):
+        (first if x < len(statObjs) // 2 else second).addGame(statObj)
+    assert first.merge(second).games == boot.games
+
+
+def test_emptyKeyHasNoInterval(boot):
+    assert boot.interval("Nobody", "ops") == \
+           {"Estimate": None, "Low": None, "High": None, "Games": 0, "Resamples": 0}
+
+
+def test_errorPaths(boot):
+    with pytest.raises(Exception, match="Invalid groupBy"):
+        RioBootstrap.BootstrapStats("team")
+    with pytest.raises(Exception, match="Cannot merge"):
+        boot.merge(RioBootstrap.BootstrapStats("player"))
+    with pytest.raises(Exception, match="Invalid unit"):
+        boot.interval("Mario", "ops", unit="innings")
+    with pytest.raises(Exception, match="Invalid rate stat era for unit plateAppearances"):
+        boot.interval("Mario", "era", unit="plateAppearances")
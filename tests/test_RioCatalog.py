@@ -0,0 +1,61 @@
+import pytest
+
+import RioCatalog
+import RioRatings
+import RioStatLib
+
+
+START = 1690000000.0
+HOUR = 3600
+
+
+@pytest.fixture
+def catalog(gameFiles):
+    return RioCatalog.GameCatalog.fromFiles(gameFiles, processes=1)
+
+
+def test_statObjTimestamps(statObjs):
+    statObj = statObjs[2]
+    assert statObj.startTimestamp() == START + 2 * HOUR
+    assert statObj.endTimestamp() == START + 2 * HOUR + 1800
+    assert statObj.duration() == 1800
+
+
+def test_parseDateFormats():
+    assert RioStatLib.parseDate("Sat Jul 22 04:26:40 2023") == START
+    assert RioStatLib.parseDate(START) == START
+    assert RioStatLib.parseDate(str(int(START))) == START
+    assert RioStatLib.parseDate("not a date") is None
+
+
+def test_outOfOrderFilesAreSorted(gameFiles, catalog):
+    shuffled = RioCatalog.GameCatalog.fromFiles(gameFiles[::-1], processes=2)
+    assert shuffled.index.columns == catalog.index.columns
+    starts = catalog.index.column("Start").tolist()
+    assert starts == sorted(starts)
+
+
+def test_rangeQueries(catalog):
+    assert catalog.count() == len(catalog)
+    assert catalog.count(START + 2 * HOUR, START + 5 * HOUR) == 3
+    assert catalog.between(START + 2 * HOUR, START + 5 * HOUR).column("Start").tolist() == \
+           [START + x * HOUR for x in range(2, 5)]
+    assert catalog.lastDays(1, now=START + 10 * HOUR).column("Start").tolist() == \
+           [START + x * HOUR for x in range(0, 10)]
+    assert len(catalog.lastDays(2 / 24, now=START + 10 * HOUR)) == 2
+    assert catalog.durationStats(START, START + 3 * HOUR) == \
+           {"Games": 3, "Mean": 1800.0, "Median": 1800.0, "Min": 1800.0, "Max": 1800.0}
+    assert catalog.durationStats(START - 10 * HOUR, START)["Games"] == 0
+
+
+def test_applyRatingsMatchesStatJsons(catalog, statJsons):
+    fromCatalog = RioRatings.RatingEngine("glicko", rankedOnly=False)
+    assert catalog.applyRatings(fromCatalog) == len(statJsons)
+    fromStatJsons = RioRatings.RatingEngine("glicko", rankedOnly=False)
+    fromStatJsons.addStatJsons(statJsons)
+    assert fromCatalog.toDict() == fromStatJsons.toDict()
+
+
+def test_saveLoadRoundTrip(catalog, tmp_path):
+    catalog.save(str(tmp_path / "catalog.json"))
+    assert RioCatalog.GameCatalog.load(str(tmp_path / "catalog.json")).index.columns == catalog.index.columns
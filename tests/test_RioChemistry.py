@@ -0,0 +1,56 @@
+import pytest
+
+import RioChemistry
+import RioLeaderboard
+
+
+def test_tallyRatesMatchStatLine():
+    tally = RioChemistry.OutcomeTally()
+    for result in ["Single", "Double", "HR", "Walk BB", "Walk HBP", "Strikeout", "Out", "SacFly"]:
+        tally.add(result)
+    line = RioLeaderboard.StatLine()
+    line.offense.update({"atBats": 7, "hits": 3, "singles": 1, "doubles": 1, "homeruns": 1,
+                         "walksBallFour": 1, "walksHitByPitch": 1})
+    assert (tally.plateAppearances, tally.atBats, tally.totalBases) == (8, 7, 7)
+    assert tally.battingAvg() == pytest.approx(line.battingAvg())
+    assert tally.obp() == pytest.approx(line.obp())
+    assert tally.slg() == pytest.approx(line.slg())
+    assert tally.strikeoutRate() == pytest.approx(1 / 8)
+
+
+def test_tallyWithoutAtBatsIsZero():
+    tally = RioChemistry.OutcomeTally()
+    assert tally.summary()["OPS"] == 0.0
+    tally.add("Walk BB", count=2)
+    assert tally.obp() == 1.0 and tally.slg() == 0.0
+
+
+@pytest.fixture
+def context(statObjs):
+    context = RioChemistry.LineupContextStats()
+    for statObj in statObjs:
+        context.addGame(statObj)
+    return context
+
+
+def test_splitsCoverEveryPlateAppearance(context):
+    total = sum(summary["PA"] for summary in context.split("chem").values())
+    assert total == sum(context.events.column("Ends PA"))
+    assert sum(summary["PA"] for summary in context.split("chem", "lineup").values()) == total
+    assert set(context.split("captainBatting")) <= {False, True}
+
+
+def test_mergeOfHalvesMatchesWhole(statObjs, context):
+    first, second = RioChemistry.LineupContextStats(), RioChemistry.LineupContextStats()
+    for x, statObj in enumerate(statObjs):
+        (first if x < len(statObjs) // 2 else second).addGame(statObj)
+    merged = first.merge(second)
+    assert merged.split("chem", "captain") == context.split("chem", "captain")
+    assert merged.split("lineup", batter="Mario") == context.split("lineup", batter="Mario")
+
+
+def test_invalidDimensionRaises(context):
+    with pytest.raises(Exception, match="Invalid split dimension"):
+        context.split("weather")
+    with pytest.raises(Exception, match="at least one dimension"):
+        context.split()
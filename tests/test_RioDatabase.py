@@ -0,0 +1,70 @@
+import sqlite3
+
+import pytest
+
+import RioDatabase
+
+
+def tableContents(db):
+    return {table: sorted(db.query(f"SELECT * FROM {table}"), key=repr) for table in RioDatabase.TABLES}
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = RioDatabase.GameDatabase(str(tmp_path / "rio.sqlite"))
+    yield db
+    db.close()
+
+
+def test_poolMatchesSerial(gameFiles, db, tmp_path):
+    assert db.addFiles(gameFiles, processes=1, batchSize=5) == len(gameFiles)
+    pooled = RioDatabase.GameDatabase(str(tmp_path / "pooled.sqlite"))
+    try:
+        assert pooled.addFiles(gameFiles, processes=2, batchSize=5) == len(gameFiles)
+        assert tableContents(pooled) == tableContents(db)
+    finally:
+        pooled.close()
+
+
+def test_rowsMatchStatObjs(statObjs, db):
+    assert db.addGames(statObjs) == len(statObjs)
+    for statObj in statObjs[:3]:
+        gameID = statObj.gameID()
+        for teamNum in range(0, 2):
+            hits = db.query("SELECT SUM(hits) FROM character_games WHERE game_id = ? AND team = ?", (gameID, teamNum))
+            assert hits[0][0] == statObj.hits(teamNum)
+        events = db.query("SELECT COUNT(*) FROM events WHERE game_id = ?", (gameID,))
+        assert events[0][0] == len(statObj.events())
+        runners = db.query("SELECT COUNT(*) FROM runners WHERE game_id = ?", (gameID,))
+        assert runners[0][0] == sum(key in event for event in statObj.events() for key in RioDatabase.RUNNER_NAMES)
+
+
+def test_gamesAlreadyAddedAreSkipped(gameFiles, statObjs, db):
+    assert db.addGame(statObjs[0])
+    assert not db.addGame(statObjs[0])
+    assert db.addGames(statObjs[:3] + statObjs[:3]) == 2
+    assert db.addFiles(gameFiles, processes=2) == len(gameFiles) - 3
+    assert db.query("SELECT COUNT(*) FROM games")[0][0] == len(gameFiles)
+
+
+def test_reopenedDatabaseKeepsGames(statObjs, tmp_path):
+    path = str(tmp_path / "reopened.sqlite")
+    db = RioDatabase.GameDatabase(path)
+    db.addGames(statObjs[:4])
+    db.close()
+    db = RioDatabase.GameDatabase(path)
+    try:
+        assert db.hasGame(statObjs[3].gameID())
+        assert not db.hasGame(statObjs[4].gameID())
+        assert db.addGames(statObjs[:6]) == 2
+    finally:
+        db.close()
+
+
+def test_wrongSchemaVersionRaises(tmp_path):
+    path = str(tmp_path / "old.sqlite")
+    connection = sqlite3.connect(path)
+    connection.execute("PRAGMA user_version = 99")
+    connection.close()
+    with pytest.raises(Exception, match="has schema version 99"):
+        RioDatabase.GameDatabase(path)
@@ -0,0 +1,79 @@
+import json
+
+import pytest
+
+import RioDedupe
+from syntheticGames import makeGame
+
+
+@pytest.fixture
+def archive(gameFiles, tmp_path):
+    # the synthetic games, a partial copy of game 0, a smaller but complete copy of game 1 and an unreadable file
+    partial = makeGame(0)
+    partial["Events"] = partial["Events"][:10]
+    partial["Date - End"] = ""
+    (tmp_path / "partial0.json").write_text(json.dumps(partial))
+    (tmp_path / "copy1.json").write_text(json.dumps(makeGame(1), separators=(",", ":")))
+    (tmp_path / "broken.json").write_text("{\"GameID\": ")
+    return gameFiles, [str(tmp_path / name) for name in ["partial0.json", "copy1.json", "broken.json"]]
+
+
+def test_headerMatchesFullDecode(gameFiles):
+    with open(gameFiles[0], "rb") as statFile:
+        data = statFile.read()
+    statJson = json.loads(data)
+    assert RioDedupe.readHeader(data) == \
+           {key: value for key, value in statJson.items() if key not in ["Character Game Stats", "Events"]}
+    assert RioDedupe.fileFingerprint(gameFiles[0])["Events"] == len(statJson["Events"])
+
+
+def test_smallReadsMatchWholeFile(gameFiles, monkeypatch):
+    whole = RioDedupe.fileFingerprint(gameFiles[0])
+    monkeypatch.setattr(RioDedupe, "HEADER_READ_BYTES", 16)
+    monkeypatch.setattr(RioDedupe, "READ_CHUNK_BYTES", 7)
+    assert RioDedupe.fileFingerprint(gameFiles[0]) == whole
+
+
+def test_netplayCopiesWithOwnStartDatesAreDuplicates(tmp_path):
+    # both clients of a netplay game upload it, each with the start time of its own clock
+    first = makeGame(3)
+    second = makeGame(3)
+    first["Date - Start"] = "Sat Jul 22 07:26:40 2023"
+    second["Date - Start"] = "Sat Jul 22 07:26:41 2023"
+    paths = [str(tmp_path / "client0.json"), str(tmp_path / "client1.json")]
+    for path, statJson in zip(paths, [first, second]):
+        with open(path, "w") as statFile:
+            json.dump(statJson, statFile)
+    groups = RioDedupe.findDuplicates(paths, processes=1)
+    assert [sorted(fingerprint["Path"] for fingerprint in group) for group in groups.values()] == [paths]
+
+
+def test_keepsMostCompleteCopy(archive):
+    gameFiles, extras = archive
+    keep, duplicates = RioDedupe.dedupe(gameFiles + extras, processes=1)
+    assert keep == sorted(gameFiles + [extras[2]])
+    assert duplicates == sorted(extras[:2])
+
+
+def test_poolMatchesSerial(archive):
+    paths = archive[0] + archive[1]
+    assert RioDedupe.fingerprintFiles(paths, processes=2) == RioDedupe.fingerprintFiles(paths, processes=1)
+    assert RioDedupe.dedupe(paths, processes=2) == RioDedupe.dedupe(paths, processes=1)
+
+
+def test_findDuplicatesGroupsCopies(archive):
+    gameFiles, extras = archive
+    groups = RioDedupe.findDuplicates(gameFiles + extras, processes=1)
+    assert sorted(sorted(fingerprint["Path"] for fingerprint in group) for group in groups.values()) == \
+           sorted([sorted([gameFiles[0], extras[0]]), sorted([gameFiles[1], extras[1]])])
+
+
+def test_unreadableFileIsReportedNotRaised(archive):
+    fingerprint = RioDedupe.fileFingerprint(archive[1][2])
+    assert set(fingerprint) == {"Path", "Error"}
+
+
+def test_moveDuplicate(archive, tmp_path):
+    destination = RioDedupe.moveDuplicate(archive[1][0], str(tmp_path / "duplicates"))
+    assert destination == str(tmp_path / "duplicates" / "partial0.json")
+    assert not (tmp_path / "partial0.json").exists()
@@ -0,0 +1,74 @@
+import pytest
+
+import RioFatigue
+import RioStatLib
+
+
+def fatigueOf(statObjs):
+    fatigue = RioFatigue.FatigueStats()
+    for statObj in statObjs:
+        fatigue.addGame(statObj)
+    return fatigue
+
+
+def byGame(appearances):
+    return sorted(appearances, key=lambda appearance: (appearance["Game ID"], appearance["Team"], appearance["Pitcher"]))
+
+
+def assertSameCurve(curve, other):
+    assert curve.keys() == other.keys()
+    for bucket, line in curve.items():
+        assert line == pytest.approx(other[bucket])
+
+
+def test_poolMatchesSerial(gameFiles):
+    serial = RioFatigue.buildFatigue(gameFiles, processes=1)
+    pooled = RioFatigue.buildFatigue(gameFiles, processes=2, shardCount=5)
+    assert len(pooled) == len(serial) == len(gameFiles)
+    assert byGame(pooled.appearances()) == byGame(serial.appearances())
+    assertSameCurve(pooled.curve(bucketSize=5), serial.curve(bucketSize=5))
+    assert pooled.correlations() == pytest.approx(serial.correlations())
+
+
+def test_overlappingMergeMatchesUnion(statObjs):
+    whole = fatigueOf(statObjs)
+    merged = fatigueOf(statObjs[:15]).merge(fatigueOf(statObjs[10:]))
+    assert len(merged) == len(whole)
+    assert merged.gameIDs == whole.gameIDs
+    assert merged.appearances() == whole.appearances()
+    assert merged.curve() == whole.curve()
+
+
+def test_trajectoryMatchesEvents(statObjs):
+    statObj = statObjs[0]
+    fatigue = fatigueOf([statObj])
+    appearance = fatigue.appearances()[0]
+    trajectory = fatigue.trajectory(statObj.gameID(), appearance["Pitcher"], team=appearance["Team"])
+    assert len(trajectory) == appearance["Events"]
+    assert trajectory[0]["Pitcher Stamina"] == appearance["Start Stamina"]
+    assert trajectory[-1]["Pitcher Stamina"] == appearance["End Stamina"]
+    stamina = {event["Event Num"]: event["Pitcher Stamina"] for event in statObj.events()}
+    assert all(point["Pitcher Stamina"] == stamina[point["Event Num"]] for point in trajectory)
+
+
+def test_curveCountsEveryPitch(statObjs):
+    fatigue = fatigueOf(statObjs)
+    pitches = sum("Pitch" in event for statObj in statObjs for event in statObj.events())
+    assert sum(line["Pitches"] for line in fatigue.curve(bucketSize=3).values()) == pitches
+    assert fatigue.correlations()["Pitches"] == pitches
+    perPitcher = fatigue.pitcherCorrelations()
+    assert sum(line["Pitches"] for line in perPitcher.values()) == pitches
+
+
+def test_gameAddedOnce(statObjs):
+    fatigue = fatigueOf(statObjs[:2])
+    assert not fatigue.addGame(RioStatLib.StatObj(statObjs[0].statJson))
+    assert len(fatigue) == 2
+
+
+def test_errorPaths(statObjs):
+    fatigue = fatigueOf(statObjs[:2])
+    with pytest.raises(Exception, match="Invalid bucketSize 0"):
+        fatigue.curve(bucketSize=0)
+    with pytest.raises(Exception, match="Invalid gameID"):
+        fatigue.trajectory(statObjs[5].gameID(), "Mario")
@@ -0,0 +1,59 @@
+import pytest
+
+import RioFielding
+
+
+@pytest.fixture
+def fielding(statObjs):
+    fielding = RioFielding.FieldingStats()
+    for statObj in statObjs:
+        fielding.addGame(statObj)
+    return fielding
+
+
+def gridTotal(grid):
+    return sum(sum(row) for row in grid)
+
+
+def test_heatmapCountsEveryBallInPlay(fielding):
+    counts = fielding.heatmap()
+    assert len(counts["Chances"]) == fielding.rows
+    assert gridTotal(counts["Chances"]) == len(fielding.contacts.column("Outs On Play"))
+    assert gridTotal(counts["Outs"]) <= gridTotal(counts["Chances"])
+
+
+def test_positionHeatmapsMatchOutConversion(fielding):
+    byPosition = fielding.outConversion("position")
+    for position, line in byPosition.items():
+        counts = fielding.heatmap("position", position.lower())
+        assert gridTotal(counts["Chances"]) == line["Chances"]
+        assert gridTotal(counts["Outs"]) == line["Outs"]
+    assert sum(line["Chances"] for line in byPosition.values()) == \
+           sum(line["Chances"] for line in fielding.outConversion("character").values())
+
+
+def test_mergeOfHalvesMatchesWhole(statObjs, fielding):
+    first, second = RioFielding.FieldingStats(), RioFielding.FieldingStats()
+    for x, statObj in enumerate(statObjs):
+        (first if x < len(statObjs) // 2 else second).addGame(statObj)
+    merged = first.merge(second)
+    assert merged.outConversion("character") == fielding.outConversion("character")
+    assert merged.heatmap() == fielding.heatmap()
+
+
+def test_rateGridHasNoneForEmptyCells(fielding):
+    counts = fielding.heatmap()
+    rates = fielding.outConversionRateGrid()
+    for chanceRow, rateRow in zip(counts["Chances"], rates):
+        for chances, rate in zip(chanceRow, rateRow):
+            assert (rate is None) == (chances == 0)
+
+
+def test_invalidGroupByRaises(fielding):
+    with pytest.raises(Exception, match="Invalid groupBy"):
+        fielding.outConversion("team")
+
+
+def test_missingKeyRaises(fielding):
+    with pytest.raises(Exception, match="Invalid key None"):
+        fielding.heatmap("position")
@@ -0,0 +1,51 @@
+import RioGameCache
+
+
+def test_hitReturnsSameStatObj(gameFiles, statObjs):
+    cache = RioGameCache.GameCache()
+    first = cache.load(gameFiles[0])
+    assert cache.load(gameFiles[0]) is first
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cache.getByGameID(first.gameID()) is first
+    assert first.statJson == statObjs[0].statJson
+
+
+def test_evictsLeastRecentlyUsed(gameFiles, statObjs):
+    cache = RioGameCache.GameCache(maxGames=2)
+    first = cache.load(gameFiles[0])
+    cache.load(gameFiles[1])
+    cache.load(gameFiles[0])
+    cache.load(gameFiles[2])
+    assert len(cache) == 2
+    assert cache.getByGameID(first.gameID()) is first
+    assert cache.getByGameID(statObjs[1].gameID()) is None
+
+
+def test_maxBytesKeepsNewestGame(gameFiles):
+    cache = RioGameCache.GameCache(maxGames=None, maxBytes=1)
+    for path in gameFiles[:3]:
+        cache.load(path)
+    assert len(cache) == 1
+    assert cache.sizeBytes() > 1
+
+
+def test_spilledGameLoadsWithoutRebuilding(gameFiles, tmp_path):
+    cache = RioGameCache.GameCache(maxGames=1, spillDir=str(tmp_path / "spill"))
+    first = cache.load(gameFiles[0])
+    cache.load(gameFiles[1])
+    spilled = cache.load(gameFiles[0])
+    assert cache.spillHits == 1 and cache.misses == 2
+    assert spilled.statJson == first.statJson
+    cache.clearSpill()
+    assert not list((tmp_path / "spill").iterdir())
+
+
+def test_removeAndClear(gameFiles, statObjs):
+    cache = RioGameCache.GameCache()
+    key = cache.put(statObjs[0], "digest", 10)
+    assert key in cache and cache.sizeBytes() == 10
+    cache.remove(key)
+    assert cache.get(key) is None and cache.sizeBytes() == 0
+    cache.load(gameFiles[1])
+    cache.clear()
+    assert len(cache) == 0 and cache.keys() == []
@@ -0,0 +1,51 @@
+import pytest
+
+import RioGameIndex
+import RioNetplay
+
+
+@pytest.fixture
+def index(gameFiles):
+    return RioGameIndex.GameIndex().addFiles(gameFiles, processes=1)
+
+
+def test_poolMatchesSerial(gameFiles, index):
+    pooled = RioGameIndex.GameIndex().addFiles(gameFiles, processes=2)
+    assert [pooled.record(x) for x in range(len(pooled))] == [index.record(x) for x in range(len(index))]
+
+
+def test_recordMatchesStatObj(gameFiles, statObjs, index):
+    statObj = statObjs[4]
+    record = index.record(4)
+    assert record["GameID"] == statObj.gameID()
+    assert record["Start"] == statObj.startTimestamp()
+    assert record["Strikeouts"] == sum(event["Result of AB"] == "Strikeout" for event in statObj.events())
+    assert record["Path"] == gameFiles[4]
+
+
+def test_saveLoadRoundTrip(index, tmp_path):
+    index.save(str(tmp_path / "games.index.json"))
+    loaded = RioGameIndex.GameIndex.load(str(tmp_path / "games.index.json"))
+    assert loaded.columns == index.columns
+
+
+def test_extendOfHalvesMatchesWhole(gameFiles, index):
+    merged = RioGameIndex.GameIndex().addFiles(gameFiles[:10], processes=1)
+    merged.extend(RioGameIndex.GameIndex().addFiles(gameFiles[10:], processes=1))
+    assert merged.columns == index.columns
+    assert index.select([3, 1]).column("GameID").tolist() == [index.column("GameID")[3], index.column("GameID")[1]]
+
+
+def test_reportsCountEveryGame(index):
+    byPlayer = RioNetplay.playerReport(index)
+    players = set(index.column("Away Player")) | set(index.column("Home Player"))
+    assert set(byPlayer) == players
+    assert sum(report["Games"] for report in RioNetplay.pingBucketReport(index, bucketSize=50).values()) == len(index)
+    assert sum(report["Games"] for report in RioNetplay.windowReport(index, windowDays=1).values()) == len(index)
+    pings = index.column("Average Ping")
+    assert max(report["Max Ping"] for report in byPlayer.values()) == max(pings)
+
+
+def test_invalidColumnRaises(index):
+    with pytest.raises(Exception, match="Invalid column"):
+        index.column("Weather")
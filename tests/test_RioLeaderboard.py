@@ -0,0 +1,86 @@
+import pytest
+
+import RioLeaderboard
+import RioStatLib
+from syntheticGames import flipVersion, makeGame
+
+
+def test_ratesMatchStatObjForOneGame(statObjs):
+    statObj = statObjs[0]
+    board = RioLeaderboard.Leaderboard("player").addGame(statObj)
+    line = board.statLine(statObj.player(0))
+    assert line.ops() == pytest.approx(statObj.ops(0))
+    assert line.offense["hits"] == statObj.hits(0)
+
+
+def test_gamesCountOncePerKeyPerGame(statObjs):
+    players, characters = {}, {}
+    for statObj in statObjs:
+        for player in {statObj.player(0), statObj.player(1)}:
+            players[player] = players.get(player, 0) + 1
+        for characterStats in statObj.characterGameStats().values():
+            characters[characterStats["CharID"]] = characters.get(characterStats["CharID"], 0) + 1
+    for groupBy, expected in [("player", players), ("character", characters)]:
+        board = RioLeaderboard.Leaderboard(groupBy)
+        for statObj in statObjs:
+            board.addGame(statObj)
+        assert {key: line.games for key, line in board.lines.items()} == expected
+        assert sorted(key for key, _ in board.top("games", n=len(expected), minimum=("games", 4))) == \
+               sorted(key for key, games in expected.items() if games >= 4)
+
+
+def test_poolMatchesSerial(gameFiles):
+    serial = RioLeaderboard.buildLeaderboard(gameFiles, "playerCharacter", processes=1)
+    pooled = RioLeaderboard.buildLeaderboard(gameFiles, "playerCharacter", processes=2, shardCount=5)
+    assert pooled.gamesAdded == serial.gamesAdded == len(gameFiles)
+    assert set(pooled.lines) == set(serial.lines)
+    for key, line in serial.lines.items():
+        assert pooled.lines[key].offense == line.offense
+        assert pooled.lines[key].defense == line.defense
+
+
+def test_mergeOfHalvesMatchesWhole(statObjs):
+    whole = RioLeaderboard.Leaderboard()
+    first, second = RioLeaderboard.Leaderboard(), RioLeaderboard.Leaderboard()
+    for x, statObj in enumerate(statObjs):
+        whole.addGame(statObj)
+        (first if x % 2 else second).addGame(statObj)
+    merged = RioLeaderboard.reduceLeaderboards([first, second])
+    assert {key: line.offense for key, line in merged.lines.items()} == \
+           {key: line.offense for key, line in whole.lines.items()}
+
+
+def test_topSkipsZeroDenominators():
+    board = RioLeaderboard.Leaderboard()
+    board.lines["No At Bats"] = RioLeaderboard.StatLine()
+    walksOnly = board.lines["Walks Only"] = RioLeaderboard.StatLine()
+    walksOnly.offense["atBats"] = walksOnly.offense["walksBallFour"] = 3
+    hitter = board.lines["Hitter"] = RioLeaderboard.StatLine()
+    hitter.offense["atBats"] = 4
+    hitter.offense["hits"] = hitter.offense["singles"] = 2
+    assert board.top("slg", minimum=("battingAvg", 0.0)) == [("Hitter", 0.5)]
+
+
+def test_lowerIsBetterByStatKind():
+    assert RioLeaderboard.lowerIsBetter("strikeouts")
+    assert not RioLeaderboard.lowerIsBetter("strikeoutsPitched")
+    assert RioLeaderboard.lowerIsBetter("era")
+    assert not RioLeaderboard.lowerIsBetter("ops")
+
+
+def test_playerKeysFollowFlippedVersions():
+    statJson = makeGame(3)
+    board = RioLeaderboard.Leaderboard("player").addGame(RioStatLib.StatObj(statJson))
+    flippedBoard = RioLeaderboard.Leaderboard("player").addGame(RioStatLib.StatObj(flipVersion(statJson)))
+    assert {key: line.offense for key, line in board.lines.items()} == \
+           {key: line.offense for key, line in flippedBoard.lines.items()}
+
+
+def test_invalidGroupByRaises():
+    with pytest.raises(Exception, match="Invalid groupBy"):
+        RioLeaderboard.Leaderboard("team")
+
+
+def test_mergeOfDifferentGroupByRaises():
+    with pytest.raises(Exception, match="Cannot merge"):
+        RioLeaderboard.Leaderboard("player").merge(RioLeaderboard.Leaderboard("character"))
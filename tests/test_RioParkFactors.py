@@ -0,0 +1,70 @@
+import RioGameIndex
+import RioParkFactors
+
+
+def parksOf(statObjs):
+    parks = RioParkFactors.ParkFactors()
+    for statObj in statObjs:
+        parks.addGame(statObj)
+    return parks
+
+
+def test_totalsMatchGames(statObjs):
+    parks = parksOf(statObjs)
+    factors = parks.factors()
+    assert sum(line["Games"] for line in factors.values()) == len(statObjs)
+    assert sum(line["Runs"] for line in factors.values()) == \
+           sum(s.statJson["Away Score"] + s.statJson["Home Score"] for s in statObjs)
+    assert not parks.addGame(statObjs[0])
+
+
+def test_overlappingMergeMatchesUnion(statObjs):
+    whole = parksOf(statObjs)
+    merged = parksOf(statObjs[:15]).merge(parksOf(statObjs[8:]))
+    assert merged.totals == whole.totals
+    assert merged.games == whole.games
+    assert merged.landingSummary() == whole.landingSummary()
+    assert merged.stadiums == whole.stadiums
+
+
+def test_indexMatchesGames(gameFiles, statObjs):
+    fromIndex = RioParkFactors.ParkFactors()
+    index = RioGameIndex.GameIndex().addFiles(gameFiles, processes=1)
+    assert fromIndex.addIndex(index) == len(gameFiles)
+    assert fromIndex.addIndex(index) == 0
+    assert fromIndex.totals == parksOf(statObjs).totals
+    assert fromIndex.landingSummary() == {}
+
+
+def test_mergeTakesBallsInPlayOfIndexedGames(gameFiles, statObjs):
+    parks = RioParkFactors.ParkFactors()
+    parks.addIndex(RioGameIndex.GameIndex().addFiles(gameFiles, processes=1))
+    whole = parksOf(statObjs)
+    parks.merge(whole)
+    assert parks.totals == whole.totals
+    assert parks.landingSummary() == whole.landingSummary()
+
+
+def test_addGameAfterIndexAddsBallsInPlayOnce(gameFiles, statObjs):
+    parks = RioParkFactors.ParkFactors()
+    parks.addIndex(RioGameIndex.GameIndex().addFiles(gameFiles, processes=1))
+    assert all(parks.addGame(statObj) for statObj in statObjs)
+    assert not parks.addGame(statObjs[0])
+    whole = parksOf(statObjs)
+    assert parks.totals == whole.totals
+    assert parks.landingSummary() == whole.landingSummary()
+    assert parks.stadiums == whole.stadiums
+
+
+def test_landingMatchesSummary(statObjs):
+    parks = parksOf(statObjs)
+    for stadium, summary in parks.landingSummary().items():
+        landing = parks.landing(stadium)
+        assert len(landing["Landing X"]) == summary["Balls In Play"]
+        assert landing["Result of AB"].count("HR") == round(summary["Home Runs Per Ball In Play"] * summary["Balls In Play"])
+
+
+def test_minGamesFiltersStadiums(statObjs):
+    parks = parksOf(statObjs)
+    assert parks.factors(minGames=len(statObjs) + 1) == {}
+    assert RioParkFactors.ParkFactors().factors() == {}
@@ -0,0 +1,55 @@
+import pytest
+
+import RioRatings
+from syntheticGames import flipVersion
+
+
+@pytest.mark.parametrize("system", RioRatings.SYSTEMS)
+def test_statJsonsMatchStatObjs(system, statJsons, statObjs):
+    fromStatObjs = RioRatings.RatingEngine(system, rankedOnly=False)
+    for statObj in statObjs:
+        fromStatObjs.addGame(statObj)
+    fromStatJsons = RioRatings.RatingEngine(system, rankedOnly=False)
+    assert fromStatJsons.addStatJsons(statJsons) == len(statJsons)
+    assert fromStatJsons.toDict() == fromStatObjs.toDict()
+
+
+def test_glickoUsesGameStartTimestamps(statObjs):
+    engine = RioRatings.RatingEngine("glicko", rankedOnly=False)
+    for statObj in statObjs:
+        engine.addGame(statObj)
+    lastStart = {}
+    for statObj in statObjs:
+        lastStart[statObj.player(0)] = lastStart[statObj.player(1)] = statObj.startTimestamp()
+    for player, timestamp in lastStart.items():
+        assert engine.lastPlayed[engine.playerIds[player]] == timestamp
+
+
+def test_savedStateContinuesLikeOneReplay(statJsons, tmp_path):
+    whole = RioRatings.RatingEngine("glicko", rankedOnly=False)
+    whole.addStatJsons(statJsons)
+    first = RioRatings.RatingEngine("glicko", rankedOnly=False)
+    first.addStatJsons(statJsons[:10])
+    first.save(str(tmp_path / "ratings.json"))
+    resumed = RioRatings.RatingEngine.load(str(tmp_path / "ratings.json"))
+    assert resumed.addStatJsons(statJsons) == len(statJsons) - 10
+    assert resumed.toDict() == whole.toDict()
+
+
+def test_rankedOnlySkipsUnranked(statJsons):
+    engine = RioRatings.RatingEngine("elo")
+    applied = engine.addStatJsons(statJsons)
+    assert applied == sum(statJson["Ranked"] == 1 for statJson in statJsons)
+
+
+def test_flippedVersionHasSameResult(statJsons):
+    statJson = statJsons[0]
+    _, _, away, home, outcome = RioRatings.gameResult(statJson)
+    _, _, flippedAway, flippedHome, flippedOutcome = RioRatings.gameResult(flipVersion(statJson))
+    assert (flippedAway, flippedHome) == (home, away)
+    assert flippedOutcome == 1.0 - outcome
+
+
+def test_invalidSystemRaises():
+    with pytest.raises(Exception, match="Invalid rating system"):
+        RioRatings.RatingEngine("trueskill")
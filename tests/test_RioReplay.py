@@ -0,0 +1,63 @@
+import pytest
+
+import RioReplay
+import RioStatLib
+from syntheticGames import flipVersion, makeGame
+
+
+@pytest.fixture
+def model(statObjs):
+    model = RioReplay.TransitionModel()
+    for statObj in statObjs:
+        model.addGame(statObj)
+    return model
+
+
+def test_stateAfterIsNextStateBefore(statObjs):
+    statObj = statObjs[0]
+    replay = RioReplay.GameReplay(statObj)
+    eventNums = [event["Event Num"] for event in statObj.events()]
+    for eventNum, nextEventNum in zip(eventNums, eventNums[1:]):
+        assert replay.stateAfter(eventNum) == replay.stateBefore(nextEventNum)
+    last = replay.stateAfter(eventNums[-1])
+    assert (last["Away Score"], last["Home Score"]) == (statObj.statJson["Away Score"], statObj.statJson["Home Score"])
+
+
+def test_flippedVersionHasSameReplay():
+    statJson = makeGame(7)
+    replay = RioReplay.GameReplay(RioStatLib.StatObj(statJson))
+    flippedReplay = RioReplay.GameReplay(RioStatLib.StatObj(flipVersion(statJson)))
+    assert flippedReplay.state == replay.state
+    assert flippedReplay.deltas == replay.deltas
+    assert flippedReplay.finalScore == replay.finalScore
+
+
+def test_mergeOfHalvesMatchesWhole(statObjs, model):
+    first, second = RioReplay.TransitionModel(), RioReplay.TransitionModel()
+    for x, statObj in enumerate(statObjs):
+        (first if x % 2 else second).addGame(statObj)
+    assert first.merge(second).transitions == model.transitions
+
+
+def test_probabilitiesAddUpToOne(model):
+    for before in model.transitions:
+        assert sum(model.probabilities(before).values()) == pytest.approx(1.0)
+
+
+def test_simulateIsSeeded(statObjs, model):
+    replay = RioReplay.GameReplay(statObjs[1])
+    first = replay.simulate(10, model, trials=200, seed=3)
+    assert first == replay.simulate(10, model, trials=200, seed=3)
+    assert first["Away Win"] + first["Home Win"] + first["Tie"] == pytest.approx(1.0)
+    assert sum(first["Final Scores"].values()) == 200
+
+
+def test_invalidTrialsRaises(statObjs, model):
+    replay = RioReplay.GameReplay(statObjs[1])
+    with pytest.raises(Exception, match="Invalid trials 0"):
+        replay.simulate(0, model, trials=0)
+
+
+def test_invalidEventNumRaises(statObjs):
+    with pytest.raises(Exception, match="Invalid event num"):
+        RioReplay.GameReplay(statObjs[1]).stateBefore(-1)
@@ -0,0 +1,56 @@
+import pytest
+
+import RioLeaderboard
+import RioRolling
+import RioStatLib
+from syntheticGames import makeGame
+
+
+def boardOf(statObjs, groupBy):
+    board = RioLeaderboard.Leaderboard(groupBy)
+    for statObj in statObjs:
+        board.addGame(statObj)
+    return board
+
+
+def test_gamesWindowMatchesLastGames(statObjs):
+    rolling = RioRolling.RollingStats("player", games=3)
+    for statObj in statObjs:
+        rolling.addGame(statObj)
+    for player in rolling.keys():
+        lastGames = [s for s in statObjs if player in (s.player(0), s.player(1))][-3:]
+        expected = boardOf(lastGames, "player").statLine(player)
+        assert rolling.line(player).offense == expected.offense
+        assert rolling.line(player).defense == expected.defense
+
+
+def test_daysWindowMatchesRecentGames(statObjs):
+    rolling = RioRolling.RollingStats("character", days=0.25)
+    for statObj in statObjs:
+        rolling.addGame(statObj)
+    cutoff = statObjs[-1].startTimestamp() - 0.25 * RioRolling.DAY_SECONDS
+    expected = boardOf([s for s in statObjs if s.startTimestamp() >= cutoff], "character")
+    assert {key: line.offense for key, line in rolling.board.lines.items()} == \
+           {key: line.offense for key, line in expected.lines.items()}
+
+
+def test_advanceEmptiesOldWindows(statObjs):
+    rolling = RioRolling.RollingStats("character", games=5, days=1)
+    for statObj in statObjs[:4]:
+        rolling.addGame(statObj)
+    rolling.advance(statObjs[3].startTimestamp() + 2 * RioRolling.DAY_SECONDS)
+    assert rolling.keys() == []
+    assert rolling.line("Mario").offense["atBats"] == 0
+
+
+def test_errorPaths(statObjs):
+    with pytest.raises(Exception, match="needs a window"):
+        RioRolling.RollingStats("character")
+    rolling = RioRolling.RollingStats("character", games=5)
+    rolling.addGame(statObjs[1])
+    with pytest.raises(Exception, match="date order"):
+        rolling.addGame(statObjs[0])
+    statJson = makeGame(40)
+    statJson["Date - Start"] = "never"
+    with pytest.raises(Exception, match="no readable start date"):
+        rolling.addGame(RioStatLib.StatObj(statJson))
@@ -0,0 +1,66 @@
+import pytest
+
+import RioRosters
+import RioStatLib
+from syntheticGames import flipVersion, makeGame
+
+
+def rostersOf(statObjs):
+    rosters = RioRosters.RosterStats()
+    for statObj in statObjs:
+        rosters.addGame(statObj)
+    return rosters
+
+
+def labelled(rosters, by, size=2):
+    # counts keyed by CharIDs so stats with different character ids compare
+    return {(rosters.characters.values[key] if by == "captain" else tuple(sorted(rosters.names(key)))): entry
+            for key, entry in rosters.counts(by, size).items()}
+
+
+def test_everyTeamIsCounted(statObjs):
+    rosters = rostersOf(statObjs)
+    assert len(rosters) == 2 * len(statObjs)
+    assert sum(games for games, _ in rosters.counts("roster").values()) == len(rosters)
+    assert sum(wins for _, wins in rosters.counts("roster").values()) == len(statObjs)
+    assert not rosters.addGame(statObjs[0])
+
+
+def test_overlappingMergeMatchesUnion(statObjs):
+    whole = rostersOf(statObjs)
+    merged = rostersOf(statObjs[12:]).merge(rostersOf(statObjs[:16]))
+    assert len(merged) == len(whole)
+    assert sorted(merged.games) == sorted(whole.games)
+    for by in RioRosters.BY_OPTIONS:
+        assert labelled(merged, by) == labelled(whole, by)
+    assert merged.comboStats(("Mario", "Luigi")) == whole.comboStats(("Mario", "Luigi"))
+
+
+def test_teamsWithoutCaptainAreSkipped():
+    statJson = makeGame(11)
+    for character in statJson["Character Game Stats"].values():
+        character["Captain"] = 0
+    rosters = rostersOf([RioStatLib.StatObj(statJson)])
+    assert list(rosters.captains) == [RioRosters.NO_CAPTAIN] * 2
+    assert rosters.counts("captain") == {}
+    assert rostersOf([RioStatLib.StatObj(makeGame(11))]).merge(rosters).counts("captain") != {}
+
+
+def test_flippedVersionHasSameOutcomes():
+    statJson = makeGame(12)
+    rosters = rostersOf([RioStatLib.StatObj(statJson)])
+    flipped = rostersOf([RioStatLib.StatObj(flipVersion(statJson))])
+    assert sorted(zip(rosters.players, rosters.outcomes)) == sorted(zip(flipped.players, flipped.outcomes))
+    assert labelled(flipped, "captain") == labelled(rosters, "captain")
+
+
+def test_topSortsByWinRate(statObjs):
+    top = rostersOf(statObjs).top(size=1, n=5)
+    assert len(top) == 5
+    assert [winRate for _, _, winRate in top] == sorted((winRate for _, _, winRate in top), reverse=True)
+    assert rostersOf(statObjs).comboStats(("Nobody",)) == {"Games": 0, "Wins": 0, "Win Rate": None}
+
+
+def test_invalidByRaises(statObjs):
+    with pytest.raises(Exception, match="Invalid by arg"):
+        rostersOf(statObjs[:2]).counts("stadium")
@@ -0,0 +1,113 @@
+import pytest
+
+import RioColumns
+import RioSharedGames
+import RioStatLib
+
+
+def homeTeamOPS(statObj):
+    return statObj.ops(1)
+
+
+def starPitches(events, rows):
+    starPitch = events.column("Star Pitch")
+    return sum(starPitch[x] for x in rows)
+
+
+@pytest.fixture
+def gameStore(gameFiles):
+    store = RioSharedGames.SharedGameStore.fromPaths(gameFiles)
+    yield store
+    store.close()
+    store.unlink()
+
+
+@pytest.fixture
+def eventColumns(statObjs):
+    events = RioColumns.EventColumns()
+    for statObj in statObjs:
+        events.addGame(statObj)
+    return events
+
+
+def test_poolMatchesSerial(gameStore, statObjs):
+    assert RioSharedGames.mapGames(homeTeamOPS, gameStore, processes=2) == [s.ops(1) for s in statObjs]
+
+
+@pytest.mark.parametrize("parser", list(RioStatLib.JSON_PARSERS))
+def test_viewIsReadOnly(gameStore, parser, monkeypatch):
+    monkeypatch.setattr(RioStatLib, "jsonParser", parser)
+    statObj = gameStore.statObj(0)
+    assert isinstance(statObj.statJson["Events"], tuple)
+    with pytest.raises(TypeError):
+        statObj.statJson["Away Score"] = 99
+    with pytest.raises(TypeError):
+        statObj.statJson["Events"][0]["Inning"] = 99
+
+
+def test_closeWithBytesAliveAndTwice(gameStore):
+    gameBytes = gameStore.gameBytes(0)
+    gameStore.close()
+    gameStore.close()
+    assert gameBytes.startswith(b"{")
+    with pytest.raises(Exception, match="is closed"):
+        gameStore.statJson(0)
+
+
+def test_invalidIndexRaises(gameStore):
+    with pytest.raises(Exception, match="Invalid game index"):
+        gameStore.statObj(len(gameStore))
+
+
+def test_storeFileMatchesPaths(gameFiles, statObjs, tmp_path):
+    path = RioSharedGames.writeStoreFile(str(tmp_path / "games.riog"), gameFiles)
+    store = RioSharedGames.SharedGameStore.openFile(path)
+    try:
+        assert len(store) == len(gameFiles)
+        assert store.statObj(3).gameID() == statObjs[3].gameID()
+    finally:
+        store.close()
+
+
+def test_columnStoreMatchesColumnSet(eventColumns):
+    store = RioSharedGames.SharedColumnStore.fromColumnSet(eventColumns)
+    try:
+        shared = store.columnSet
+        assert type(shared) is RioColumns.EventColumns
+        assert shared.gameIDs == eventColumns.gameIDs
+        for name, _ in eventColumns.SCHEMA:
+            assert list(shared.column(name)) == list(eventColumns.column(name))
+        assert shared.codebook("Batter").values == eventColumns.codebook("Batter").values
+        with pytest.raises(TypeError):
+            shared.column("Outs")[0] = 1
+    finally:
+        store.close()
+        store.close()
+        store.unlink()
+
+
+def test_mapColumnsMatchesSerial(eventColumns):
+    store = RioSharedGames.SharedColumnStore.fromColumnSet(eventColumns)
+    try:
+        results = RioSharedGames.mapColumns(starPitches, store, processes=2, shardCount=5)
+        assert len(results) == 5
+        assert sum(results) == sum(eventColumns.column("Star Pitch"))
+    finally:
+        store.close()
+        store.unlink()
+
+
+def test_columnFileRoundTrip(eventColumns, tmp_path):
+    path = RioSharedGames.writeColumnFile(str(tmp_path / "events.rioc"), eventColumns)
+    store = RioSharedGames.SharedColumnStore.openFile(path)
+    try:
+        assert list(store.columnSet.column("Pitch Speed")) == list(eventColumns.column("Pitch Speed"))
+    finally:
+        store.close()
+
+
+def test_wrongMagicRaises(tmp_path):
+    path = tmp_path / "bad.rioc"
+    path.write_bytes(b"XXXX" + bytes(12))
+    with pytest.raises(Exception, match="Invalid shared column store"):
+        RioSharedGames.SharedColumnStore.openFile(str(path))
@@ -0,0 +1,92 @@
+import random
+
+import pytest
+
+import RioLeaderboard
+import RioSketches
+
+
+def assertSameSketch(sketch, other):
+    assert (sketch.positive, sketch.negative, sketch.zeros, sketch.count, sketch.min, sketch.max) == \
+           (other.positive, other.negative, other.zeros, other.count, other.min, other.max)
+    assert sketch.total == pytest.approx(other.total)
+
+
+def test_quantilesWithinRelativeAccuracy():
+    rng = random.Random(4)
+    values = sorted(rng.uniform(-50, 400) for _ in range(5000))
+    sketch = RioSketches.QuantileSketch(0.01)
+    for value in values:
+        sketch.add(value)
+    for q in [0.01, 0.1, 0.5, 0.9, 0.99]:
+        exact = values[int(q * (len(values) - 1))]
+        assert abs(sketch.quantile(q) - exact) <= 0.01 * abs(exact) + 1e-9
+    assert sketch.quantile(0) == pytest.approx(values[0], rel=0.01)
+    assert sketch.quantile(1) == pytest.approx(values[-1], rel=0.01)
+    assert sketch.rank(values[-1]) == 1.0 and sketch.rank(values[0] - 1) == 0.0
+    assert sketch.mean() == pytest.approx(sum(values) / len(values))
+
+
+def test_mergeMatchesOneSketch():
+    rng = random.Random(5)
+    values = [rng.choice([0, rng.expovariate(0.01), -rng.expovariate(0.1)]) for _ in range(2000)]
+    whole = RioSketches.QuantileSketch()
+    first, second = RioSketches.QuantileSketch(), RioSketches.QuantileSketch()
+    for x, value in enumerate(values):
+        whole.add(value)
+        (first if x % 3 else second).add(value)
+    assertSameSketch(first.merge(second), whole)
+
+
+def test_collapseKeepsCount():
+    sketch = RioSketches.QuantileSketch(0.01, maxBuckets=10)
+    for x in range(1, 1000):
+        sketch.add(float(x))
+    assert len(sketch.positive) == 10
+    assert sketch.count == 999
+    assert sketch.quantile(1) == 999.0
+
+
+def test_poolMatchesSerial(gameFiles, tmp_path):
+    serial = RioSketches.buildSketches(gameFiles, processes=1)
+    pooled = RioSketches.buildSketches(gameFiles, processes=2, shardCount=5)
+    assert pooled.games == serial.games == len(gameFiles)
+    for field in RioSketches.FIELDS:
+        assertSameSketch(pooled.sketch(field), serial.sketch(field))
+    assert set(pooled.characterSketches) == set(serial.characterSketches)
+    for key, sketch in serial.characterSketches.items():
+        assertSameSketch(pooled.characterSketches[key], sketch)
+
+    serial.save(str(tmp_path / "sketches.json"))
+    loaded = RioSketches.CorpusSketches.load(str(tmp_path / "sketches.json"))
+    assert loaded.summary("Pitch Speed") == serial.summary("Pitch Speed")
+
+
+def test_pitchSpeedsCountEveryPitch(statObjs):
+    sketches = RioSketches.CorpusSketches()
+    for statObj in statObjs:
+        sketches.addGame(statObj)
+    pitches = [event["Pitch"]["Pitch Speed"] for statObj in statObjs for event in statObj.events() if "Pitch" in event]
+    assert sketches.sketch("Pitch Speed").count == len(pitches)
+    assert sketches.percentile("Pitch Speed", max(pitches)) == 100
+    assert sketches.sketch("Pitch Speed", character="Nobody").count == 0
+
+
+def test_opsCountsEachCharacterOncePerGame(statObjs):
+    sketches = RioSketches.CorpusSketches()
+    for statObj in statObjs:
+        sketches.addGame(statObj)
+    lines = [line for statObj in statObjs for line in RioLeaderboard.gameLines(statObj, "character").values()]
+    assert sketches.sketch("OPS").count == sum(line.offense["atBats"] > line.walks() for line in lines)
+    assert sketches.sketch("ERA").count == sum(line.defense["outsPitched"] > 0 for line in lines)
+
+
+def test_errorPaths():
+    with pytest.raises(Exception, match="Invalid relativeAccuracy"):
+        RioSketches.QuantileSketch(1.5)
+    with pytest.raises(Exception, match="Invalid quantile"):
+        RioSketches.QuantileSketch().quantile(2)
+    with pytest.raises(Exception, match="Can not merge"):
+        RioSketches.QuantileSketch(0.01).merge(RioSketches.QuantileSketch(0.02))
+    with pytest.raises(Exception, match="Invalid sketch field"):
+        RioSketches.CorpusSketches().sketch("Weather")
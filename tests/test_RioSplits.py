@@ -0,0 +1,57 @@
+import pytest
+
+import RioSplits
+
+
+@pytest.fixture
+def splits(statObjs):
+    splits = RioSplits.SplitEngine()
+    for statObj in statObjs:
+        splits.addGame(statObj)
+    return splits
+
+
+def test_packRoundTrip():
+    fields = {"balls": 3, "strikes": 2, "outs": 1, "runners": 5, "half": 1, "batterLefty": 1,
+              "pitcherLefty": 0, "inning": 9}
+    assert RioSplits.unpackSituation(RioSplits.packSituation(**fields)) == fields
+    assert RioSplits.unpackSituation(RioSplits.packSituation(0, 0, 0, 0, 0, 0, 0, 40))["inning"] == 31
+
+
+def test_platoonIsOppositeHands(splits):
+    byHands = splits.split("batterHand", "pitcherHand")
+    platoon = splits.split("platoon")
+    opposite = sum(summary["PA"] for (batterHand, pitcherHand), summary in byHands.items() if batterHand != pitcherHand)
+    same = sum(summary["PA"] for (batterHand, pitcherHand), summary in byHands.items() if batterHand == pitcherHand)
+    assert platoon.get(True, {"PA": 0})["PA"] == opposite
+    assert platoon.get(False, {"PA": 0})["PA"] == same
+
+
+def test_everySplitCoversEveryPlateAppearance(splits):
+    total = sum(splits.events.column("Ends PA"))
+    for dimension in RioSplits.DIMENSIONS:
+        assert sum(summary["PA"] for summary in splits.split(dimension).values()) == total
+
+
+def test_mergeOfHalvesMatchesWhole(statObjs, splits):
+    first, second = RioSplits.SplitEngine(), RioSplits.SplitEngine()
+    for x, statObj in enumerate(statObjs):
+        (first if x < len(statObjs) // 2 else second).addGame(statObj)
+    first.split("count")
+    merged = first.merge(second)
+    assert merged.split("count") == splits.split("count")
+    assert merged.split("late", "risp", batter="Mario") == splits.split("late", "risp", batter="Mario")
+
+
+def test_cacheRefreshesAfterAddGame(statObjs):
+    splits = RioSplits.SplitEngine().addGame(statObjs[0])
+    before = sum(summary["PA"] for summary in splits.split("outs").values())
+    splits.addGame(statObjs[1])
+    assert sum(summary["PA"] for summary in splits.split("outs").values()) > before
+
+
+def test_invalidDimensionRaises(splits):
+    with pytest.raises(Exception, match="Invalid split dimension"):
+        splits.split("weather")
+    with pytest.raises(Exception, match="at least one dimension"):
+        splits.split()
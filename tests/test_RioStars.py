@@ -0,0 +1,55 @@
+import pytest
+
+import RioStars
+import RioStatLib
+from syntheticGames import flipVersion, makeGame
+
+
+@pytest.fixture
+def stars(statObjs):
+    stars = RioStars.StarStats()
+    for statObj in statObjs:
+        stars.addGame(statObj)
+    return stars
+
+
+def test_flippedVersionHasSameEconomy():
+    statJsons = [makeGame(seed) for seed in range(0, 6)]
+    stars = RioStars.StarStats()
+    flippedStars = RioStars.StarStats()
+    for statJson in statJsons:
+        stars.addGame(RioStatLib.StatObj(statJson))
+        flippedStars.addGame(RioStatLib.StatObj(flipVersion(statJson)))
+    assert flippedStars.starEconomy() == stars.starEconomy()
+    assert flippedStars.runValue() == stars.runValue()
+    for statJson in statJsons:
+        gameID = RioStatLib.StatObj(statJson).gameID()
+        assert flippedStars.starTimeline(gameID) == stars.starTimeline(gameID)
+
+
+def test_timelineMatchesEvents(statObjs, stars):
+    statObj = statObjs[2]
+    timeline = stars.starTimeline(statObj.gameID())
+    assert timeline["Event Num"] == [event["Event Num"] for event in statObj.events()]
+    assert timeline["Team 0 Stars"] == [event["Away Stars"] for event in statObj.events()]
+    assert timeline["Team 1 Stars"] == [event["Home Stars"] for event in statObj.events()]
+
+
+def test_mergeOfHalvesMatchesWhole(statObjs, stars):
+    first, second = RioStars.StarStats(), RioStars.StarStats()
+    for x, statObj in enumerate(statObjs):
+        (first if x < len(statObjs) // 2 else second).addGame(statObj)
+    merged = first.merge(second)
+    assert merged.playerEfficiency() == stars.playerEfficiency()
+    assert merged.runValue() == stars.runValue()
+
+
+def test_everyPitchIsCounted(stars):
+    runValue = stars.runValue()
+    assert runValue["Star Pitch"]["Pitches"] + runValue["Other Pitch"]["Pitches"] == len(stars.events)
+    assert sum(line["Games"] for line in stars.starEconomy().values()) == 2 * len(stars.players)
+
+
+def test_unknownGameRaises(stars):
+    with pytest.raises(Exception, match="Invalid gameID"):
+        stars.starTimeline(-1)
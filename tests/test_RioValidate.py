@@ -0,0 +1,73 @@
+import json
+
+import pytest
+
+import RioStatLib
+import RioValidate
+from syntheticGames import flipVersion, makeGame
+
+
+@pytest.fixture
+def mixedDirectory(gameFiles, tmp_path):
+    # the synthetic games plus a truncated file and one with an event past 'Innings Played'
+    (tmp_path / "zzTruncated.json").write_text(json.dumps(makeGame(90))[:200])
+    statJson = makeGame(91)
+    statJson["Events"][-1]["Inning"] = statJson["Innings Played"] + 1
+    (tmp_path / "zzLateInning.json").write_text(json.dumps(statJson))
+    return tmp_path
+
+
+def test_syntheticGamesAreValid(statJsons):
+    for statJson in statJsons:
+        assert RioValidate.validateStatJson(statJson).isValid()
+
+
+def test_oldVersionUsesTeamRosterKeys():
+    statJson = flipVersion(makeGame(2))
+    assert RioValidate.rosterKeys(statJson["Version"])[0] == "Team 0 Roster 0"
+    assert RioValidate.validateStatJson(statJson).isValid()
+    statJson["Version"] = "1.9.5"
+    report = RioValidate.validateStatJson(statJson)
+    assert "Character Game Stats: missing 'Away Roster 0'" in report.errors
+
+
+def test_reportsEveryIssue():
+    statJson = makeGame(4)
+    del statJson["Away Score"]
+    statJson["Events"][0]["Balls"] = 7
+    statJson["Events"][1]["Result of AB"] = "Teleport"
+    del statJson["Events"][2]["Pitch"]
+    report = RioValidate.validateStatJson(statJson)
+    assert not report.isValid()
+    assert len(report.errors) == 3
+    assert report.warnings == ["Events[2]: missing 'Pitch'"]
+
+
+def test_poolMatchesSerial(mixedDirectory):
+    paths = RioValidate.statFilePaths(str(mixedDirectory))
+    serial = RioValidate.validateFiles(paths, processes=1)
+    pooled = RioValidate.validateFiles(paths, processes=2)
+    assert [report.errors for report in pooled] == [report.errors for report in serial]
+    assert sum(not report.isValid() for report in serial) == 2
+
+
+def test_loadValidGamesQuarantinesBadFiles(mixedDirectory, tmp_path, statObjs):
+    quarantineDir = tmp_path / "quarantine"
+    loaded = list(RioValidate.loadValidGames(str(mixedDirectory), str(quarantineDir), processes=2))
+    assert [statObj.gameID() for statObj in loaded] == [statObj.gameID() for statObj in statObjs]
+    assert sorted(path.name for path in quarantineDir.iterdir()) == \
+           ["zzLateInning.json", "zzLateInning.json.errors.txt", "zzTruncated.json", "zzTruncated.json.errors.txt"]
+
+
+def test_loadValidGamesDecodesEachFileOnce(gameFiles, tmp_path, monkeypatch):
+    decodes = []
+    loadStatJson = RioStatLib.loadStatJson
+    monkeypatch.setattr(RioStatLib, "loadStatJson", lambda data: decodes.append(1) or loadStatJson(data))
+    statObjs = list(RioValidate.loadValidGames(str(tmp_path), processes=1))
+    assert len(statObjs) == len(decodes) == len(gameFiles)
+
+
+def test_unreadableFileIsReportedNotRaised(tmp_path):
+    report = RioValidate.validateFile(str(tmp_path / "missing.json"))
+    assert not report.isValid()
+    assert report.errors[0].startswith("file: FileNotFoundError")
@@ -0,0 +1,50 @@
+import RioStatLib
+from syntheticGames import flipVersion, makeGame
+
+
+def test_matrixMatchesCharacterStats(statObjs):
+    statObj = statObjs[0]
+    rowLabels, columns, matrix = statObj.characterStatMatrix()
+    assert len(rowLabels) == len(matrix) == 18
+    assert ("Offensive Stats", "Hits") in columns
+    assert all(len(row) == len(columns) for row in matrix)
+    charStats = statObj.characterGameStats()
+    for (teamNum, rosterNum, charID), row in zip(rowLabels, matrix):
+        character = charStats[statObj.getTeamString(teamNum, rosterNum)]
+        assert character["CharID"] == charID
+        assert row == [character[section][stat] for section, stat in columns]
+
+
+def test_teamRowsAddUpToTeamStats(statObjs):
+    for statObj in statObjs:
+        rowLabels, columns, matrix = statObj.characterStatMatrix()
+        hits = columns.index(("Offensive Stats", "Hits"))
+        for teamNum in range(0, 2):
+            assert sum(row[hits] for label, row in zip(rowLabels, matrix) if label[0] == teamNum) == \
+                   statObj.hits(teamNum)
+
+
+def test_stackMatchesGameByGame(statObjs):
+    rowLabels, columns, matrix = RioStatLib.stackStatMatrices(statObjs)
+    assert len(matrix) == 18 * len(statObjs)
+    for x, statObj in enumerate(statObjs):
+        gameRows, _, gameMatrix = statObj.characterStatMatrix(columns)
+        assert rowLabels[x * 18:(x + 1) * 18] == [(statObj.gameID(),) + row for row in gameRows]
+        assert matrix[x * 18:(x + 1) * 18] == gameMatrix
+
+
+def test_missingColumnsAreZero(statObjs):
+    _, columns, matrix = statObjs[0].characterStatMatrix([("Offensive Stats", "Not A Stat")])
+    assert columns == [("Offensive Stats", "Not A Stat")]
+    assert all(row == [0] for row in matrix)
+
+
+def test_flippedVersionHasSameRows():
+    statJson = makeGame(5)
+    rows, _, matrix = RioStatLib.StatObj(statJson).characterStatMatrix()
+    flippedRows, _, flippedMatrix = RioStatLib.StatObj(flipVersion(statJson)).characterStatMatrix()
+    assert dict(zip(rows, map(tuple, matrix))) == dict(zip(flippedRows, map(tuple, flippedMatrix)))
+
+
+def test_emptyStack():
+    assert RioStatLib.stackStatMatrices([]) == ([], [], [])
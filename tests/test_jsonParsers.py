@@ -0,0 +1,39 @@
+import pytest
+
+import RioJsonBenchmark
+import RioStatLib
+
+
+@pytest.mark.parametrize("parser", list(RioStatLib.JSON_PARSERS))
+def test_parsersDecodeTheSameGame(gameFiles, statJsons, parser):
+    with open(gameFiles[0], "rb") as statFile:
+        data = statFile.read()
+    assert RioStatLib.loadStatJson(data, parser) == statJsons[0]
+    assert RioStatLib.loadStatJson(data.decode(), parser) == statJsons[0]
+    assert RioStatLib.StatObj.from_bytes(data, parser).statJson == statJsons[0]
+    assert RioStatLib.StatObj.from_path(gameFiles[0], parser).ops(0) == RioStatLib.StatObj(statJsons[0]).ops(0)
+
+
+@pytest.mark.parametrize("parser", list(RioStatLib.JSON_PARSERS))
+def test_setJsonParserChangesTheDefault(gameFiles, statJsons, parser, monkeypatch):
+    monkeypatch.setattr(RioStatLib, "jsonParser", RioStatLib.jsonParser)
+    RioStatLib.setJsonParser(parser)
+    assert RioStatLib.jsonParser == parser
+    assert RioStatLib.StatObj.from_path(gameFiles[1]).statJson == statJsons[1]
+
+
+def test_benchmarkTimesEveryParser(gameFiles, tmp_path):
+    files = RioJsonBenchmark.statFiles([str(tmp_path), gameFiles[0]])
+    assert len(files) == len(gameFiles) + 1
+    results = RioJsonBenchmark.benchmark(files[:3], repeat=1)
+    assert set(results) == {(parser, stage) for parser in RioStatLib.JSON_PARSERS
+                            for stage in ["decode", "decode + StatObj"]}
+    assert all(seconds > 0 for seconds in results.values())
+
+
+def test_invalidParserRaises(gameFiles, monkeypatch):
+    monkeypatch.setattr(RioStatLib, "jsonParser", RioStatLib.jsonParser)
+    with pytest.raises(Exception, match="Invalid json parser"):
+        RioStatLib.setJsonParser("simdjson-not-installed")
+    with pytest.raises(Exception, match="Invalid json parser"):
+        RioStatLib.StatObj.from_path(gameFiles[0], "simdjson-not-installed")
@@ -0,0 +1,55 @@
+import pytest
+
+import RioStatLib
+from syntheticGames import flipVersion, makeGame
+
+
+def test_runsAddUpToFinalScore(statObjs):
+    for statObj in statObjs:
+        statJson = statObj.statJson
+        timeline = statObj.scoringTimeline()
+        assert sum(timeline["Runs"]) == statJson["Away Score"] + statJson["Home Score"]
+        assert statObj.scoreAfterEvent(len(statJson["Events"]) - 1) == (statJson["Away Score"], statJson["Home Score"])
+
+
+def test_lineScoreMatchesHalfInnings(statObjs):
+    for statObj in statObjs:
+        statJson = statObj.statJson
+        assert sum(statObj.lineScore(0)) == statJson["Away Score"]
+        assert sum(statObj.lineScore(1)) == statJson["Home Score"]
+        for inning in range(1, statJson["Innings Played"] + 1):
+            assert statObj.runsInHalfInning(inning, 1) == statObj.lineScore(1)[inning - 1]
+
+
+def test_runsOfEventMatchScoreChanges(statObjs):
+    statObj = statObjs[0]
+    events = statObj.events()
+    for x, event in enumerate(events[:-1]):
+        after = events[x + 1]
+        scored = after["Away Score"] + after["Home Score"] - event["Away Score"] - event["Home Score"]
+        assert statObj.runsOfEvent(x) == scored
+
+
+def test_leadChangesFlipTheLeader(statObjs):
+    for statObj in statObjs:
+        for eventNum in statObj.leadChangeEvents():
+            away, home = statObj.scoreAfterEvent(eventNum)
+            assert away != home
+
+
+def test_flippedVersionHasSameTimeline():
+    for seed in range(0, 6):
+        statJson = makeGame(seed)
+        timeline = RioStatLib.StatObj(statJson).scoringTimeline()
+        flippedTimeline = RioStatLib.StatObj(flipVersion(statJson)).scoringTimeline()
+        for key in ["Runs", "Line Score", "Lead Change", "Leverage"]:
+            assert flippedTimeline[key] == timeline[key]
+
+
+def test_unplayedInningHasNoRuns(statObjs):
+    assert statObjs[0].runsInHalfInning(99, 0) == 0
+
+
+def test_invalidHalfInningRaises(statObjs):
+    with pytest.raises(Exception, match="Invalid Half Inning num"):
+        statObjs[0].lineScore(2)